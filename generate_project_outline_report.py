@@ -10,26 +10,21 @@ including methodologies, datasets used, their importance, and sources.
 import os
 import json
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 
+from lineage_graph import draw_lineage_graph
+from vector_figures import figure_flowable, figure_path
+
 # Ensure output directories exist
 os.makedirs('reports', exist_ok=True)
 os.makedirs('reports/project_outline', exist_ok=True)
 
-# Set global styling options
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette('colorblind')
-plt.rcParams['figure.figsize'] = (10, 6)
-plt.rcParams['font.size'] = 12
-
 # Constants
 REPORT_DATE = "May 12, 2025"
 REPORT_TITLE = "YouthHarvest Project: Comprehensive Project Outline"
@@ -339,15 +334,10 @@ def get_dataset_information():
 # DATA INTEGRATION DIAGRAM
 # ============================================================
 
-def create_data_integration_diagram(save_path='reports/project_outline/data_integration_diagram.png'):
+def create_data_integration_diagram(save_path=figure_path('reports/project_outline/data_integration_diagram')):
     """Create a visual diagram showing how different datasets integrate in the project"""
     
-    plt.figure(figsize=(12, 8))
-    
-    # Create a directed graph layout
-    G = nx.DiGraph()
-    
-    # Add nodes
+    # Nodes by type
     datasets = [
         "Post-Harvest\nLoss Survey",
         "Agricultural\nProduction Data",
@@ -373,102 +363,44 @@ def create_data_integration_diagram(save_path='reports/project_outline/data_inte
         "Stakeholder\nReports"
     ]
     
-    # Add all nodes
-    for d in datasets:
-        G.add_node(d, type="dataset")
-    
-    for a in analyses:
-        G.add_node(a, type="analysis")
-    
-    for o in outputs:
-        G.add_node(o, type="output")
-    
-    # Add edges
-    # From datasets to analyses
-    G.add_edge("Post-Harvest\nLoss Survey", "Regional Loss\nMapping")
-    G.add_edge("Post-Harvest\nLoss Survey", "Value Chain\nAnalysis")
-    G.add_edge("Agricultural\nProduction Data", "Regional Loss\nMapping")
-    G.add_edge("Agricultural\nProduction Data", "Opportunity\nIdentification")
-    G.add_edge("Youth Employment\nSurvey", "Opportunity\nIdentification")
-    G.add_edge("Youth Employment\nSurvey", "Implementation\nStrategy")
-    G.add_edge("Technology\nAdoption Data", "Business Model\nDevelopment")
-    G.add_edge("Market Price &\nQuality Premiums", "Value Chain\nAnalysis")
-    G.add_edge("Market Price &\nQuality Premiums", "Business Model\nDevelopment")
-    G.add_edge("Youth Agribusiness\nCase Studies", "Business Model\nDevelopment")
-    G.add_edge("Youth Agribusiness\nCase Studies", "Implementation\nStrategy")
-    G.add_edge("Agricultural Finance\nLandscape", "Business Model\nDevelopment")
-    G.add_edge("Agricultural Finance\nLandscape", "Implementation\nStrategy")
-    
-    # From analyses to other analyses
-    G.add_edge("Regional Loss\nMapping", "Opportunity\nIdentification")
-    G.add_edge("Value Chain\nAnalysis", "Opportunity\nIdentification")
-    G.add_edge("Opportunity\nIdentification", "Business Model\nDevelopment")
-    G.add_edge("Business Model\nDevelopment", "Implementation\nStrategy")
-    
-    # From analyses to outputs
-    G.add_edge("Business Model\nDevelopment", "Youth Business\nModels")
-    G.add_edge("Regional Loss\nMapping", "Interactive\nDashboard")
-    G.add_edge("Opportunity\nIdentification", "Interactive\nDashboard")
-    G.add_edge("Implementation\nStrategy", "Implementation\nRoadmap")
-    G.add_edge("Business Model\nDevelopment", "Stakeholder\nReports")
-    G.add_edge("Implementation\nStrategy", "Stakeholder\nReports")
-    
-    # Set positions for nodes
-    pos = {
-        # Dataset positions (top row)
-        "Post-Harvest\nLoss Survey": (1, 5),
-        "Agricultural\nProduction Data": (3, 5),
-        "Youth Employment\nSurvey": (5, 5),
-        "Technology\nAdoption Data": (7, 5),
-        "Market Price &\nQuality Premiums": (9, 5),
-        "Youth Agribusiness\nCase Studies": (11, 5),
-        "Agricultural Finance\nLandscape": (13, 5),
-        
-        # Analysis positions (middle row)
-        "Regional Loss\nMapping": (2, 3),
-        "Value Chain\nAnalysis": (5, 3),
-        "Opportunity\nIdentification": (8, 3),
-        "Business Model\nDevelopment": (11, 3),
-        "Implementation\nStrategy": (14, 3),
-        
-        # Output positions (bottom row)
-        "Youth Business\nModels": (4, 1),
-        "Interactive\nDashboard": (7, 1),
-        "Implementation\nRoadmap": (10, 1),
-        "Stakeholder\nReports": (13, 1)
-    }
-    
-    # Set node colors based on type
-    node_colors = []
-    for node in G.nodes():
-        if G.nodes[node]["type"] == "dataset":
-            node_colors.append("#5DADE2")  # Blue for datasets
-        elif G.nodes[node]["type"] == "analysis":
-            node_colors.append("#F5B041")  # Orange for analyses
-        else:
-            node_colors.append("#58D68D")  # Green for outputs
-    
-    # Draw the graph
-    plt.figure(figsize=(15, 10))
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, node_size=3000, 
-            font_size=10, font_weight='bold', arrowsize=15, 
-            edge_color='gray', width=1.5, alpha=0.7)
-    
-    # Add legend
-    dataset_patch = plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#5DADE2', 
-                              markersize=15, label='Datasets')
-    analysis_patch = plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#F5B041', 
-                               markersize=15, label='Analyses')
-    output_patch = plt.Line2D([0], [0], marker='o', color='w', markerfacecolor='#58D68D', 
-                             markersize=15, label='Outputs')
-    plt.legend(handles=[dataset_patch, analysis_patch, output_patch], loc='upper right')
-    
-    plt.title('YouthHarvest Project Data Integration Flow', fontsize=16, fontweight='bold')
-    plt.axis('off')
-    plt.tight_layout()
+    nodes = {}
+    nodes.update((d, "dataset") for d in datasets)
+    nodes.update((a, "analysis") for a in analyses)
+    nodes.update((o, "output") for o in outputs)
+    
+    edges = [
+        # From datasets to analyses
+        ("Post-Harvest\nLoss Survey", "Regional Loss\nMapping"),
+        ("Post-Harvest\nLoss Survey", "Value Chain\nAnalysis"),
+        ("Agricultural\nProduction Data", "Regional Loss\nMapping"),
+        ("Agricultural\nProduction Data", "Opportunity\nIdentification"),
+        ("Youth Employment\nSurvey", "Opportunity\nIdentification"),
+        ("Youth Employment\nSurvey", "Implementation\nStrategy"),
+        ("Technology\nAdoption Data", "Business Model\nDevelopment"),
+        ("Market Price &\nQuality Premiums", "Value Chain\nAnalysis"),
+        ("Market Price &\nQuality Premiums", "Business Model\nDevelopment"),
+        ("Youth Agribusiness\nCase Studies", "Business Model\nDevelopment"),
+        ("Youth Agribusiness\nCase Studies", "Implementation\nStrategy"),
+        ("Agricultural Finance\nLandscape", "Business Model\nDevelopment"),
+        ("Agricultural Finance\nLandscape", "Implementation\nStrategy"),
+
+        # From analyses to other analyses
+        ("Regional Loss\nMapping", "Opportunity\nIdentification"),
+        ("Value Chain\nAnalysis", "Opportunity\nIdentification"),
+        ("Opportunity\nIdentification", "Business Model\nDevelopment"),
+        ("Business Model\nDevelopment", "Implementation\nStrategy"),
+
+        # From analyses to outputs
+        ("Business Model\nDevelopment", "Youth Business\nModels"),
+        ("Regional Loss\nMapping", "Interactive\nDashboard"),
+        ("Opportunity\nIdentification", "Interactive\nDashboard"),
+        ("Implementation\nStrategy", "Implementation\nRoadmap"),
+        ("Business Model\nDevelopment", "Stakeholder\nReports"),
+        ("Implementation\nStrategy", "Stakeholder\nReports")
+    ]
     
     try:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        draw_lineage_graph(nodes, edges, save_path, title='YouthHarvest Project Data Integration Flow')
         print(f"Data integration diagram saved to {save_path}")
         return save_path
     except Exception as e:
@@ -514,12 +446,7 @@ def create_project_outline_report():
     datasets = get_dataset_information()
     
     # Try to create data integration diagram
-    try:
-        import networkx as nx
-        data_flow_diagram = create_data_integration_diagram()
-    except ImportError:
-        print("NetworkX not installed. Using text-based data flow instead.")
-        data_flow_diagram = None
+    data_flow_diagram = create_data_integration_diagram()
     
     # Create PDF document
     report_path = "reports/YouthHarvest_Project_Outline_Report.pdf"
@@ -534,6 +461,10 @@ def create_project_outline_report():
     
     # Get style sheets
     styles = getSampleStyleSheet()
+    # The sample stylesheet already defines 'Title', 'Heading3' and 'Code'; replace them with the report's styles
+    sample_heading3 = styles['Heading3']
+    for name in ('Title', 'Heading3', 'Code'):
+        del styles.byName[name]
     styles.add(ParagraphStyle(
         name='Title', 
         parent=styles['Heading1'], 
@@ -551,7 +482,7 @@ def create_project_outline_report():
     ))
     styles.add(ParagraphStyle(
         name='Heading3', 
-        parent=styles['Heading3'], 
+        parent=sample_heading3, 
         fontName='Helvetica-Bold',
         fontSize=12,
         spaceAfter=6
@@ -659,7 +590,7 @@ def create_project_outline_report():
     ))
     
     if data_flow_diagram:
-        content.append(Image(data_flow_diagram, width=7*inch, height=5*inch))
+        content.append(figure_flowable(data_flow_diagram, width=7*inch))
     else:
         # Use text-based flow diagram if visualization failed
         content.append(Paragraph(create_text_data_flow(), styles['Code']))
@@ -942,12 +873,5 @@ def create_project_outline_report():
 # ============================================================
 
 if __name__ == "__main__":
-    try:
-        import networkx as nx
-        print("NetworkX installed, will create data flow visualization.")
-    except ImportError:
-        print("NetworkX not installed, will use text-based data flow diagram.")
-        print("To install NetworkX: pip install networkx")
-    
     report_path = create_project_outline_report()
     print(f"YouthHarvest Project Outline Report generated at: {report_path}")
\ No newline at end of file
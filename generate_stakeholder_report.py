@@ -8,28 +8,59 @@ including executive summary, data insights, business models, and implementation
 """
 
 import os
+import re
 import json
+import time
+import argparse
+import hashlib
+import inspect
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
 import seaborn as sns
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 import matplotlib.ticker as mtick
 
+from report_data import load_dataset, source_hashes
+from vector_figures import FIGURE_FORMAT, figure_flowable, figure_path, save_figure
+
 # Ensure output directories exist
 os.makedirs('reports', exist_ok=True)
 os.makedirs('reports/figures', exist_ok=True)
 
-# Set global styling options
-plt.style.use('fivethirtyeight')
-sns.set_palette('colorblind')
-plt.rcParams['figure.figsize'] = (10, 6)
-plt.rcParams['font.size'] = 12
+# Figure styling, applied per figure (see render_figure) rather than through pyplot globals
+FIGURE_STYLE = 'fivethirtyeight'
+FIGURE_RC = {
+    'axes.prop_cycle': matplotlib.cycler(color=sns.color_palette('colorblind')),
+    'figure.figsize': (10, 6),
+    'font.size': 12
+}
+FIGURE_CACHE = 'reports/figures/figure_cache.json'
+
+# Batch mode: one report per geopolitical zone and per state
+DASHBOARD_DATA = 'results/dashboard/data/complete_phl_dashboard_data.csv'
+BATCH_REPORT_DIR = 'reports/stakeholder_reports'
+ZONE_FIGURE_DIR = 'reports/figures/zones'
+ZONE_FIGURES = ['value_chain_losses', 'crop_losses']  # drawn from each zone's own data; the rest are national
+
+# Cleaned pipeline outputs the loss analysis is built from
+PRODUCTION_DATA = 'cleaned/clean_crop_data.csv'              # tons produced, state x crop
+LOSS_DATA = 'cleaned/post_harvest_losses_calculated.csv'      # tons lost, state x crop
+VALUE_CHAIN_DATA = 'cleaned/value_chain_cleaned.csv'         # loss rate by crop and value chain stage
+CROP_PRICE_DATA = 'cleaned/financial_impact.csv'             # price per unit of each crop
+PHL_SOURCES = [PRODUCTION_DATA, LOSS_DATA, VALUE_CHAIN_DATA, CROP_PRICE_DATA, DASHBOARD_DATA]
+REGIONS = ['North West', 'North East', 'North Central', 'South West', 'South East', 'South South']
+# State spellings in the cleaned production data, mapped to the dashboard names (as in scripts/price_store.py)
+STATE_ALIASES = {'Abuja Federal Capital Territory': 'FCT', 'Federal Capital Territory': 'FCT', 'Abuja': 'FCT'}
 
 # Constants
 REPORT_DATE = "May 12, 2025"
@@ -39,37 +70,73 @@ REPORT_TITLE = "YouthHarvest Project: Transforming Post-Harvest Losses into Yout
 # DATA PREPARATION AND LOADING
 # ============================================================
 
+# load_phl_data results by the content hashes of PHL_SOURCES
+_phl_data = {}
+
+
+def state_crop_table(path):
+    """A state x crop table from the cleaned store in long form (state, crop, tons), crops never grown dropped"""
+    table = load_dataset(path).melt(id_vars='State', var_name='crop', value_name='tons')
+    table['state'] = table['State'].str.strip().replace(STATE_ALIASES)
+    grown = table.groupby('crop', sort=False)['tons'].transform('sum') > 0
+    return table.loc[grown, ['state', 'crop', 'tons']]
+
+
+def load_loss_analysis():
+    """Regional, value chain stage and crop losses computed from the cleaned datasets"""
+    production = state_crop_table(PRODUCTION_DATA)
+    losses = state_crop_table(LOSS_DATA)
+    zones = load_dataset(DASHBOARD_DATA, columns=['state', 'geopolitical_zone']).drop_duplicates('state')
+    prices = load_dataset(CROP_PRICE_DATA, columns=['Crop', 'Price Per Unit'])
+
+    table = production.merge(losses, on=['state', 'crop'], suffixes=('_produced', '_lost'))
+    table = table.merge(zones, on='state', how='left')
+    unmapped = table.loc[table['geopolitical_zone'].isna(), 'state'].unique()
+    if len(unmapped):
+        raise ValueError(f"States without a geopolitical zone in {DASHBOARD_DATA}: {sorted(unmapped)}")
+    table['value_lost'] = table['tons_lost'] * table['crop'].map(dict(zip(prices['Crop'], prices['Price Per Unit'])))
+
+    regional = table.groupby('geopolitical_zone')[['tons_produced', 'tons_lost', 'value_lost']].sum()
+    regional = regional.loc[[region for region in REGIONS if region in regional.index]]
+    by_crop = table.groupby('crop', sort=False)[['tons_produced', 'tons_lost']].sum()
+    stages = load_dataset(VALUE_CHAIN_DATA, columns=['stage', 'loss_percentage']).groupby(
+        'stage', sort=False)['loss_percentage'].mean()
+    return {
+        'regional_loss': pd.DataFrame({
+            'Region': regional.index,
+            'Loss_Percentage': (100 * regional['tons_lost'] / regional['tons_produced']).round().astype(int).to_numpy(),
+            'Annual_Tonnage_Lost': regional['tons_lost'].round().to_numpy(),
+            'Value_Lost_Millions': (regional['value_lost'] / 1e6).round().to_numpy()
+        }),
+        # Share of all losses occurring at each stage
+        'stage_loss': pd.DataFrame({
+            'Stage': stages.index,
+            'Loss_Percentage': (100 * stages / stages.sum()).round(1).to_numpy()
+        }),
+        'crop_loss': pd.DataFrame({
+            'Crop': by_crop.index,
+            'Loss_Percentage': (100 * by_crop['tons_lost'] / by_crop['tons_produced']).round().astype(int).to_numpy(),
+            'Annual_Tonnage_Lost': by_crop['tons_lost'].round().to_numpy()
+        })
+    }
+
+
 def load_phl_data():
     """
     Load post-harvest loss data from project files.
-    In a real implementation, this would read from actual project data files.
+
+    Regional, value chain and crop losses are computed from the cleaned
+    datasets (PHL_SOURCES), read through the memoized loader in report_data;
+    the result is memoized by the sources' content hashes, so repeated
+    builds in one process reuse it. Youth unemployment, seasonality,
+    business models and implementation phases are project inputs defined
+    here.
     """
-    # Simulating data based on previous information
-    # Regional post-harvest loss data
-    regions = ['North West', 'North East', 'North Central', 'South West', 'South East', 'South South']
-    
-    # Loss percentages by region
-    regional_loss_pct = pd.DataFrame({
-        'Region': regions,
-        'Loss_Percentage': [32, 40, 28, 25, 30, 38],
-        'Annual_Tonnage_Lost': [1350000, 950000, 780000, 650000, 450000, 550000],
-        'Value_Lost_Millions': [850, 650, 520, 480, 320, 420]
-    })
-    
-    # Loss by value chain stage
-    stages = ['Harvesting', 'Storage', 'Processing', 'Transportation', 'Marketing']
-    stage_loss = pd.DataFrame({
-        'Stage': stages,
-        'Loss_Percentage': [15, 32, 28, 18, 7]
-    })
-    
-    # Crop-specific losses
-    crops = ['Maize', 'Rice', 'Tomatoes', 'Yams', 'Cassava', 'Fruits', 'Vegetables']
-    crop_loss = pd.DataFrame({
-        'Crop': crops,
-        'Loss_Percentage': [25, 30, 45, 35, 28, 40, 42],
-        'Annual_Tonnage_Lost': [850000, 750000, 650000, 580000, 480000, 520000, 490000]
-    })
+    key = source_hashes(PHL_SOURCES)
+    if key in _phl_data:
+        return dict(_phl_data[key])
+    analysis = load_loss_analysis()
+    regions = REGIONS
     
     # Youth unemployment data by region
     youth_unemployment = pd.DataFrame({
@@ -194,15 +261,16 @@ def load_phl_data():
     
     implementation_df = pd.DataFrame(implementation_phases)
     
-    return {
-        'regional_loss': regional_loss_pct,
-        'stage_loss': stage_loss,
-        'crop_loss': crop_loss,
+    _phl_data[key] = {
+        'regional_loss': analysis['regional_loss'],
+        'stage_loss': analysis['stage_loss'],
+        'crop_loss': analysis['crop_loss'],
         'youth_unemployment': youth_unemployment,
         'seasonal_variation': seasonal_data,
         'business_models': business_models_df,
         'implementation_phases': implementation_df
     }
+    return dict(_phl_data[key])
 
 # ============================================================
 # DATA VISUALIZATION FUNCTIONS
@@ -212,7 +280,9 @@ def plot_regional_losses(data, save_path='reports/figures/regional_losses.png'):
     """Generate regional loss map and charts"""
     regional_data = data['regional_loss']
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    fig = Figure(figsize=(15, 7))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Plot percentage losses by region
     ax1.bar(regional_data['Region'], regional_data['Loss_Percentage'], color=sns.color_palette('Blues_d', len(regional_data)))
@@ -231,9 +301,8 @@ def plot_regional_losses(data, save_path='reports/figures/regional_losses.png'):
     for i, v in enumerate(regional_data['Annual_Tonnage_Lost']/1000000):
         ax2.text(i, v + 0.05, f"{v:.2f}M", ha='center')
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
@@ -241,7 +310,9 @@ def plot_value_chain_losses(data, save_path='reports/figures/value_chain_losses.
     """Generate value chain stage loss analysis"""
     stage_data = data['stage_loss']
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     
     # Create pie chart of losses by stage
     wedges, texts, autotexts = ax.pie(
@@ -256,18 +327,20 @@ def plot_value_chain_losses(data, save_path='reports/figures/value_chain_losses.
     
     # Styling
     ax.set_title('Post-Harvest Losses by Value Chain Stage')
-    plt.setp(autotexts, size=10, weight="bold")
-    
-    # Add annotation
-    plt.annotate(
-        'Storage and Processing\nrepresent over 60% of losses',
+    for autotext in autotexts:
+        autotext.set_size(10)
+        autotext.set_weight("bold")
+    
+    # Add annotation on the two largest loss stages
+    top_stages = stage_data.nlargest(2, 'Loss_Percentage')
+    ax.annotate(
+        f"{' and '.join(top_stages['Stage'])}\nrepresent {top_stages['Loss_Percentage'].sum():.0f}% of losses",
         xy=(0.05, 0.05), xycoords='figure fraction',
         bbox=dict(boxstyle="round,pad=0.5", fc="lightyellow", alpha=0.8)
     )
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
@@ -275,7 +348,9 @@ def plot_crop_losses(data, save_path='reports/figures/crop_losses.png'):
     """Generate crop-specific loss analysis"""
     crop_data = data['crop_loss']
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Plot percentage losses by crop
     colors = sns.color_palette('YlOrBr', len(crop_data))
@@ -295,15 +370,15 @@ def plot_crop_losses(data, save_path='reports/figures/crop_losses.png'):
     ax2.set_title('Annual Post-Harvest Losses by Crop Type (Thousand Tons)')
     ax2.set_xlabel('Thousand Tons Lost')
     
-    # Add data labels
+    # Add data labels (values are already in thousand tons)
+    pad = 0.01 * bars.datavalues.max()
     for bar in bars:
         width = bar.get_width()
-        ax2.text(width + 10, bar.get_y() + bar.get_height()/2, f"{width/1000:.1f}K", 
+        ax2.text(width + pad, bar.get_y() + bar.get_height()/2, f"{width:,.1f}K", 
                 ha='left', va='center')
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
@@ -311,7 +386,9 @@ def plot_seasonal_variation(data, save_path='reports/figures/seasonal_variation.
     """Generate seasonal variation in post-harvest losses"""
     seasonal_data = data['seasonal_variation']
     
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     
     # Create line chart of seasonal variation
     ax.plot(seasonal_data['Month'], seasonal_data['Loss_Index'], marker='o', linewidth=3, color='#FF5722')
@@ -340,16 +417,16 @@ def plot_seasonal_variation(data, save_path='reports/figures/seasonal_variation.
                 arrowprops=dict(facecolor='black', shrink=0.05, width=1.5),
                 ha='center')
     
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.legend()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
 def plot_business_models_comparison(data, save_path='reports/figures/business_models_comparison.png'):
     """Generate business models comparison chart"""
-    business_data = data['business_models']
+    # A copy: the loaded frames are shared (memoized by load_phl_data) and hashed by figure_key
+    business_data = data['business_models'].copy()
     
     # Extract investment minimums and maximums
     business_data[['investment_min', 'investment_max']] = business_data['investment_range'].str.split(' - ', expand=True)
@@ -372,7 +449,9 @@ def plot_business_models_comparison(data, save_path='reports/figures/business_mo
     business_data['avg_loss_reduction'] = (business_data['loss_red_min'] + business_data['loss_red_max']) / 2
     
     # Create figure with subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 12))
+    fig = Figure(figsize=(12, 12))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Investment vs. ROI chart
     scatter = ax1.scatter(
@@ -403,7 +482,7 @@ def plot_business_models_comparison(data, save_path='reports/figures/business_mo
     # Create legend for bubble size
     handles, labels = ax1.get_legend_handles_labels()
     legend_elements = [
-        plt.Line2D([0], [0], marker='o', color='w', label=f'{size}%',
+        Line2D([0], [0], marker='o', color='w', label=f'{size}%',
                   markerfacecolor='gray', markersize=np.sqrt(size*10))
         for size in [15, 25, 35, 45]
     ]
@@ -428,9 +507,8 @@ def plot_business_models_comparison(data, save_path='reports/figures/business_mo
     for i, v in enumerate(business_data['avg_jobs']):
         ax2.text(i, v + 0.1, f"{v:.1f}", ha='center')
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
@@ -438,7 +516,9 @@ def plot_implementation_roadmap(data, save_path='reports/figures/implementation_
     """Generate implementation roadmap visualization"""
     impl_data = data['implementation_phases']
     
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     
     # Create timeline visualization
     phases = impl_data['phase']
@@ -457,9 +537,15 @@ def plot_implementation_roadmap(data, save_path='reports/figures/implementation_
                ha='center', fontsize=12, weight='bold',
                bbox=dict(boxstyle="round,pad=0.3", fc=sns.color_palette('viridis', 3)[i], alpha=0.3))
         
+        # Regions and business models are lists (strings if read back from a file)
+        regions = impl_data['regions'].iloc[i]
+        regions_str = ', '.join(regions) if isinstance(regions, list) else str(regions)
+        business_models = impl_data['business_models'].iloc[i]
+        models_str = ', '.join(business_models) if isinstance(business_models, list) else str(business_models)
+
         # Add implementation details
-        details = (f"Regions: {', '.join(eval(impl_data['regions'].iloc[i]))}\n"
-                  f"Models: {', '.join(eval(impl_data['business_models'].iloc[i]))}\n"
+        details = (f"Regions: {regions_str}\n"
+                  f"Models: {models_str}\n"
                   f"Target: {targets[i]} youth\n"
                   f"Impact: {impl_data['estimated_impact'].iloc[i]}")
         
@@ -480,9 +566,8 @@ def plot_implementation_roadmap(data, save_path='reports/figures/implementation_
     for spine in ax.spines.values():
         spine.set_visible(False)
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
@@ -494,7 +579,9 @@ def plot_impact_projection(data, save_path='reports/figures/impact_projection.pn
     phl_reduction = [0, 5, 12, 20]  # percentage reduction
     value_preserved = [0, 0.5, 2, 5]  # billion Naira
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    fig = Figure(figsize=(15, 7))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Plot youth businesses created
     ax1.bar(years, youth_businesses, color=sns.color_palette('Blues', len(years)))
@@ -528,37 +615,125 @@ def plot_impact_projection(data, save_path='reports/figures/impact_projection.pn
     labels = [l.get_label() for l in lines]
     ax2.legend(lines, labels, loc="upper left")
     
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, save_path)
     
     return save_path
 
+# Report figures: name -> (plot function, keys of the data it draws, output path without extension)
+REPORT_FIGURES = {
+    'regional_losses': (plot_regional_losses, ['regional_loss'], 'reports/figures/regional_losses'),
+    'value_chain_losses': (plot_value_chain_losses, ['stage_loss'], 'reports/figures/value_chain_losses'),
+    'crop_losses': (plot_crop_losses, ['crop_loss'], 'reports/figures/crop_losses'),
+    'seasonal_variation': (plot_seasonal_variation, ['seasonal_variation'], 'reports/figures/seasonal_variation'),
+    'business_models_comparison': (plot_business_models_comparison, ['business_models'],
+                                   'reports/figures/business_models_comparison'),
+    'implementation_roadmap': (plot_implementation_roadmap, ['implementation_phases'],
+                               'reports/figures/implementation_roadmap'),
+    'impact_projection': (plot_impact_projection, [], 'reports/figures/impact_projection')
+}
+
+
+def figure_key(name, data):
+    """Hash of a figure's input data, plotting code and style; a figure is re-rendered only when it changes"""
+    plot, keys, _ = REPORT_FIGURES[name]
+    digest = hashlib.sha256(inspect.getsource(plot).encode('utf-8'))
+    digest.update(repr((FIGURE_STYLE, sorted((k, str(v)) for k, v in FIGURE_RC.items()))).encode('utf-8'))
+    for key in keys:
+        digest.update(key.encode('utf-8'))
+        digest.update(data[key].to_json(orient='split').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_figure(name, inputs, save_path):
+    """
+    Render one report figure with the report style; safe to run in a worker
+    process. The figure is saved to a temporary file and moved into place.
+    """
+    plot = REPORT_FIGURES[name][0]
+    root, ext = os.path.splitext(save_path)
+    with matplotlib.style.context(FIGURE_STYLE), matplotlib.rc_context(FIGURE_RC):
+        plot(inputs, save_path=f'{root}.tmp{ext}')
+    os.replace(f'{root}.tmp{ext}', save_path)
+    return save_path
+
+
+def render_all(jobs, workers=None):
+    """Render (name, data, save_path) jobs across a process pool (in this process for workers=1)"""
+    jobs = [(name, {key: data[key] for key in REPORT_FIGURES[name][1]}, path) for name, data, path in jobs]
+    workers = workers or min(os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            render_figure(*job)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render_figure, *zip(*jobs)))
+
+
+def render_figures(data, workers=None, cache_path=FIGURE_CACHE, fmt=FIGURE_FORMAT):
+    """
+    Render every report figure in format `fmt` ('svg' or 'png'), returning {name: path}.
+
+    Figures whose input hash matches the cache and whose file exists are
+    reused; the rest are rendered in parallel across a process pool (one
+    figure per task), so build time scales with the number of cores.
+    """
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    paths = {name: figure_path(stem, fmt) for name, (_, _, stem) in REPORT_FIGURES.items()}
+    keys = {name: figure_key(name, data) for name in REPORT_FIGURES}
+    stale = [name for name, path in paths.items() if cache.get(path) != keys[name] or not os.path.exists(path)]
+    render_all([(name, data, paths[name]) for name in stale], workers)
+    print(f"Rendered {len(stale)} of {len(REPORT_FIGURES)} figures ({len(REPORT_FIGURES) - len(stale)} cached)")
+
+    cache.update({paths[name]: keys[name] for name in stale})
+    with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(cache_path + '.tmp', cache_path)
+    return paths
+
 # ============================================================
 # REPORT GENERATION FUNCTIONS
 # ============================================================
 
-def create_stakeholder_report():
-    """Create main stakeholder report in PDF format"""
-    # Load data
-    print("Loading data...")
-    data = load_phl_data()
-    
-    # Generate visualizations
-    print("Generating visualizations...")
-    regional_losses_fig = plot_regional_losses(data)
-    value_chain_fig = plot_value_chain_losses(data)
-    crop_losses_fig = plot_crop_losses(data)
-    seasonal_fig = plot_seasonal_variation(data)
-    business_models_fig = plot_business_models_comparison(data)
-    roadmap_fig = plot_implementation_roadmap(data)
-    impact_fig = plot_impact_projection(data)
+def create_stakeholder_report(report_path="reports/YouthHarvest_Stakeholder_Report.pdf", data=None, figures=None,
+                              scope=None):
+    """
+    Create main stakeholder report in PDF format.
+
+    Batch mode (create_stakeholder_reports) passes data and figures it has
+    already prepared, and the scope of the report: the zone or state it
+    covers. A scoped report adds the scope's key figures and describes its
+    zone's value chain and crop losses. The PDF is written to a temporary
+    file and moved into place once complete.
+    """
+    if data is None:
+        # Load data
+        print("Loading data...")
+        data = load_phl_data()
+    
+    if figures is None:
+        # Generate visualizations (in parallel, reusing figures whose data has not changed);
+        # the PDF is assembled once all of them are ready
+        print("Generating visualizations...")
+        figures = render_figures(data)
+    regional_losses_fig = figures['regional_losses']
+    value_chain_fig = figures['value_chain_losses']
+    crop_losses_fig = figures['crop_losses']
+    seasonal_fig = figures['seasonal_variation']
+    business_models_fig = figures['business_models_comparison']
+    roadmap_fig = figures['implementation_roadmap']
+    impact_fig = figures['impact_projection']
     
     # Create PDF document
-    print("Creating report document...")
-    report_path = "reports/YouthHarvest_Stakeholder_Report.pdf"
+    if scope is None:
+        print("Creating report document...")
     doc = SimpleDocTemplate(
-        report_path,
+        report_path + '.tmp',
         pagesize=letter,
         rightMargin=inch/2,
         leftMargin=inch/2,
@@ -568,6 +743,8 @@ def create_stakeholder_report():
     
     # Get style sheets
     styles = getSampleStyleSheet()
+    # The sample stylesheet already defines 'Title'; replace it with the report's title style
+    del styles.byName['Title']
     styles.add(ParagraphStyle(
         name='Title', 
         parent=styles['Heading1'], 
@@ -590,13 +767,24 @@ def create_stakeholder_report():
         spaceAfter=8
     ))
     
+    # Loss findings quoted in the text, from the same data as the figures
+    regional = data['regional_loss']
+    top_share = regional.loc[regional['Loss_Percentage'].idxmax()]
+    top_tonnage = regional.loc[regional['Annual_Tonnage_Lost'].idxmax()]
+    top_stages = data['stage_loss'].nlargest(2, 'Loss_Percentage')
+    crop_data = data['crop_loss']
+    highest_rate = crop_data.loc[crop_data['Loss_Percentage'].idxmax()]
+    highest_tonnage = crop_data.loc[crop_data['Annual_Tonnage_Lost'].idxmax()]
+    place = f"In the {scope['zone']} zone" if scope else "Nationally"
+    
     # Build content
     content = []
     
     # Cover page
     content.append(Paragraph(REPORT_TITLE, styles['Title']))
     content.append(Spacer(1, 12))
-    content.append(Paragraph(f"Stakeholder Report", styles['Subtitle']))
+    content.append(Paragraph(f"Stakeholder Report: {scope['title']}" if scope else "Stakeholder Report",
+                             styles['Subtitle']))
     content.append(Spacer(1, 12))
     content.append(Paragraph(f"Date: {REPORT_DATE}", styles['Normal']))
     content.append(Spacer(1, 36))
@@ -616,11 +804,12 @@ def create_stakeholder_report():
         styles['Body']
     ))
     content.append(Paragraph(
-        "Our analysis reveals that post-harvest losses represent approximately ₦4 billion in annual value lost, "
-        "with the highest absolute losses occurring in the North West region (1.25-1.45 million tons annually). "
-        "Storage (32%) and processing (28%) represent the highest loss stages across the value chain. We have "
-        "developed seven youth-appropriate business models that directly address these loss points, with investment "
-        "requirements ranging from ₦200,000 to ₦8 million and ROI potential of 15-70% annually.",
+        f"Our analysis of the cleaned production and loss data shows that post-harvest losses cost approximately "
+        f"₦{regional['Value_Lost_Millions'].sum() / 1000:.1f} billion a year across the staple crops surveyed, with "
+        f"the highest absolute losses occurring in the {top_tonnage['Region']} region "
+        f"({top_tonnage['Annual_Tonnage_Lost'] / 1e6:.2f} million tons annually). We have developed seven "
+        f"youth-appropriate business models that directly address these loss points, with investment requirements "
+        f"ranging from ₦200,000 to ₦8 million and ROI potential of 15-70% annually.",
         styles['Body']
     ))
     content.append(Paragraph(
@@ -632,6 +821,29 @@ def create_stakeholder_report():
     
     content.append(Spacer(1, 12))
     
+    # Key figures for the zone or state the report covers
+    if scope:
+        content.append(Paragraph(f"Regional Focus: {scope['title']}", styles['Subtitle']))
+        content.append(Paragraph(
+            f"This edition of the report focuses on {scope['title']}. The figures below summarise post-harvest "
+            f"losses across its surveyed value chains; the value chain and crop analyses in section 1 are drawn "
+            f"from the {scope['zone']} zone's data, while the remaining sections present the national picture.",
+            styles['Body']
+        ))
+        scope_table = Table([['Indicator', 'Value']] + [[label, Paragraph(value, styles['Normal'])]
+                                                         for label, value in scope['summary'].items()],
+                            colWidths=[2.5*inch, 5*inch])
+        scope_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]))
+        content.append(scope_table)
+        content.append(Spacer(1, 12))
+    
     # Problem Analysis
     content.append(Paragraph("1. Post-Harvest Loss Analysis", styles['Subtitle']))
     content.append(Paragraph(
@@ -643,38 +855,37 @@ def create_stakeholder_report():
     # Regional Loss Analysis
     content.append(Paragraph("1.1 Regional Loss Distribution", styles['Subtitle']))
     content.append(Paragraph(
-        "Post-harvest losses show significant regional variation across Nigeria, with the North East and South South "
-        "regions experiencing the highest percentage losses (38-40%), while the North West region shows the highest "
-        "absolute tonnage lost due to its larger production volumes (1.35 million tons annually).",
+        f"Post-harvest losses vary across the geopolitical zones: the {top_share['Region']} region loses the largest "
+        f"share of its harvest ({top_share['Loss_Percentage']:.0f}%), while the {top_tonnage['Region']} region shows "
+        f"the highest absolute tonnage lost ({top_tonnage['Annual_Tonnage_Lost'] / 1e6:.2f} million tons annually).",
         styles['Body']
     ))
     
-    content.append(Image(regional_losses_fig, width=7*inch, height=3.5*inch))
+    content.append(figure_flowable(regional_losses_fig, width=7*inch, height=3.5*inch))
     content.append(Spacer(1, 12))
     
     # Value Chain Analysis
     content.append(Paragraph("1.2 Value Chain Loss Analysis", styles['Subtitle']))
-    content.append(Paragraph(
-        "Analysis by value chain stage reveals that storage (32%) and processing (28%) represent the critical "
-        "intervention points, accounting for 60% of all post-harvest losses. This pattern is consistent across "
-        "regions, indicating that targeted solutions in these areas would have the highest impact potential.",
-        styles['Body']
-    ))
+    value_chain_text = (
+        f"{place}, {top_stages['Stage'].iloc[0].lower()} ({top_stages['Loss_Percentage'].iloc[0]:.0f}%) and "
+        f"{top_stages['Stage'].iloc[1].lower()} ({top_stages['Loss_Percentage'].iloc[1]:.0f}%) account for the "
+        f"largest shares of post-harvest losses, making them the priority intervention points for youth businesses."
+    )
+    content.append(Paragraph(value_chain_text, styles['Body']))
     
-    content.append(Image(value_chain_fig, width=5*inch, height=3*inch))
+    content.append(figure_flowable(value_chain_fig, width=5*inch, height=3*inch))
     content.append(Spacer(1, 12))
     
     # Crop-Specific Analysis
     content.append(Paragraph("1.3 Crop-Specific Loss Patterns", styles['Subtitle']))
-    content.append(Paragraph(
-        "Different crops show varying vulnerability to post-harvest losses, with perishables such as tomatoes (45%), "
-        "vegetables (42%), and fruits (40%) showing the highest percentage losses. However, staple crops like maize "
-        "and rice represent the highest absolute tonnage lost, indicating the importance of addressing both "
-        "categories.",
-        styles['Body']
-    ))
+    crop_text = (
+        f"{place}, {highest_rate['Crop'].lower()} shows the highest loss rate ({highest_rate['Loss_Percentage']:.0f}%), "
+        f"while {highest_tonnage['Crop'].lower()} accounts for the largest tonnage lost "
+        f"({highest_tonnage['Annual_Tonnage_Lost']:,.0f} tons{' in the surveyed value chains' if scope else ' a year'})."
+    )
+    content.append(Paragraph(crop_text, styles['Body']))
     
-    content.append(Image(crop_losses_fig, width=7*inch, height=5*inch))
+    content.append(figure_flowable(crop_losses_fig, width=7*inch, height=5*inch))
     content.append(Spacer(1, 12))
     
     # Seasonal Variation
@@ -686,7 +897,7 @@ def create_stakeholder_report():
         styles['Body']
     ))
     
-    content.append(Image(seasonal_fig, width=7*inch, height=3*inch))
+    content.append(figure_flowable(seasonal_fig, width=7*inch, height=3*inch))
     content.append(Spacer(1, 12))
     
     # Youth Opportunity Mapping
@@ -699,7 +910,7 @@ def create_stakeholder_report():
         styles['Body']
     ))
     
-    content.append(Image(business_models_fig, width=7*inch, height=7*inch))
+    content.append(figure_flowable(business_models_fig, width=7*inch, height=7*inch))
     content.append(Spacer(1, 12))
     
     # Business Models Detail
@@ -755,7 +966,7 @@ def create_stakeholder_report():
         styles['Body']
     ))
     
-    content.append(Image(roadmap_fig, width=7*inch, height=3*inch))
+    content.append(figure_flowable(roadmap_fig, width=7*inch, height=3*inch))
     content.append(Spacer(1, 12))
     
     # Impact Projections
@@ -766,7 +977,7 @@ def create_stakeholder_report():
         styles['Body']
     ))
     
-    content.append(Image(impact_fig, width=7*inch, height=3*inch))
+    content.append(figure_flowable(impact_fig, width=7*inch, height=3*inch))
     content.append(Spacer(1, 12))
     
     content.append(Paragraph(
@@ -847,20 +1058,217 @@ def create_stakeholder_report():
     
     # Build PDF document
     doc.build(content)
-    print(f"Report successfully generated: {report_path}")
+    os.replace(report_path + '.tmp', report_path)
+    if scope is None:
+        print(f"Report successfully generated: {report_path}")
     return report_path
 
+# ============================================================
+# BATCH REPORTS BY ZONE AND STATE
+# ============================================================
+
+def report_slug(name):
+    """File name stem for a zone or state, e.g. 'Akwa Ibom' -> 'akwa_ibom'"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def zone_data(data, dashboard_df, zone):
+    """Report data with the value chain and crop losses replaced by the zone's own"""
+    rows = dashboard_df[dashboard_df['geopolitical_zone'] == zone]
+    stage_loss = rows.groupby('value_chain_stage', sort=False)['loss_tons'].sum()
+    # Production and loss rate repeat on each value chain stage row of a state's crop
+    crops = rows.drop_duplicates(['state', 'crop'])
+    zone_inputs = dict(data)
+    zone_inputs['stage_loss'] = pd.DataFrame({
+        'Stage': stage_loss.index,
+        'Loss_Percentage': (100 * stage_loss / stage_loss.sum()).round(1).to_numpy()
+    })
+    zone_inputs['crop_loss'] = pd.DataFrame({
+        'Crop': crops['crop'].unique(),
+        'Loss_Percentage': crops.groupby('crop', sort=False)['phl_rate'].mean().round(1).to_numpy(),
+        'Annual_Tonnage_Lost': rows.groupby('crop', sort=False)['loss_tons'].sum().reindex(
+            crops['crop'].unique()).to_numpy()
+    })
+    return zone_inputs
+
+
+def scope_summary(rows, business_models):
+    """Key figures for a zone's or state's rows of the dashboard data, as display strings"""
+    crops = rows.drop_duplicates(['state', 'crop'])
+    crop_losses = rows.groupby('crop')['loss_tons'].sum().nlargest(3)
+    model_names = dict(zip(business_models['model_id'], business_models['model_name']))
+    model_ids = sorted(set(re.findall(r'BM-\d+', ' '.join(rows['applicable_business_models'].astype(str)))))
+    summary = {}
+    if rows['state'].nunique() > 1:
+        summary['States covered'] = ', '.join(rows['state'].unique())
+    summary.update({
+        'Crop production (tons)': f"{crops['production_tons'].sum():,.0f}",
+        'Post-harvest losses (tons)': f"{rows['loss_tons'].sum():,.0f}",
+        'Average loss rate': f"{crops['phl_rate'].mean():.1f}%",
+        'Financial impact': f"N{rows['financial_impact'].sum():,.0f}",
+        'Value recoverable through interventions': f"N{rows['intervention_value'].sum():,.0f}",
+        'Crops with the largest losses': ', '.join(f"{crop} ({tons:,.0f} tons)" for crop, tons in crop_losses.items()),
+        'Stage with the largest losses': rows.groupby('value_chain_stage')['loss_tons'].sum().idxmax(),
+        'Applicable business models': ', '.join(f"{model_names.get(model_id, model_id)} ({model_id})"
+                                                for model_id in model_ids)
+    })
+    return summary
+
+
+def build_zone_reports(jobs):
+    """Build one zone's reports (the zone's and its states'); returns their manifest entries"""
+    entries = []
+    for report_path, data, figures, scope in jobs:
+        create_stakeholder_report(report_path, data, figures, scope)
+        with open(report_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        entries.append({
+            'level': scope['level'],
+            'name': scope['name'],
+            'zone': scope['zone'],
+            'path': report_path,
+            'bytes': os.path.getsize(report_path),
+            'sha256': digest,
+            'figures': figures
+        })
+    return entries
+
+
+def create_stakeholder_reports(output_dir=BATCH_REPORT_DIR, workers=None, dashboard_path=DASHBOARD_DATA,
+                               fmt=FIGURE_FORMAT):
+    """
+    Create one stakeholder report per geopolitical zone and per state.
+
+    Every distinct figure is rendered once: the national figures through the
+    figure cache, and each zone's value chain and crop figures to files named
+    after their hash, shared by the zone's report and its states' reports.
+    Reports are built across a process pool with one zone and its states per
+    task, so each worker encodes a zone's figures for the PDF once. The run
+    ends by writing manifest.json, which is also returned.
+    """
+    print("Loading data...")
+    data = load_phl_data()
+    dashboard_df = load_dataset(dashboard_path)
+    zones = list(dict.fromkeys(dashboard_df['geopolitical_zone']))
+
+    print("Generating visualizations...")
+    figures = render_figures(data, workers, fmt=fmt)
+    os.makedirs(ZONE_FIGURE_DIR, exist_ok=True)
+    zone_inputs, zone_figures, stale = {}, {}, {}
+    for zone in zones:
+        zone_inputs[zone] = zone_data(data, dashboard_df, zone)
+        zone_figures[zone] = dict(figures)
+        for name in ZONE_FIGURES:
+            path = figure_path(os.path.join(ZONE_FIGURE_DIR, f'{name}_{figure_key(name, zone_inputs[zone])[:16]}'), fmt)
+            zone_figures[zone][name] = path
+            if not os.path.exists(path):
+                stale[path] = (name, zone_inputs[zone])
+    render_all([(name, inputs, path) for path, (name, inputs) in stale.items()], workers)
+    print(f"Rendered {len(stale)} of {len(zones) * len(ZONE_FIGURES)} zone figures")
+
+    tasks = []
+    for zone in zones:
+        rows = dashboard_df[dashboard_df['geopolitical_zone'] == zone]
+        task = [(os.path.join(output_dir, 'zones', f'{report_slug(zone)}.pdf'), zone_inputs[zone], zone_figures[zone],
+                 {'level': 'zone', 'name': zone, 'zone': zone, 'title': f'{zone} Zone',
+                  'summary': scope_summary(rows, data['business_models'])})]
+        for state, state_rows in rows.groupby('state', sort=False):
+            task.append((os.path.join(output_dir, 'states', f'{report_slug(state)}.pdf'), zone_inputs[zone],
+                         zone_figures[zone],
+                         {'level': 'state', 'name': state, 'zone': zone,
+                          'title': state if state == 'FCT' else f'{state} State',
+                          'summary': scope_summary(state_rows, data['business_models'])}))
+        tasks.append(task)
+
+    os.makedirs(os.path.join(output_dir, 'zones'), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, 'states'), exist_ok=True)
+    print(f"Creating {sum(map(len, tasks))} report documents...")
+    workers = workers or min(os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = [build_zone_reports(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(build_zone_reports, tasks))
+
+    manifest = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'report_date': REPORT_DATE,
+        'reports': [entry for entries in results for entry in entries]
+    }
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+def benchmark_figure_formats(formats=('png', 'svg'), output_dir='reports/benchmarks'):
+    """
+    Figure render time, report build time and sizes of the national report
+    with each figure format. Each run is appended to
+    figure_format_benchmark.csv in output_dir so changes can be tracked.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    data = load_phl_data()
+    rows = []
+    for fmt in formats:
+        if fmt == 'svg' and FIGURE_FORMAT != 'svg':
+            print("svglib is not installed; skipping the SVG benchmark")
+            continue
+        # A fresh cache file makes every figure render
+        cache_path = os.path.join(output_dir, f'figure_cache_{fmt}.json')
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        started = time.perf_counter()
+        figures = render_figures(data, workers=1, cache_path=cache_path, fmt=fmt)
+        render_seconds = time.perf_counter() - started
+
+        report_path = os.path.join(output_dir, f'stakeholder_report_{fmt}.pdf')
+        started = time.perf_counter()
+        create_stakeholder_report(report_path, data, figures)
+        build_seconds = time.perf_counter() - started
+        rows.append({
+            'run': datetime.now().isoformat(timespec='seconds'),
+            'figure_format': fmt,
+            'figure_render_seconds': round(render_seconds, 2),
+            'report_build_seconds': round(build_seconds, 2),
+            'figure_kb': round(sum(os.path.getsize(path) for path in figures.values()) / 1024),
+            'report_kb': round(os.path.getsize(report_path) / 1024)
+        })
+
+    results = pd.DataFrame(rows)
+    results_path = os.path.join(output_dir, 'figure_format_benchmark.csv')
+    if os.path.exists(results_path):
+        results = pd.concat([pd.read_csv(results_path), results], ignore_index=True)
+    results.to_csv(results_path + '.tmp', index=False)
+    os.replace(results_path + '.tmp', results_path)
+    return pd.DataFrame(rows)
+
 # ============================================================
 # MAIN EXECUTION
 # ============================================================
 
 if __name__ == "__main__":
-    report_path = create_stakeholder_report()
-    print(f"YouthHarvest Stakeholder Report generated at: {report_path}")
-    
-    # Additional message about dashboard deployment
-    print("\nNote: For the interactive UI deployment:")
-    print("1. The visualizations in this report can be integrated into a web-based dashboard")
-    print("2. Use Flask/FastAPI backend with React frontend for full interactivity")
-    print("3. Ensure mobile responsiveness for field access by youth entrepreneurs")
-    print("4. Consider offline functionality for areas with limited connectivity")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the YouthHarvest stakeholder report")
+    parser.add_argument('--batch', action='store_true',
+                        help="Create one report per geopolitical zone and per state instead of the national report")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Compare report size and build time with PNG and SVG figures")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(benchmark_figure_formats().to_string(index=False))
+    elif args.batch:
+        manifest = create_stakeholder_reports(workers=args.workers)
+        print(f"{len(manifest['reports'])} stakeholder reports generated in {BATCH_REPORT_DIR} "
+              f"(manifest: {os.path.join(BATCH_REPORT_DIR, 'manifest.json')})")
+    else:
+        report_path = create_stakeholder_report()
+        print(f"YouthHarvest Stakeholder Report generated at: {report_path}")
+        
+        # Additional message about dashboard deployment
+        print("\nNote: For the interactive UI deployment:")
+        print("1. The visualizations in this report can be integrated into a web-based dashboard")
+        print("2. Use Flask/FastAPI backend with React frontend for full interactivity")
+        print("3. Ensure mobile responsiveness for field access by youth entrepreneurs")
+        print("4. Consider offline functionality for areas with limited connectivity")
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+YouthHarvest Project: layered lineage graph diagrams for the reports
+
+Draws directed lineage graphs (datasets, analysis scripts and the outputs
+they feed) for the reports. The data integration diagram used to place its
+16 nodes by hand and draw them with networkx; the pipeline's real lineage
+graph has hundreds of datasets and scripts, so node positions are now
+computed by a layered layout:
+
+  - nodes are assigned to layers by their longest path from a source, so
+    every edge points forward
+  - nodes within a layer are ordered by alternating barycenter sweeps, which
+    keeps connected nodes close and reduces edge crossings; ties are broken
+    by name, so a graph always gets the same layout regardless of the order
+    its nodes and edges were given in
+
+The layout depends only on the graph's structure. It is cached on disk under
+a hash of the sorted nodes (with their types) and edges, so later report
+builds reuse it. Drawing uses one collection for the node boxes, one quiver
+for all edges and a label per node, and the figure is sized from the layout
+so it is saved in a single draw; this keeps vector output fast and small for
+graphs with hundreds of nodes. When the widest layers would make the figure
+far wider than a page (or, left to right, far taller), layers are wrapped
+into several staggered rows, so the figure keeps roughly a page's shape and
+is not scaled down to an unreadable strip.
+"""
+
+import hashlib
+import json
+import math
+import os
+from collections import defaultdict
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+from matplotlib.lines import Line2D
+from matplotlib.patches import FancyBboxPatch
+
+from vector_figures import save_figure
+
+LAYOUT_CACHE_DIR = 'reports/figures/lineage_layouts'
+LAYOUT_VERSION = 1
+ORDERING_SWEEPS = 8
+
+NODE_COLORS = {
+    'dataset': '#5DADE2',
+    'script': '#AF7AC5',
+    'analysis': '#F5B041',
+    'output': '#58D68D'
+}
+DEFAULT_NODE_COLOR = '#BDC3C7'
+TYPE_LABELS = {'dataset': 'Datasets', 'script': 'Scripts', 'analysis': 'Analyses', 'output': 'Outputs'}
+
+# Inches between layers and between neighbouring nodes in a layer, by direction ('TB' top to bottom, 'LR' left to right)
+LAYOUT_SPACING = {'TB': (1.1, 1.75), 'LR': (2.6, 0.65)}
+# Inches between the rows (TB) or columns (LR) a wide layer is wrapped into
+WRAP_SPACING = {'TB': 0.6, 'LR': 2.2}
+# Width / height of the page a figure is drawn into; layouts more than WRAP_RATIO times wider than it are wrapped
+PAGE_ASPECT = 7 / 9
+WRAP_RATIO = 3
+MARGIN = 0.4
+HEADER_HEIGHT = 0.9   # inches above the graph for the title and legend
+FONT_SIZE = 9
+BOX_PAD = 0.3   # node box padding, in font sizes
+
+
+def graph_key(nodes, edges):
+    """Hash of a graph's structure: its nodes with their types and its edges, in any order"""
+    structure = {
+        'version': LAYOUT_VERSION,
+        'nodes': sorted([name, node_type] for name, node_type in nodes.items()),
+        'edges': sorted([source, target] for source, target in edges)
+    }
+    return hashlib.sha256(json.dumps(structure, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _check_graph(nodes, edges):
+    unknown = sorted({node for edge in edges for node in edge} - set(nodes))
+    if unknown:
+        raise ValueError(f"Lineage graph edges reference unknown nodes: {unknown[:5]}")
+
+
+def assign_layers(nodes, edges):
+    """Layer index of each node: the length of the longest path reaching it from a source"""
+    successors = defaultdict(set)
+    indegree = dict.fromkeys(nodes, 0)
+    for source, target in set(edges):
+        successors[source].add(target)
+        indegree[target] += 1
+
+    layer = dict.fromkeys(nodes, 0)
+    ready = sorted(node for node, degree in indegree.items() if degree == 0)
+    visited = 0
+    while ready:
+        node = ready.pop()
+        visited += 1
+        for target in successors[node]:
+            layer[target] = max(layer[target], layer[node] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    if visited < len(nodes):
+        cycle = sorted(node for node, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Lineage graph has a cycle through {cycle[:5]}")
+    return layer
+
+
+def layered_layout(nodes, edges, sweeps=ORDERING_SWEEPS):
+    """
+    Layers of the graph, each a list of node names in drawing order.
+
+    Nodes are ordered within their layer by the mean position of their
+    neighbours in the layers above (downward sweeps) or below (upward
+    sweeps), starting from name order; positions are centred per layer so
+    layers of different sizes line up.
+    """
+    _check_graph(nodes, edges)
+    layer_of = assign_layers(nodes, edges)
+    layers = [[] for _ in range(max(layer_of.values(), default=-1) + 1)]
+    for node in sorted(nodes):
+        layers[layer_of[node]].append(node)
+
+    predecessors, successors = defaultdict(list), defaultdict(list)
+    for source, target in sorted(set(edges)):
+        predecessors[target].append(source)
+        successors[source].append(target)
+
+    position = {}
+    for nodes_in_layer in layers:
+        for index, node in enumerate(nodes_in_layer):
+            position[node] = index - (len(nodes_in_layer) - 1) / 2
+
+    for sweep in range(sweeps):
+        downward = sweep % 2 == 0
+        neighbours = predecessors if downward else successors
+        for nodes_in_layer in (layers[1:] if downward else layers[-2::-1]):
+            def barycenter(node):
+                linked = neighbours[node]
+                return sum(position[other] for other in linked) / len(linked) if linked else position[node]
+            nodes_in_layer.sort(key=lambda node: (barycenter(node), position[node], node))
+            for index, node in enumerate(nodes_in_layer):
+                position[node] = index - (len(nodes_in_layer) - 1) / 2
+    return layers
+
+
+def cached_layout(nodes, edges, cache_dir=LAYOUT_CACHE_DIR):
+    """layered_layout, computed once per graph structure and cached on disk"""
+    cache_path = os.path.join(cache_dir, f'{graph_key(nodes, edges)[:32]}.json')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)['layers']
+
+    layers = layered_layout(nodes, edges)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'version': LAYOUT_VERSION, 'layers': layers}, f)
+    os.replace(cache_path + '.tmp', cache_path)
+    return layers
+
+
+def _box_size(label, font_size=FONT_SIZE):
+    """Approximate (width, height) in inches of a node's text box"""
+    lines = label.split('\n')
+    pad = 2 * BOX_PAD * font_size / 72
+    return max(map(len, lines)) * 0.6 * font_size / 72 + pad, len(lines) * 1.2 * font_size / 72 + pad
+
+
+def _extent(sizes, direction, max_layer_width):
+    """Approximate (across, along) extent in inches of layers of `sizes` nodes wrapped at max_layer_width"""
+    layer_spacing, node_spacing = LAYOUT_SPACING[direction]
+    wraps = sum(-(-size // max_layer_width) - 1 for size in sizes)
+    across = min(max(sizes), max_layer_width) * node_spacing
+    return across, len(sizes) * layer_spacing + wraps * WRAP_SPACING[direction]
+
+
+def wrap_width(layers, direction='TB'):
+    """
+    Most nodes per row for a layout: the widest layer, unless that makes the
+    layout more than WRAP_RATIO times as elongated across its layers as a
+    PAGE_ASPECT page, in which case the row width that brings it closest to
+    the page's shape.
+    """
+    sizes = [len(nodes_in_layer) for nodes_in_layer in layers if nodes_in_layer]
+    if not sizes:
+        return 1
+    # Across is the page's width for top-to-bottom layouts and its height for left-to-right ones
+    target = PAGE_ASPECT if direction == 'TB' else 1 / PAGE_ASPECT
+
+    def shape(width):
+        across, along = _extent(sizes, direction, width)
+        return across / along
+
+    if shape(max(sizes)) <= WRAP_RATIO * target:
+        return max(sizes)
+    return min(range(1, max(sizes) + 1), key=lambda width: abs(math.log(shape(width) / target)))
+
+
+def node_positions(layers, direction='TB', max_layer_width=None):
+    """
+    Node centres in inches from the top-left margin for a layout drawn in `direction`.
+
+    A layer of more than max_layer_width nodes (wrap_width by default) is
+    split, in drawing order, into rows of at most that many nodes; every
+    other full row is shifted by half a node so edges to later layers pass
+    between the nodes of the rows below them.
+    """
+    if direction not in LAYOUT_SPACING:
+        raise ValueError(f"Unknown lineage graph direction '{direction}'; expected one of {list(LAYOUT_SPACING)}")
+    layer_spacing, node_spacing = LAYOUT_SPACING[direction]
+    max_layer_width = max_layer_width or wrap_width(layers, direction)
+    widest = min(max(map(len, layers), default=1), max_layer_width)
+    positions = {}
+    along = 0
+    for nodes_in_layer in layers:
+        rows = [nodes_in_layer[start:start + max_layer_width]
+                for start in range(0, len(nodes_in_layer), max_layer_width)]
+        for row_index, row in enumerate(rows):
+            offset = (widest - len(row)) / 2
+            if len(rows) > 1 and row_index % 2 and len(row) == max_layer_width:
+                offset += 0.5
+            for index, node in enumerate(row):
+                across = (offset + index) * node_spacing
+                positions[node] = (across, -along) if direction == 'TB' else (along, -across)
+            if row_index < len(rows) - 1:
+                along += WRAP_SPACING[direction]
+        along += layer_spacing
+    return positions
+
+
+def draw_lineage_graph(nodes, edges, save_path, title=None, direction='TB', cache_dir=LAYOUT_CACHE_DIR,
+                       font_size=FONT_SIZE, max_layer_width=None):
+    """
+    Draw a lineage graph and save it with save_figure (vector for .svg/.pdf paths).
+
+    nodes maps node names (which are also the labels; use '\\n' to wrap) to a
+    node type, coloured by NODE_COLORS; edges are (source, target) pairs.
+    Layers wider than max_layer_width are wrapped (see node_positions).
+    Returns save_path.
+    """
+    positions = node_positions(cached_layout(nodes, edges, cache_dir), direction, max_layer_width)
+    boxes = {node: _box_size(node, font_size) for node in positions}
+    left = min((x - boxes[node][0] / 2 for node, (x, _) in positions.items()), default=0) - MARGIN
+    right = max((x + boxes[node][0] / 2 for node, (x, _) in positions.items()), default=0) + MARGIN
+    bottom = min((y - boxes[node][1] / 2 for node, (_, y) in positions.items()), default=0) - MARGIN / 2
+    top = max((y + boxes[node][1] / 2 for node, (_, y) in positions.items()), default=0) + MARGIN / 2
+
+    # The figure is sized so one data unit is one inch, with a header band for the title and legend;
+    # box sizes and arrow offsets are computed up front, so the figure is saved without trimming
+    header = HEADER_HEIGHT if title else HEADER_HEIGHT / 2
+    width, height = right - left, top - bottom + header
+    fig = Figure(figsize=(width, height))
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, (top - bottom) / height])
+    ax.set_xlim(left, right)
+    ax.set_ylim(bottom, top)
+    ax.axis('off')
+
+    # Edges run from the edge of the source box to the edge of the target box, drawn as one quiver
+    starts_x, starts_y, deltas_x, deltas_y = [], [], [], []
+    for source, target in sorted(set(edges)):
+        (x0, y0), (x1, y1) = positions[source], positions[target]
+        dx, dy = x1 - x0, y1 - y0
+        cut = [min(box_width / 2 / abs(dx) if dx else float('inf'), box_height / 2 / abs(dy) if dy else float('inf'))
+               for box_width, box_height in (boxes[source], boxes[target])]
+        if cut[0] + cut[1] >= 1:
+            continue
+        starts_x.append(x0 + dx * cut[0])
+        starts_y.append(y0 + dy * cut[0])
+        deltas_x.append(dx * (1 - cut[0] - cut[1]))
+        deltas_y.append(dy * (1 - cut[0] - cut[1]))
+    if starts_x:
+        ax.quiver(starts_x, starts_y, deltas_x, deltas_y, angles='xy', scale_units='xy', scale=1,
+                  units='inches', width=0.012, headwidth=5, headlength=6, headaxislength=5.5,
+                  color='gray', alpha=0.7, zorder=1)
+
+    # Node boxes as one collection, labels sharing one font
+    corner = BOX_PAD * font_size / 72 / 2
+    ax.add_collection(PatchCollection(
+        [FancyBboxPatch((x - boxes[node][0] / 2 + corner, y - boxes[node][1] / 2 + corner),
+                        boxes[node][0] - 2 * corner, boxes[node][1] - 2 * corner, boxstyle=f'round,pad={corner}')
+         for node, (x, y) in positions.items()],
+        facecolors=[NODE_COLORS.get(nodes[node], DEFAULT_NODE_COLOR) for node in positions],
+        edgecolors='none', alpha=0.85, zorder=2))
+    font = FontProperties(size=font_size, weight='bold')
+    for node, (x, y) in positions.items():
+        ax.text(x, y, node, ha='center', va='center', fontproperties=font, zorder=3)
+
+    node_types = list(dict.fromkeys(nodes.values()))
+    handles = [Line2D([0], [0], marker='s', color='w', markerfacecolor=NODE_COLORS.get(node_type, DEFAULT_NODE_COLOR),
+                      markersize=12, label=TYPE_LABELS.get(node_type, node_type.title()))
+               for node_type in node_types]
+    if handles:
+        fig.legend(handles=handles, loc='lower center', bbox_to_anchor=(0.5, (top - bottom) / height),
+                   ncol=len(handles), frameon=False, fontsize=font_size + 1)
+    if title:
+        fig.text(0.5, 1 - 0.1 / height, title, ha='center', va='top', fontsize=16, fontweight='bold')
+    return save_figure(fig, save_path, bbox_inches=None)
@@ -0,0 +1,128 @@
+"""
+YouthHarvest Project: memoized dataset loading for the reports
+
+The report generators read the cleaned and analysis datasets through
+load_dataset, which parses each source file at most once per version of the
+file:
+
+  - files are identified by the sha256 of their contents; the hash is
+    recomputed only when a file's modification time or size changes, and the
+    known hashes are kept in an index on disk, so later runs do not re-read
+    unchanged files just to hash them
+  - the first parse of a version is saved to the on-disk cache (Parquet when
+    pyarrow is installed, a pickle otherwise) under its hash; later runs read
+    only the requested columns from it instead of parsing the CSV again
+  - each (version, columns) projection is memoized in the process, so
+    repeated report builds (e.g. the zone and state batch) reuse the frames
+
+Frames returned by load_dataset are shared between callers and must not be
+modified in place.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet cache engine)
+except ImportError:  # without pyarrow parsed datasets are cached as pickles
+    pyarrow = None
+
+DATA_CACHE_DIR = 'reports/data_cache'
+HASH_INDEX = 'file_hashes.json'
+
+_file_hashes = None   # path -> {'signature': [mtime_ns, size], 'sha256': ...}, shared with the on-disk index
+_frames = {}          # (sha256, columns) -> DataFrame
+stats = {'memory_hits': 0, 'disk_hits': 0, 'parses': 0, 'hashes': 0}
+
+
+def _load_hash_index(cache_dir):
+    global _file_hashes
+    if _file_hashes is None:
+        try:
+            with open(os.path.join(cache_dir, HASH_INDEX), encoding='utf-8') as f:
+                _file_hashes = json.load(f)
+        except (OSError, ValueError):
+            _file_hashes = {}
+    return _file_hashes
+
+
+def _save_hash_index(cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, HASH_INDEX)
+    with open(path + f'.{os.getpid()}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(_file_hashes, f, indent=2)
+    os.replace(path + f'.{os.getpid()}.tmp', path)
+
+
+def file_hash(path, cache_dir=DATA_CACHE_DIR, chunk_size=1 << 20):
+    """sha256 of a file's contents, recomputed only when its modification time or size changes"""
+    hashes = _load_hash_index(cache_dir)
+    key = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = [stat.st_mtime_ns, stat.st_size]
+    known = hashes.get(key)
+    if known and known['signature'] == signature:
+        return known['sha256']
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    hashes[key] = {'signature': signature, 'sha256': digest.hexdigest()}
+    stats['hashes'] += 1
+    _save_hash_index(cache_dir)
+    return hashes[key]['sha256']
+
+
+def load_dataset(path, columns=None, cache_dir=DATA_CACHE_DIR):
+    """
+    A CSV dataset as a DataFrame, restricted to `columns` if given.
+
+    Parsed at most once per version of the file across runs (see the module
+    docstring); the result is shared and must be treated as read-only.
+    """
+    digest = file_hash(path, cache_dir)
+    key = (digest, tuple(columns) if columns is not None else None)
+    if key in _frames:
+        stats['memory_hits'] += 1
+        return _frames[key]
+
+    cached = os.path.join(cache_dir, digest[:32] + ('.parquet' if pyarrow is not None else '.pkl'))
+    if os.path.exists(cached):
+        stats['disk_hits'] += 1
+        if pyarrow is not None:
+            frame = pd.read_parquet(cached, columns=list(columns) if columns is not None else None)
+        else:
+            frame = pd.read_pickle(cached)
+    else:
+        stats['parses'] += 1
+        frame = pd.read_csv(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file and swap it in, so a concurrent reader never sees a partial cache file
+        temporary = cached + f'.{os.getpid()}.tmp'
+        if pyarrow is not None:
+            frame.to_parquet(temporary, index=False)
+        else:
+            frame.to_pickle(temporary)
+        os.replace(temporary, cached)
+
+    if columns is not None:
+        missing = set(columns) - set(frame.columns)
+        if missing:
+            raise ValueError(f"'{path}' has no columns {sorted(missing)}")
+        frame = frame[list(columns)]
+    _frames[key] = frame
+    return frame
+
+
+def source_hashes(paths, cache_dir=DATA_CACHE_DIR):
+    """Content hashes of several source files, e.g. to key results derived from all of them"""
+    return tuple(file_hash(path, cache_dir) for path in paths)
+
+
+def clear_memory():
+    """Drop the frames memoized in this process (the on-disk cache is kept)"""
+    _frames.clear()
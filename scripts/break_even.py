@@ -0,0 +1,257 @@
+"""
+YouthHarvest Project: break-even search over intervention parameters
+
+Answers questions such as "at what crop price does Solar Dryers break even in
+the North East?" without editing constants and rerunning economic_analysis.py.
+
+For one intervention and one parameter, the solver finds the value at which
+the lifespan ROI from roi_engine is exactly zero in every crop x state cell at
+once. Each state uses its own crop price from the price store and a baseline
+loss scaled by its loss rate in the dashboard dataset. The root is found by
+vectorised bisection (on a log scale, since the break-even value can be orders
+of magnitude away from the current one) within PARAMETER_BOUNDS; cells whose
+ROI does not change sign within the bounds have no break-even and are NaN.
+
+Solutions are kept in an LRU cache of MAX_CACHED_SOLUTIONS entries per
+(intervention, parameter, overrides), so repeated queries for other crops,
+states or zones only filter the cached table.
+
+Command line:
+    python scripts/break_even.py "Solar Dryers" crop_value --zone "North East"
+"""
+
+import argparse
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from roi_engine import roi_metrics
+
+# Parameters that can be solved for, with the label used in results
+BREAK_EVEN_PARAMETERS = {
+    'crop_value': 'Crop Price (₦/ton)',
+    'baseline_loss': 'Baseline Loss (tons/ha)',
+    'expected_loss_reduction': 'Expected Loss Reduction',
+    'implementation_cost': 'Implementation Cost (₦)',
+    'annual_operating_cost': 'Annual Operating Cost (₦)',
+    'lifespan_years': 'Lifespan (years)'
+}
+
+# Search range for each parameter as multiples of its current value, or absolute limits
+SEARCH_MULTIPLES = (1e-6, 1e6)
+PARAMETER_BOUNDS = {
+    'expected_loss_reduction': (1e-6, 1.0)
+}
+BISECTION_STEPS = 64
+MAX_CACHED_SOLUTIONS = 128
+
+
+class BreakEvenError(ValueError):
+    """Raised for unknown interventions, parameters or overrides"""
+
+
+def bisect_roots(function, low, high, steps=BISECTION_STEPS):
+    """
+    Roots of an elementwise monotonic function between positive `low` and `high`.
+
+    Bisects every element at once on a log scale; elements where the function
+    has the same sign at both bounds are NaN.
+    """
+    low, high = np.broadcast_arrays(np.log(low), np.log(high))
+    low, high = low.copy(), high.copy()
+    value_low = function(np.exp(low))
+    bracketed = np.sign(value_low) != np.sign(function(np.exp(high)))
+    for _ in range(steps):
+        middle = (low + high) / 2
+        same_side = np.sign(function(np.exp(middle))) == np.sign(value_low)
+        low = np.where(same_side, middle, low)
+        high = np.where(same_side, high, middle)
+    return np.where(bracketed, np.exp((low + high) / 2), np.nan)
+
+
+class BreakEvenSolver:
+    """Break-even values of intervention parameters for every crop and state"""
+
+    def __init__(self, interventions_economic, baseline_losses, state_losses, prices, intervention_crops=None,
+                 max_entries=MAX_CACHED_SOLUTIONS):
+        self.interventions_economic = interventions_economic
+        self.baseline_losses = baseline_losses
+        self.prices = prices
+        self.intervention_crops = intervention_crops or {}
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.load(state_losses)
+
+    def load(self, state_losses):
+        """Use new state losses (dashboard dataset rows); clears the cache"""
+        crops = [crop for crop in self.baseline_losses if crop in self.prices]
+        df = state_losses[state_losses['crop'].isin(crops)]
+        states = list(dict.fromkeys(df['state']))
+
+        totals = df.groupby(['crop', 'state'], sort=False).agg(
+            loss_tons=('loss_tons', 'sum'), production_tons=('production_tons', 'first'))
+        totals = totals.reindex(pd.MultiIndex.from_product([crops, states]), fill_value=0)
+        losses = totals['loss_tons'].to_numpy(dtype=float).reshape(len(crops), len(states))
+        production = totals['production_tons'].to_numpy(dtype=float).reshape(len(crops), len(states))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loss_rate = np.where(production > 0, losses / production, 0)
+            mean_rate = losses.sum(axis=1, keepdims=True) / production.sum(axis=1, keepdims=True)
+            # States with higher loss rates lose (and can save) more per hectare
+            multiplier = np.where(mean_rate > 0, loss_rate / mean_rate, 0)
+
+        with self._lock:
+            self.crops = crops
+            self.states = states
+            self.zones = dict(zip(df['state'], df['geopolitical_zone']))
+            self.crop_value = np.array([self.prices.prices([crop] * len(states), states) for crop in crops])
+            self.baseline_loss = np.array([self.baseline_losses[crop] for crop in crops])[:, np.newaxis] * multiplier
+            self._cache.clear()
+
+    def _inputs(self, intervention, overrides):
+        """Current ROI inputs for one intervention, each broadcastable to [crop, state]"""
+        details = {**self.interventions_economic[intervention], **overrides}
+        capacity = details['capacity_tons']
+        return {
+            'implementation_cost': float(details['implementation_cost']),
+            'annual_operating_cost': float(details['annual_operating_cost']),
+            'lifespan_years': float(details['lifespan_years']),
+            'expected_loss_reduction': float(details['expected_loss_reduction']),
+            'capacity_tons': np.nan if capacity is None else float(capacity),
+            'beneficiaries_per_unit': float(details['beneficiaries_per_unit']),
+            'baseline_loss': overrides.get('baseline_loss', self.baseline_loss),
+            'crop_value': overrides.get('crop_value', self.crop_value)
+        }
+
+    @staticmethod
+    def _roi(inputs):
+        return roi_metrics(
+            implementation_cost=inputs['implementation_cost'],
+            operating_cost=inputs['annual_operating_cost'],
+            lifespan=inputs['lifespan_years'],
+            loss_reduction=inputs['expected_loss_reduction'],
+            capacity=inputs['capacity_tons'],
+            beneficiaries=inputs['beneficiaries_per_unit'],
+            loss=inputs['baseline_loss'],
+            value=inputs['crop_value']
+        )['roi']
+
+    def _validate(self, intervention, parameter, overrides):
+        if intervention not in self.interventions_economic:
+            raise BreakEvenError(f"Unknown intervention '{intervention}'")
+        if parameter not in BREAK_EVEN_PARAMETERS:
+            raise BreakEvenError(f"Unknown parameter '{parameter}' (expected one of {list(BREAK_EVEN_PARAMETERS)})")
+        for name, value in overrides.items():
+            if name not in BREAK_EVEN_PARAMETERS or name == parameter:
+                raise BreakEvenError(f"Cannot override '{name}' when solving for '{parameter}'")
+            if not isinstance(value, (int, float)) or not math.isfinite(value) or value <= 0:
+                raise BreakEvenError(f"Override '{name}' must be a positive finite number")
+
+    def _compute(self, intervention, parameter, overrides):
+        inputs = self._inputs(intervention, overrides)
+        shape = (len(self.crops), len(self.states))
+        current = np.broadcast_to(inputs[parameter], shape)
+
+        def roi_at(value):
+            return np.broadcast_to(self._roi({**inputs, parameter: value}), shape)
+
+        if parameter in PARAMETER_BOUNDS:
+            low, high = PARAMETER_BOUNDS[parameter]
+        else:
+            low, high = current * SEARCH_MULTIPLES[0], current * SEARCH_MULTIPLES[1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            break_even = bisect_roots(roi_at, low, high)
+            change = (break_even / current - 1) * 100
+
+        crops = [crop for crop in self.crops if crop in self.intervention_crops.get(intervention, self.crops)]
+        c = np.repeat([self.crops.index(crop) for crop in crops], len(self.states))
+        s = np.tile(np.arange(len(self.states)), len(crops))
+        return pd.DataFrame({
+            'Intervention': intervention,
+            'Parameter': BREAK_EVEN_PARAMETERS[parameter],
+            'Crop': np.asarray(self.crops)[c],
+            'State': np.asarray(self.states)[s],
+            'Zone': [self.zones[state] for state in np.asarray(self.states)[s]],
+            'Current Value': current[c, s],
+            'Break-even Value': break_even[c, s],
+            'Change Needed (%)': change[c, s],
+            'Current ROI (%)': roi_at(current)[c, s]
+        })
+
+    def solve(self, intervention, parameter, crop=None, state=None, zone=None, overrides=None):
+        """
+        Break-even values of `parameter` for `intervention` in each crop x state.
+
+        `overrides` replaces other parameters (e.g. {"implementation_cost":
+        500000}) before solving; crop, state and zone filter the result.
+        """
+        overrides = dict(overrides or {})
+        self._validate(intervention, parameter, overrides)
+        key = (intervention, parameter, tuple(sorted(overrides.items())))
+        with self._lock:
+            table = self._cache.get(key)
+            self.counters['hits' if table is not None else 'misses'] += 1
+            if table is not None:
+                self._cache.move_to_end(key)
+        if table is None:
+            table = self._compute(intervention, parameter, overrides)
+            with self._lock:
+                self._cache[key] = table
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+                    self.counters['evictions'] += 1
+
+        for column, value in (('Crop', crop), ('State', state), ('Zone', zone)):
+            if value is not None:
+                if value not in set(table[column]):
+                    raise BreakEvenError(f"Unknown {column.lower()} '{value}' for {intervention}")
+                table = table[table[column] == value]
+        return table.reset_index(drop=True)
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'cached_solutions': len(self._cache)}
+
+
+def default_solver(state_losses=None):
+    """Solver over the economic_analysis interventions and the dashboard state losses"""
+    import economic_analysis as ea
+    from price_store import load_price_store
+
+    if state_losses is None:
+        state_losses = pd.read_csv(ea.STATE_LOSS_DATA)
+    return BreakEvenSolver(ea.interventions_economic, ea.baseline_losses, state_losses,
+                           load_price_store(), ea.intervention_crops)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the break-even value of an intervention parameter by crop and state")
+    parser.add_argument('intervention', help="Intervention name, e.g. 'Solar Dryers'")
+    parser.add_argument('parameter', choices=list(BREAK_EVEN_PARAMETERS))
+    parser.add_argument('--crop')
+    parser.add_argument('--state')
+    parser.add_argument('--zone', help="Geopolitical zone, e.g. 'North East'")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help="Override another parameter before solving (repeatable)")
+    parser.add_argument('--json', action='store_true', help="Print records as JSON instead of a table")
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.set:
+        name, _, value = item.partition('=')
+        overrides[name] = float(value)
+    try:
+        result = default_solver().solve(args.intervention, args.parameter, crop=args.crop, state=args.state,
+                                        zone=args.zone, overrides=overrides)
+    except BreakEvenError as error:
+        parser.error(str(error))
+
+    if args.json:
+        print(json.dumps(json.loads(result.to_json(orient='records')), indent=2))
+    else:
+        print(result.to_string(index=False))
@@ -0,0 +1,195 @@
+"""
+YouthHarvest Project: time-phased cash flows, NPV and IRR for interventions
+
+The ROI in economic_analysis.py takes the annual value as flat and
+undiscounted over the lifespan. This engine instead builds a yearly cash flow
+for one unit of each intervention x crop x scale-up scenario:
+
+  - capex in year 0, re-incurred whenever a unit reaches the end of its
+    lifespan inside the planning horizon, with the undepreciated share of the
+    last unit credited back as salvage in the final year
+  - opex in every operating year
+  - benefits ramping up over the first years of adoption (RAMP_UP) before
+    reaching the full annual value
+  - scenario efficiency scaling benefits and cost overrun scaling costs
+
+Cash flows are arrays shaped [intervention, crop, scenario, year], so NPV,
+IRR and discounted payback for every combination are a handful of vectorised
+operations. IRR uses Newton's method on all rows at once, and rows that do
+not converge fall back to bisection.
+"""
+
+import numpy as np
+import pandas as pd
+
+from roi_engine import evaluate_roi
+
+DISCOUNT_RATE = 0.15     # real discount rate for agricultural investment in Nigeria
+HORIZON_YEARS = 10       # longest intervention lifespan
+RAMP_UP = (0.5, 0.8)     # share of the full benefit in operating years 1 and 2
+IRR_BOUNDS = (-0.99, 1e4)
+
+
+def cash_flows(interventions, crops, scenarios, horizon_years=HORIZON_YEARS, ramp_up=RAMP_UP):
+    """
+    Yearly cash flow components per unit, each shaped [intervention, crop, scenario, year].
+
+    Returns a dict with capex, opex, benefit, salvage and net (benefit +
+    salvage - capex - opex), for years 0..horizon_years.
+    """
+    annual_value = evaluate_roi(interventions, crops)['annual_value'][:, :, 0, 0]
+    efficiency = np.array([params['efficiency'] for params in scenarios.values()], dtype=float)
+    cost_overrun = np.array([params['cost_overrun'] for params in scenarios.values()], dtype=float)
+
+    years = np.arange(horizon_years + 1)
+    lifespan = interventions['lifespan_years'][:, np.newaxis]
+    # Units are bought in year 0 and replaced at the end of each lifespan within the horizon
+    purchases = (years % lifespan == 0) & (years < horizon_years)
+    operating = (years > 0).astype(float)
+    ramp = operating.copy()
+    ramp[1:len(ramp_up) + 1] = ramp_up[:horizon_years]
+
+    # Undepreciated share of the last unit at the end of the horizon
+    last_purchase = (horizon_years - 1) // lifespan[:, 0] * lifespan[:, 0]
+    remaining_share = (lifespan[:, 0] - (horizon_years - last_purchase)) / lifespan[:, 0]
+
+    cost_scale = cost_overrun[np.newaxis, np.newaxis, :, np.newaxis]
+    implementation_cost = interventions['implementation_cost'][:, np.newaxis, np.newaxis, np.newaxis] * cost_scale
+    capex = implementation_cost * purchases[:, np.newaxis, np.newaxis, :]
+    opex = interventions['annual_operating_cost'][:, np.newaxis, np.newaxis, np.newaxis] * cost_scale * operating
+    benefit = (annual_value[:, :, np.newaxis, np.newaxis]
+               * efficiency[np.newaxis, np.newaxis, :, np.newaxis] * ramp)
+    salvage = np.zeros_like(capex)
+    salvage[..., -1] = implementation_cost[..., 0] * remaining_share[:, np.newaxis, np.newaxis]
+
+    shape = np.broadcast_shapes(capex.shape, opex.shape, benefit.shape)
+    components = {
+        'capex': np.broadcast_to(capex, shape),
+        'opex': np.broadcast_to(opex, shape),
+        'benefit': np.broadcast_to(benefit, shape),
+        'salvage': np.broadcast_to(salvage, shape)
+    }
+    components['net'] = components['benefit'] + components['salvage'] - components['capex'] - components['opex']
+    return components
+
+
+def discount_factors(years, rate=DISCOUNT_RATE):
+    return (1 + rate) ** -np.arange(years)
+
+
+def npv(flows, rate=DISCOUNT_RATE):
+    """Net present value of cash flows along the last axis"""
+    flows = np.asarray(flows, dtype=float)
+    return flows @ discount_factors(flows.shape[-1], rate)
+
+
+def _npv_at(flows, rates):
+    """NPV of each row of `flows` at its own rate"""
+    return (flows * (1 + rates[:, np.newaxis]) ** -np.arange(flows.shape[1])).sum(axis=1)
+
+
+def _bisect_irr(flows, bounds=IRR_BOUNDS, iterations=100):
+    """IRR by bisection; NaN for rows whose NPV does not change sign within the bounds"""
+    rate = np.full(len(flows), np.nan)
+    value_low = _npv_at(flows, np.full(len(flows), bounds[0]))
+    bracketed = np.sign(value_low) != np.sign(_npv_at(flows, np.full(len(flows), bounds[1])))
+    flows, value_low = flows[bracketed], value_low[bracketed]
+    low = np.full(len(flows), bounds[0])
+    high = np.full(len(flows), bounds[1])
+    for _ in range(iterations):
+        middle = (low + high) / 2
+        value = _npv_at(flows, middle)
+        same_side = np.sign(value) == np.sign(value_low)
+        low = np.where(same_side, middle, low)
+        value_low = np.where(same_side, value, value_low)
+        high = np.where(same_side, high, middle)
+    rate[bracketed] = (low + high) / 2
+    return rate
+
+
+def irr(flows, guess=0.1, tolerance=1e-10, max_iterations=50):
+    """
+    Internal rate of return of cash flows along the last axis.
+
+    Newton's method runs on every row at once; rows that diverge, leave the
+    IRR_BOUNDS or do not converge are solved by bisection. Rows without a
+    sign change in NPV have no IRR and are NaN.
+    """
+    flows = np.asarray(flows, dtype=float)
+    shape = flows.shape[:-1]
+    flows = flows.reshape(-1, flows.shape[-1])
+    years = np.arange(flows.shape[1])
+
+    rate = np.full(len(flows), guess)
+    active = np.arange(len(flows))
+    with np.errstate(all='ignore'):
+        # Iterate only on the rows that have not converged yet
+        for _ in range(max_iterations):
+            current = rate[active]
+            discounted = flows[active] * (1 + current[:, np.newaxis]) ** -years
+            step = discounted.sum(axis=1) / (-(years * discounted).sum(axis=1) / (1 + current))
+            rate[active] = np.clip(current - step, *IRR_BOUNDS)
+            active = active[~(np.abs(step) <= tolerance * np.maximum(1, np.abs(rate[active])))]
+            if not len(active):
+                break
+        unsolved = ~np.isfinite(rate) | (rate <= IRR_BOUNDS[0]) | (rate >= IRR_BOUNDS[1])
+        unsolved[active] = True
+        if unsolved.any():
+            rate[unsolved] = _bisect_irr(flows[unsolved])
+    return rate.reshape(shape)
+
+
+def discounted_payback(flows, rate=DISCOUNT_RATE):
+    """
+    Years until cumulative discounted cash flow turns non-negative.
+
+    Interpolated linearly within the crossing year; infinity when the
+    investment is not recovered within the horizon.
+    """
+    flows = np.asarray(flows, dtype=float)
+    discounted = flows * discount_factors(flows.shape[-1], rate)
+    cumulative = np.cumsum(discounted, axis=-1)
+    recovered = cumulative >= 0
+    year = recovered.argmax(axis=-1)[..., np.newaxis]
+    before = np.take_along_axis(cumulative, np.maximum(year - 1, 0), axis=-1)[..., 0]
+    gain = np.take_along_axis(discounted, year, axis=-1)[..., 0]
+    year = year[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = np.where(year > 0, year - 1 - before / gain, 0.0)
+    return np.where(recovered.any(axis=-1), payback, np.inf)
+
+
+def cash_flow_table(interventions, crops, scenarios, mask=None, rate=DISCOUNT_RATE,
+                    horizon_years=HORIZON_YEARS, ramp_up=RAMP_UP):
+    """
+    One row per intervention x crop x scenario with NPV, IRR, discounted
+    payback and the yearly net cash flows, skipping masked combinations.
+    """
+    components = cash_flows(interventions, crops, scenarios, horizon_years, ramp_up)
+    net = components['net']
+    npv_values = npv(net, rate)
+    irr_values = irr(net)
+    payback = discounted_payback(net, rate)
+
+    if mask is None:
+        mask = np.ones((len(interventions), len(crops)), dtype=bool)
+    i, c, s = np.nonzero(np.repeat(mask[:, :, np.newaxis], len(scenarios), axis=2))
+    pick = (i, c, s)
+    table = {
+        'Intervention': interventions['name'][i],
+        'Crop': crops['name'][c],
+        'Scenario': np.asarray(list(scenarios))[s],
+        'Discount Rate (%)': rate * 100,
+        'Horizon (years)': horizon_years,
+        'Units Purchased': (components['capex'][pick] > 0).sum(axis=-1),
+        'Total Capex (₦)': components['capex'][pick].sum(axis=-1),
+        'Total Opex (₦)': components['opex'][pick].sum(axis=-1),
+        'Total Benefit (₦)': components['benefit'][pick].sum(axis=-1),
+        'Salvage Value (₦)': components['salvage'][pick].sum(axis=-1),
+        'NPV (₦)': npv_values[pick],
+        'IRR (%)': irr_values[pick] * 100,
+        'Discounted Payback (years)': payback[pick]
+    }
+    for year in range(horizon_years + 1):
+        table[f'Net Cash Flow Year {year} (₦)'] = net[pick][:, year]
+    return pd.DataFrame(table)
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
+from price_store import load_price_store
 
 # Create results directory if it doesn't exist
 os.makedirs('results/plots', exist_ok=True)
@@ -193,25 +194,22 @@ plt.close()
 print("Created plot: 'results/plots/total_losses_by_crop.png'")
 
 # Financial impact of post-harvest losses
-# Assuming average prices per unit for each crop
-crop_prices = {
-    'Maize': 120,  # Naira per unit
-    'Rice': 350,
-    'Sorghum': 110,
-    'Millet': 100,
-    'Wheat': 300,
-    'Barley': 250,
-    'Fonio': 400,
-    'Oats': 280,
-    'Teff': 450
+# Each state's losses are valued at that state's market price from the price store (Naira per ton)
+prices = load_price_store()
+crop_names = [crop for crop in losses_df.columns[1:] if crop in prices]
+financial_losses = {
+    crop: float((losses_df[crop] * prices.prices([crop] * len(losses_df), losses_df['State'])).sum())
+    for crop in crop_names
 }
 
 # Calculate financial losses
 financial_df = pd.DataFrame()
-financial_df['Crop'] = list(crop_prices.keys())
-financial_df['Loss Volume'] = [total_losses_by_crop[crop] if crop in total_losses_by_crop else 0 for crop in crop_prices]
-financial_df['Price Per Unit'] = [crop_prices[crop] for crop in crop_prices]
-financial_df['Financial Loss'] = financial_df['Loss Volume'] * financial_df['Price Per Unit']
+financial_df['Crop'] = crop_names
+financial_df['Loss Volume'] = [total_losses_by_crop[crop] if crop in total_losses_by_crop else 0 for crop in crop_names]
+# Loss-weighted average price across states; the national price for crops without losses
+financial_df['Price Per Unit'] = [financial_losses[crop] / volume if volume else prices.price(crop)
+                                  for crop, volume in zip(crop_names, financial_df['Loss Volume'])]
+financial_df['Financial Loss'] = [financial_losses[crop] for crop in crop_names]
 
 # Save financial losses to CSV
 financial_df.to_csv('results/financial_impact.csv', index=False)
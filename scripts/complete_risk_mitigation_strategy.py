@@ -4,6 +4,10 @@ import numpy as np
 import os
 import json
 
+from keyword_matcher import KeywordMatcher
+from risk_mitigation_config import mitigation_keywords
+from risk_register import save_risk_register, scatter_risks
+
 # Ensure directory structure exists
 os.makedirs('results/interventions/risks', exist_ok=True)
 
@@ -532,16 +536,12 @@ for category, category_data in risk_categories.items():
     for risk in category_data["risks"]:
         risk_dict = risk.copy()
         risk_dict["category"] = category
-        risk_dict["mitigation_strategies"] = "; ".join(risk_dict["mitigation_strategies"])
-        risk_dict["root_causes"] = "; ".join(risk_dict["root_causes"])
-        risk_dict["monitoring_indicators"] = "; ".join(risk_dict["monitoring_indicators"])
-        risk_dict["affected_interventions"] = "; ".join(risk_dict["affected_interventions"])
         risk_data.append(risk_dict)
 
 risk_df = pd.DataFrame(risk_data)
 
-# Export comprehensive risk register to CSV
-risk_df.to_csv('results/interventions/risks/comprehensive_risk_register.csv', index=False)
+# Export comprehensive risk register to CSV (and Parquet with list columns, when pyarrow is installed)
+save_risk_register(risk_df, 'results/interventions/risks/comprehensive_risk_register.csv')
 print("Comprehensive risk register saved to CSV")
 
 # Create a risk heat map based on likelihood and impact
@@ -555,37 +555,37 @@ risk_df["impact_score"] = risk_df["impact"].map(impact_map)
 # Create the heat map visualization
 plt.figure(figsize=(12, 10))
 
-# Create a scatter plot with risk IDs as markers
-for idx, risk in risk_df.iterrows():
-    plt.scatter(
-        risk["impact_score"], 
-        risk["likelihood_score"], 
-        s=200, 
-        alpha=0.7,
-        c=plt.cm.YlOrRd(risk["risk_score"]/9)
-    )
-    plt.annotate(
-        risk["risk_id"], 
-        (risk["impact_score"], risk["likelihood_score"]),
-        ha='center', va='center', fontsize=9, color='white',
-        fontweight='bold'
-    )
-
-# Add risk names with lines connecting to points
-for idx, risk in risk_df.iterrows():
-    plt.annotate(
-        risk["risk_name"],
-        (risk["impact_score"], risk["likelihood_score"]),
-        xytext=(10 if risk["impact_score"] < 2.5 else -10, 
-                5 if risk["likelihood_score"] < 2.5 else -5),
+# Plot every risk with one scatter call, labelled with its ID and name
+# (large registers switch to density mode instead of labelling each risk)
+def annotate_risk(ax, label, impact, likelihood):
+    risk_id, risk_name = label
+    ax.annotate(risk_id, (impact, likelihood), ha='center', va='center', fontsize=9, color='white',
+                fontweight='bold')
+    ax.annotate(
+        risk_name,
+        (impact, likelihood),
+        xytext=(10 if impact < 2.5 else -10,
+                5 if likelihood < 2.5 else -5),
         textcoords="offset points",
-        ha='left' if risk["impact_score"] < 2.5 else 'right',
+        ha='left' if impact < 2.5 else 'right',
         va='center',
         fontsize=8,
         bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", alpha=0.8),
         arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=0.2", color="gray")
     )
 
+scatter_risks(
+    plt.gca(),
+    risk_df["impact_score"],
+    risk_df["likelihood_score"],
+    risk_df["risk_score"],
+    labels=list(zip(risk_df["risk_id"], risk_df["risk_name"])),
+    annotate=annotate_risk,
+    cmap='YlOrRd', vmin=0, vmax=9,
+    s=200,
+    alpha=0.7
+)
+
 # Set up the grid for the risk matrix
 plt.xlim(0.5, 3.5)
 plt.ylim(0.5, 3.5)
@@ -621,38 +621,17 @@ print("Risk heat map visualization saved")
 # Create a mitigation strategy effectiveness analysis
 # We'll analyze key mitigation approaches across risk categories
 
-# Count the number of times different mitigation approaches appear
-mitigation_keywords = {
-    "Participatory Design": ["participatory", "user input", "co-creation", "collaborative design"],
-    "Capacity Building": ["training", "skills", "capacity", "knowledge"],
-    "Technology Adaptation": ["adapt", "flexible", "modular", "resilient design"],
-    "Financial Innovation": ["financing", "leasing", "pay-as-you", "credit", "loans"],
-    "Market Linkages": ["market", "linkage", "buyer", "contract", "aggregation"],
-    "Digital Solutions": ["digital", "mobile", "app", "online", "software"],
-    "Partnership Models": ["partnership", "collaboration", "cooperative", "collective"],
-    "Diversification": ["diversif", "multiple crops", "variety", "portfolio"],
-    "Policy Engagement": ["policy", "advocacy", "regulatory", "compliance"],
-    "Resource Efficiency": ["efficient", "conservation", "renewable", "sustainable"]
-}
-
-# Function to count keyword occurrences
-def count_keyword_occurrences(text, keywords):
-    text = text.lower()
-    count = 0
-    for keyword in keywords:
-        if keyword.lower() in text:
-            count += 1
-    return min(count, 1)  # Count only presence, not multiple occurrences
+# Count the number of times different mitigation approaches appear (keywords in risk_mitigation_config.py)
 
-# Analyze mitigation strategies
+# Analyze mitigation strategies: one pass over each risk's strategies finds every approach
+mitigation_matcher = KeywordMatcher(mitigation_keywords)
 mitigation_by_category = {}
 for category, category_data in risk_categories.items():
     mitigation_by_category[category] = {approach: 0 for approach in mitigation_keywords}
     for risk in category_data["risks"]:
         mitigation_text = " ".join(risk["mitigation_strategies"])
-        for approach, keywords in mitigation_keywords.items():
-            if any(keyword.lower() in mitigation_text.lower() for keyword in keywords):
-                mitigation_by_category[category][approach] += 1
+        for approach in mitigation_matcher.match(mitigation_text):
+            mitigation_by_category[category][approach] += 1
 
 # Convert to DataFrame for visualization
 mitigation_df = pd.DataFrame(mitigation_by_category)
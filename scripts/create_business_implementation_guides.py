@@ -1,10 +1,17 @@
 import os
 import json
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 
+from guide_templates import (GUIDE_LABELS, GUIDE_LANGUAGES, LOCALIZED_GUIDE_DIR, SCRIPT_DIR, compiled_templates,
+                             render_localized_guides, write_rendered)
+
+# Per-state crop losses ship with the scripts; the guides themselves are written from the repository root
+STATE_DATA = os.path.join(SCRIPT_DIR, 'data/original/enhanced_post_harvest_losses.csv')
+
 # Ensure directories exist
 os.makedirs('results/youth_opportunities/implementation_guides', exist_ok=True)
 os.makedirs('results/youth_opportunities/case_studies', exist_ok=True)
@@ -448,208 +455,42 @@ def generate_json_implementation_guides(models):
 
 # Function to create markdown implementation guides
 def generate_markdown_implementation_guides(models):
+    guide_template, case_study_template = compiled_templates(GUIDE_LABELS)
     for model in models:
         # Create markdown version for better readability
         filepath = f"results/youth_opportunities/implementation_guides/{model['model_id']}_implementation_guide.md"
-        
-        # Begin constructing the markdown content
-        md_content = f"# {model['model_name']} Implementation Guide\n\n"
-        md_content += f"**Model ID:** {model['model_id']}\n\n"
-        md_content += f"**Tagline:** {model.get('tagline', '')}\n\n"
-        
-        # Description
-        if "description" in model:
-            md_content += "## Overview\n\n"
-            md_content += f"{model['description'].strip()}\n\n"
-        
-        # Value proposition
-        if "value_proposition" in model:
-            md_content += "## Value Proposition\n\n"
-            for item in model['value_proposition']:
-                md_content += f"- {item}\n"
-            md_content += "\n"
-        
-        # Target crops and customers
-        if "target_crops" in model:
-            md_content += "## Target Crops\n\n"
-            md_content += ", ".join(model['target_crops']) + "\n\n"
-        
-        if "target_customers" in model:
-            md_content += "## Target Customers\n\n"
-            if isinstance(model['target_customers'], list):
-                for customer in model['target_customers']:
-                    md_content += f"- {customer}\n"
-            elif isinstance(model['target_customers'], dict):
-                for category, customers in model['target_customers'].items():
-                    md_content += f"### {category.title()}\n\n"
-                    for customer in customers:
-                        md_content += f"- {customer}\n"
-                    md_content += "\n"
-            md_content += "\n"
-        
-        # Geographical focus
-        if "geographical_focus" in model:
-            md_content += "## Geographical Focus\n\n"
-            for area in model['geographical_focus']:
-                md_content += f"- {area}\n"
-            md_content += "\n"
-        
-        # Equipment needs
-        if "equipment_needs" in model:
-            md_content += "## Equipment Needs\n\n"
-            
-            if "essential" in model['equipment_needs']:
-                md_content += "### Essential Equipment\n\n"
-                md_content += "| Item | Specifications | Estimated Cost | Lifespan |\n"
-                md_content += "|------|---------------|----------------|----------|\n"
-                for item in model['equipment_needs']['essential']:
-                    md_content += f"| {item['item']} | {item['specifications']} | {item['estimated_cost']} | {item['lifespan']} |\n"
-                md_content += "\n"
-            
-            if "optional" in model['equipment_needs']:
-                md_content += "### Optional Equipment\n\n"
-                md_content += "| Item | Specifications | Estimated Cost | Lifespan |\n"
-                md_content += "|------|---------------|----------------|----------|\n"
-                for item in model['equipment_needs']['optional']:
-                    md_content += f"| {item['item']} | {item['specifications']} | {item['estimated_cost']} | {item['lifespan']} |\n"
-                md_content += "\n"
-        
-        # Setup costs
-        if "setup_costs" in model:
-            md_content += "## Setup Costs\n\n"
-            md_content += "| Category | Cost |\n"
-            md_content += "|----------|------|\n"
-            for category, cost in model['setup_costs'].items():
-                md_content += f"| {category.replace('_', ' ').title()} | {cost} |\n"
-            md_content += "\n"
-        
-        # Revenue model
-        if "revenue_model" in model:
-            md_content += "## Revenue Model\n\n"
-            for key, value in model['revenue_model'].items():
-                if isinstance(value, list):
-                    md_content += f"### {key.replace('_', ' ').title()}\n\n"
-                    for item in value:
-                        if isinstance(item, dict):
-                            for k, v in item.items():
-                                md_content += f"**{k.replace('_', ' ').title()}:** {v}\n\n"
-                        else:
-                            md_content += f"- {item}\n"
-                    md_content += "\n"
-                else:
-                    md_content += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
-        
-        # Operating costs
-        if "operating_costs" in model:
-            md_content += "## Operating Costs\n\n"
-            md_content += "| Category | Cost |\n"
-            md_content += "|----------|------|\n"
-            for category, cost in model['operating_costs'].items():
-                md_content += f"| {category.replace('_', ' ').title()} | {cost} |\n"
-            md_content += "\n"
-        
-        # Profitability
-        if "profitability" in model:
-            md_content += "## Profitability\n\n"
-            for key, value in model['profitability'].items():
-                md_content += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
-        
-        # Key success factors
-        if "key_success_factors" in model:
-            md_content += "## Key Success Factors\n\n"
-            for factor in model['key_success_factors']:
-                md_content += f"- {factor}\n"
-            md_content += "\n"
-        
-        # Challenges and solutions
-        if "challenges_and_solutions" in model:
-            md_content += "## Challenges and Solutions\n\n"
-            for item in model['challenges_and_solutions']:
-                md_content += f"### Challenge: {item['challenge']}\n\n"
-                md_content += "**Solutions:**\n\n"
-                for solution in item['solutions']:
-                    md_content += f"- {solution}\n"
-                md_content += "\n"
-        
-        # Implementation steps
-        if "implementation_steps" in model:
-            md_content += "## Implementation Steps\n\n"
-            for item in model['implementation_steps']:
-                md_content += f"### {item['step']}\n\n"
-                md_content += "**Activities:**\n\n"
-                for activity in item['activities']:
-                    md_content += f"- {activity}\n"
-                md_content += "\n"
-                md_content += f"**Timeframe:** {item['timeframe']}\n\n"
-                md_content += f"**Resources Needed:** {item['resources_needed']}\n\n"
-                md_content += f"**Success Indicators:** {item['success_indicators']}\n\n"
-        
-        # Digital enhancements
-        if "digital_enhancements" in model:
-            md_content += "## Digital Enhancements\n\n"
-            
-            if "essential" in model['digital_enhancements']:
-                md_content += "### Essential Digital Tools\n\n"
-                for tool in model['digital_enhancements']['essential']:
-                    md_content += f"#### {tool['technology']}\n\n"
-                    md_content += f"**Description:** {tool['description']}\n\n"
-                    md_content += f"**Benefits:** {tool['benefits']}\n\n"
-                    md_content += f"**Implementation:** {tool['implementation']}\n\n"
-            
-            if "advanced" in model['digital_enhancements']:
-                md_content += "### Advanced Digital Tools\n\n"
-                for tool in model['digital_enhancements']['advanced']:
-                    md_content += f"#### {tool['technology']}\n\n"
-                    md_content += f"**Description:** {tool['description']}\n\n"
-                    md_content += f"**Benefits:** {tool['benefits']}\n\n"
-                    md_content += f"**Implementation:** {tool['implementation']}\n\n"
-        
-        # Financing options
-        if "financing_options" in model:
-            md_content += "## Financing Options\n\n"
-            for option in model['financing_options']:
-                md_content += f"### {option['option']}\n\n"
-                md_content += f"**Providers:** {option['providers']}\n\n"
-                md_content += f"**Features:** {option['features']}\n\n"
-                md_content += f"**Requirements:** {option['requirements']}\n\n"
-                md_content += f"**Application Process:** {option['application_process']}\n\n"
-        
-        # Write the markdown file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(md_content)
-        
+        write_rendered(filepath, guide_template.render, model)
         print(f"Created implementation guide markdown for {model['model_id']}: {model['model_name']}")
         
         # Create case study markdown if available
         if "case_study" in model:
             case_study_filepath = f"results/youth_opportunities/case_studies/{model['model_id']}_case_study.md"
-            
-            cs_md_content = f"# Case Study: {model['case_study']['title']}\n\n"
-            cs_md_content += f"**Entrepreneur:** {model['case_study']['entrepreneur']}\n\n"
-            cs_md_content += "## Background\n\n"
-            cs_md_content += f"{model['case_study']['background'].strip()}\n\n"
-            cs_md_content += "## Starting Point\n\n"
-            cs_md_content += f"{model['case_study']['starting_point'].strip()}\n\n"
-            cs_md_content += "## Implementation\n\n"
-            cs_md_content += f"{model['case_study']['implementation'].strip()}\n\n"
-            cs_md_content += "## Challenges Faced\n\n"
-            cs_md_content += f"{model['case_study']['challenges_faced'].strip()}\n\n"
-            cs_md_content += "## Results\n\n"
-            cs_md_content += f"{model['case_study']['results'].strip()}\n\n"
-            
-            cs_md_content += "## Key Lessons\n\n"
-            for lesson in model['case_study']['key_lessons']:
-                cs_md_content += f"- {lesson}\n"
-            cs_md_content += "\n"
-            
-            cs_md_content += "## Future Plans\n\n"
-            cs_md_content += f"{model['case_study']['future_plans'].strip()}\n\n"
-            
-            with open(case_study_filepath, 'w', encoding='utf-8') as f:
-                f.write(cs_md_content)
-            
+            write_rendered(case_study_filepath, case_study_template.render, model['case_study'])
             print(f"Created case study markdown for {model['model_id']}")
 
+# Local context of each model in each state: the state's production and loss rates for the model's target crops
+def load_local_contexts(models, state_data=STATE_DATA):
+    states = pd.read_csv(state_data)
+    contexts = {}
+    for model in models:
+        crops = [crop for crop in model.get('target_crops', []) if f'{crop}_Production' in states]
+        for row in states.itertuples(index=False):
+            row = row._asdict()
+            contexts[(model['model_id'], row['State'])] = {
+                "state": row['State'],
+                "zone": row['Zone'],
+                "crops": [
+                    {
+                        "crop": crop,
+                        "production_tons": float(row[f'{crop}_Production']),
+                        "loss_rate": float(row[f'{crop}_LossRate']),
+                        "tons_lost": float(row[f'{crop}_Loss'])
+                    }
+                    for crop in crops if row[f'{crop}_Production'] > 0
+                ]
+            }
+    return contexts
+
 # Create visualizations for the business models
 def create_business_model_visualizations(models):
     # Prepare data for charts
@@ -805,9 +646,27 @@ def create_index_file(models):
     print("Created README index for implementation guides")
 
 # Execute the functions to generate all outputs
-generate_json_implementation_guides(priority_business_models)
-generate_markdown_implementation_guides(priority_business_models)
-create_business_model_visualizations(priority_business_models)
-create_index_file(priority_business_models)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the business model implementation guides")
+    parser.add_argument('--localized', action='store_true',
+                        help="Also write guides for every business model x state x language")
+    parser.add_argument('--languages', nargs='+', choices=list(GUIDE_LANGUAGES), help="Languages to localize into (default: English and languages with a label catalog)")
+    parser.add_argument('--workers', type=int, help="Processes rendering localized guides (default: one per CPU)")
+    parser.add_argument('--force', action='store_true', help="Render localized guides even if their inputs are unchanged")
+    args = parser.parse_args()
+
+    generate_json_implementation_guides(priority_business_models)
+    generate_markdown_implementation_guides(priority_business_models)
+    create_business_model_visualizations(priority_business_models)
+    create_index_file(priority_business_models)
+
+    if args.localized:
+        summary = render_localized_guides(priority_business_models, load_local_contexts(priority_business_models),
+                                          languages=args.languages, workers=args.workers, force=args.force)
+        print(f"Localized guides: {summary['rendered']} rendered, {summary['skipped']} unchanged "
+              f"of {summary['outputs']} in {summary['seconds']}s ({LOCALIZED_GUIDE_DIR})")
+        for language, count in summary['untranslated_labels'].items():
+            if count:
+                print(f"  {GUIDE_LANGUAGES[language]}: {count} labels not yet translated, shown in English")
 
-print("\nBusiness implementation guides successfully created!")
\ No newline at end of file
+    print("\nBusiness implementation guides successfully created!")
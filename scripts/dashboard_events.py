@@ -0,0 +1,133 @@
+"""
+YouthHarvest Dashboard: server-sent events for refreshed aggregates
+
+Open dashboards subscribe to one map filter combination (crop x stage x season)
+over a long-lived text/event-stream connection. When the dataset behind the
+dashboard is refreshed, the aggregate cache is updated incrementally and each
+subscriber is sent only the per-state values that changed for its own
+combination, rather than every client re-polling /map/states.
+
+Each subscriber owns a bounded queue. A client that stops reading and lets its
+queue fill up is dropped instead of holding back the others; the browser's
+EventSource reconnects with Last-Event-ID and is sent a fresh snapshot.
+"""
+
+import json
+import os
+import queue
+import threading
+
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 64
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encode one server-sent event"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    payload = json.dumps(data, separators=(',', ':'))
+    lines.extend(f'data: {line}' for line in payload.splitlines())
+    return '\n'.join(lines) + '\n\n'
+
+
+class Subscriber:
+    """One open event stream, listening to a single filter combination"""
+
+    def __init__(self, key, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        self.key = key
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+
+class AggregateBroadcaster:
+    """Fans aggregate deltas out to the subscribers whose filters they touch"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.counters = {'events_sent': 0, 'dropped_subscribers': 0}
+
+    def subscribe(self, key):
+        subscriber = Subscriber(key)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        subscriber.closed = True
+
+    def publish(self, version, changes):
+        """
+        Send each subscriber the deltas for its combination.
+
+        `changes` is the output of StateAggregateCache.update(): a mapping of
+        filter key to {metric: {state: value}}, or None when the cache was fully
+        reloaded, in which case every subscriber is told to fetch a snapshot.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            if changes is None:
+                message = ('reload', {'version': version})
+            elif subscriber.key in changes:
+                message = ('delta', {'version': version, 'metrics': changes[subscriber.key]})
+            else:
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+                self.counters['events_sent'] += 1
+            except queue.Full:
+                self.unsubscribe(subscriber)
+                self.counters['dropped_subscribers'] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'subscribers': len(self._subscribers)}
+
+
+class DatasetWatcher(threading.Thread):
+    """Polls input files and calls `on_change` when any of them is modified"""
+
+    def __init__(self, paths, on_change, interval=5.0):
+        super().__init__(daemon=True)
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._signatures = self._snapshot()
+
+    def _snapshot(self):
+        signatures = {}
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                signatures[path] = None
+        return signatures
+
+    def check(self):
+        """Run one poll; returns True if a change was handled"""
+        signatures = self._snapshot()
+        if signatures == self._signatures:
+            return False
+        self.on_change()
+        self._signatures = signatures
+        return True
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as error:
+                # Keep watching: a half-written file is picked up on the next poll
+                print(f"Dashboard refresh failed: {error}")
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,266 @@
+"""
+YouthHarvest Dashboard: API server
+
+Serves the dashboard data API described in results/dashboard/api_specification.json.
+
+Run locally with:
+    python scripts/dashboard_server.py
+or in production with:
+    gunicorn --chdir scripts --worker-class gthread --threads 32 'dashboard_server:create_app()'
+
+/events holds one long-lived connection per open dashboard, so production
+workers need threads (or an async worker class) rather than the default sync
+workers. Dataset, cache, price and model paths resolve from the repository
+root, so both commands work from any working directory.
+"""
+
+import os
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+from break_even import default_solver
+from dashboard_events import HEARTBEAT_SECONDS, AggregateBroadcaster, DatasetWatcher, format_sse
+from phl_model_config import MODEL_PATH
+from price_store import load_price_store, price_source_paths
+from scenario_engine import ScenarioEngine, ScenarioError
+from state_aggregate_cache import ALL, StateAggregateCache
+
+# Data paths are under the repository root, so the server can be started from any directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DATA = os.path.join(REPO_ROOT, 'results/dashboard/data/complete_phl_dashboard_data.csv')
+AGGREGATE_CACHE_DIR = os.path.join(REPO_ROOT, 'results/dashboard/cache/state_aggregates')
+WARM_TOP_N = int(os.environ.get('YOUTHHARVEST_WARM_TOP_N', 50))
+CASH_FLOW_DATA = os.path.join(REPO_ROOT, 'results/interventions/economic/cash_flow_projection.csv')
+CASH_FLOW_FILTERS = {'intervention': 'Intervention', 'crop': 'Crop', 'scenario': 'Scenario'}
+REFRESH_INTERVAL = float(os.environ.get('YOUTHHARVEST_REFRESH_SECONDS', 5))
+
+
+def _filters_from_request():
+    return {
+        'crop': request.args.get('crop', ALL),
+        'stage': request.args.get('stage', ALL),
+        'season': request.args.get('season', ALL)
+    }
+
+
+def _round_vector(values):
+    return [round(float(v), 1) for v in values]
+
+
+def _columns(df):
+    """Column name -> values for a JSON response; non-finite numbers become null"""
+    columns = {}
+    for name, values in df.items():
+        if pd.api.types.is_numeric_dtype(values):
+            values = values.astype(float)
+            columns[name] = [float(v) if np.isfinite(v) else None for v in values]
+        else:
+            columns[name] = values.tolist()
+    return columns
+
+
+class TableFile:
+    """A CSV table re-read only when the file changes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature = None
+        self._df = None
+
+    def get(self):
+        """The current table, or None if the file does not exist"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                self._df = pd.read_csv(self.path)
+                self._signature = signature
+            return self._df
+
+
+def create_app(data_path=DASHBOARD_DATA, cache_dir=AGGREGATE_CACHE_DIR, warm_top_n=WARM_TOP_N,
+               refresh_interval=REFRESH_INTERVAL, cash_flow_path=CASH_FLOW_DATA):
+    """
+    Create the dashboard API app, warming the map aggregate cache at startup.
+
+    When refresh_interval is set, the dataset, PHL model and price source
+    files are watched; open /events streams are sent the aggregates that
+    changed after each refresh, and the scenario engine and break-even solver
+    pick up the new base table, model and prices.
+    """
+    app = Flask(__name__)
+
+    df = pd.read_csv(data_path)
+    # Keep states in dataset order (grouped by geopolitical zone) for the map
+    states = list(dict.fromkeys(df['state']))
+    aggregate_cache = StateAggregateCache(df, states=states, cache_dir=cache_dir)
+    aggregate_cache.warm(top_n=warm_top_n)
+    scenario_engine = ScenarioEngine(df, load_price_store())
+    break_even_solver = default_solver(df)
+    broadcaster = AggregateBroadcaster()
+    cash_flows = TableFile(cash_flow_path)
+    refresh_lock = threading.Lock()
+
+    def refresh_aggregates():
+        """Reload the dataset, update the cube incrementally and push the deltas"""
+        with refresh_lock:
+            df = pd.read_csv(data_path)
+            prices = load_price_store()
+            scenario_engine.prices = break_even_solver.prices = prices
+            scenario_engine.load(df)
+            scenario_engine.load_model()
+            break_even_solver.load(df)
+            changes = aggregate_cache.update(df)
+            if changes is None or changes:
+                broadcaster.publish(aggregate_cache.version, changes)
+            return changes
+
+    app.config['AGGREGATE_CACHE'] = aggregate_cache
+    app.config['SCENARIO_ENGINE'] = scenario_engine
+    app.config['BREAK_EVEN_SOLVER'] = break_even_solver
+    app.config['BROADCASTER'] = broadcaster
+    app.config['REFRESH_AGGREGATES'] = refresh_aggregates
+
+    if refresh_interval:
+        watcher = DatasetWatcher([data_path, MODEL_PATH] + price_source_paths(), refresh_aggregates,
+                                 interval=refresh_interval)
+        watcher.start()
+        app.config['DATASET_WATCHER'] = watcher
+
+    @app.route('/map/states')
+    def map_states():
+        """Per-state loss_tons and financial_impact for a crop x stage x season filter"""
+        filters = _filters_from_request()
+        try:
+            vectors = aggregate_cache.get(**filters)
+        except KeyError as error:
+            return jsonify({'error': str(error.args[0])}), 400
+        return jsonify({
+            'filters': filters,
+            'version': aggregate_cache.version,
+            'states': aggregate_cache.states,
+            'metrics': {metric: _round_vector(values) for metric, values in vectors.items()}
+        })
+
+    @app.route('/map/cache-stats')
+    def map_cache_stats():
+        """Hit/miss counters for the map aggregate cache and event stream counters"""
+        return jsonify({**aggregate_cache.stats(), 'events': broadcaster.stats()})
+
+    @app.route('/scenario', methods=['POST'])
+    def scenario():
+        """Naira and tonnage impact of shifting volume between methods (what-if analysis)"""
+        body = request.get_json(silent=True) or {}
+        edits = body.get('edits')
+        if not isinstance(edits, list) or not edits:
+            return jsonify({'error': "Request body needs a non-empty 'edits' list"}), 400
+        try:
+            result = scenario_engine.run(edits)
+        except ScenarioError as error:
+            return jsonify({'error': str(error)}), 400
+        return jsonify({'edits': edits, **result})
+
+    @app.route('/economics/cash-flows')
+    def economics_cash_flows():
+        """NPV, IRR, discounted payback and yearly net cash flows per intervention, crop and scenario"""
+        df = cash_flows.get()
+        if df is None:
+            return jsonify({'error': f"No cash flow projection at {cash_flow_path}; run economic_analysis.py"}), 404
+        filters = {}
+        selected = np.ones(len(df), dtype=bool)
+        for arg, column in CASH_FLOW_FILTERS.items():
+            value = request.args.get(arg)
+            if value is None:
+                continue
+            if value not in set(df[column]):
+                return jsonify({'error': f"Unknown {arg} '{value}'"}), 400
+            filters[arg] = value
+            selected &= (df[column] == value).to_numpy()
+        return jsonify({
+            'filters': filters,
+            'rows': int(selected.sum()),
+            'columns': _columns(df[selected])
+        })
+
+    @app.route('/economics/break-even')
+    def economics_break_even():
+        """Value of one intervention parameter at which ROI is zero, per crop and state"""
+        intervention, parameter = request.args.get('intervention'), request.args.get('parameter')
+        if not intervention or not parameter:
+            return jsonify({'error': "Query needs 'intervention' and 'parameter'"}), 400
+        try:
+            overrides = {name: float(value) for name, value in request.args.items()
+                         if name not in ('intervention', 'parameter', 'crop', 'state', 'zone')}
+            result = break_even_solver.solve(intervention, parameter, crop=request.args.get('crop'),
+                                             state=request.args.get('state'), zone=request.args.get('zone'),
+                                             overrides=overrides)
+        except ValueError as error:  # BreakEvenError or a non-numeric override
+            return jsonify({'error': str(error)}), 400
+        return jsonify({
+            'intervention': intervention,
+            'parameter': parameter,
+            'overrides': overrides,
+            'rows': len(result),
+            'columns': _columns(result)
+        })
+
+    @app.route('/events')
+    def events():
+        """Server-sent event stream of per-state deltas for one filter combination"""
+        filters = _filters_from_request()
+        try:
+            aggregate_cache.get(**filters)
+        except KeyError as error:
+            return jsonify({'error': str(error.args[0])}), 400
+        last_event_id = request.headers.get('Last-Event-ID')
+        # Subscribe before taking the snapshot so no refresh falls in between
+        subscriber = broadcaster.subscribe(aggregate_cache._key(**filters))
+        version = aggregate_cache.version
+        snapshot = aggregate_cache.get(**filters)
+
+        def stream():
+            try:
+                # A new or reconnecting client that missed a version gets the full vectors
+                if last_event_id != str(version):
+                    yield format_sse({
+                        'version': version,
+                        'filters': filters,
+                        'states': aggregate_cache.states,
+                        'metrics': {metric: _round_vector(values) for metric, values in snapshot.items()}
+                    }, event='snapshot', event_id=version)
+                while not subscriber.closed:
+                    try:
+                        event, data = subscriber.queue.get(timeout=HEARTBEAT_SECONDS)
+                    except queue.Empty:
+                        yield ': heartbeat\n\n'
+                        continue
+                    if event == 'delta':
+                        data = {
+                            **data,
+                            'metrics': {
+                                metric: {state: round(value, 1) for state, value in values.items()}
+                                for metric, values in data['metrics'].items()
+                            }
+                        }
+                    yield format_sse(data, event=event, event_id=data['version'])
+            finally:
+                broadcaster.unsubscribe(subscriber)
+
+        return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), threaded=True)
@@ -1,8 +1,15 @@
 import os
-import json
+import argparse
 import pandas as pd
 import datetime
 
+from json_store import document_path, dump_document
+
+parser = argparse.ArgumentParser(description="Create the project documentation")
+parser.add_argument('--pretty', action='store_true', help="Write indented JSON for reading instead of compact JSON")
+parser.add_argument('--format', choices=['json', 'msgpack'], default='json', help="Document format (default: json)")
+args = parser.parse_args()
+
 # Create directory structure
 os.makedirs('results/documentation/executive_summaries', exist_ok=True)
 os.makedirs('results/documentation/technical_reports', exist_ok=True)
@@ -50,8 +57,8 @@ executive_summary = {
 }
 
 # Write executive summary to file
-with open('results/documentation/executive_summaries/project_executive_summary.json', 'w') as f:
-    json.dump(executive_summary, f, indent=2)
+dump_document(executive_summary, document_path('results/documentation/executive_summaries/project_executive_summary', args.format),
+              pretty=args.pretty, indent=2)
 print("Executive summary documentation created")
 
 # ===== DATA INSIGHTS DOCUMENTATION =====
@@ -141,8 +148,8 @@ data_insights = {
 }
 
 # Write data insights to file
-with open('results/documentation/data_insights/detailed_analysis_insights.json', 'w') as f:
-    json.dump(data_insights, f, indent=2)
+dump_document(data_insights, document_path('results/documentation/data_insights/detailed_analysis_insights', args.format),
+              pretty=args.pretty, indent=2)
 print("Detailed data insights documentation created")
 
 # ===== TECHNICAL INTERVENTION DOCUMENTATION =====
@@ -242,8 +249,8 @@ technical_interventions = {
 }
 
 # Write technical interventions to file
-with open('results/documentation/technical_reports/technical_interventions.json', 'w') as f:
-    json.dump(technical_interventions, f, indent=2)
+dump_document(technical_interventions, document_path('results/documentation/technical_reports/technical_interventions', args.format),
+              pretty=args.pretty, indent=2)
 print("Technical intervention specifications created")
 
 # ===== BUSINESS MODEL DOCUMENTATION =====
@@ -408,8 +415,8 @@ business_models = {
 }
 
 # Write business models to file
-with open('results/documentation/technical_reports/business_models.json', 'w') as f:
-    json.dump(business_models, f, indent=2)
+dump_document(business_models, document_path('results/documentation/technical_reports/business_models', args.format),
+              pretty=args.pretty, indent=2)
 print("Business model documentation created")
 
 # ===== IMPLEMENTATION PLANS DOCUMENTATION =====
@@ -610,8 +617,8 @@ implementation_plans = {
 }
 
 # Write implementation plans to file
-with open('results/documentation/technical_reports/implementation_plans.json', 'w') as f:
-    json.dump(implementation_plans, f, indent=2)
+dump_document(implementation_plans, document_path('results/documentation/technical_reports/implementation_plans', args.format),
+              pretty=args.pretty, indent=2)
 print("Implementation plans documentation created")
 
 # Generate a summary of all documentation created
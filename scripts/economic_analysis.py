@@ -2,9 +2,23 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+from roi_engine import applicability_mask, crops_to_array, evaluate_roi, interventions_to_array, roi_table
+from monte_carlo_engine import default_distributions, run_monte_carlo
+from portfolio_optimizer import PortfolioOptimizer
+from mac_curve import build_mac_curve, mac_options, mac_table, plot_mac_curve
+from cash_flow_engine import cash_flow_table
+from price_store import load_price_store
+from sensitivity_analysis import plot_tornado, run_sensitivity
 
-# Create output directory
-os.makedirs('results/interventions/economic', exist_ok=True)
+# Number of Monte Carlo draws for the scale-up uncertainty analysis
+MONTE_CARLO_DRAWS = 1_000_000
+
+# Budget for the intervention portfolio optimization (Naira) and the state-level losses it targets
+PORTFOLIO_BUDGET = 5_000_000_000
+STATE_LOSS_DATA = 'results/dashboard/data/complete_phl_dashboard_data.csv'
+
+# Saltelli base samples per intervention for the Sobol sensitivity analysis
+SENSITIVITY_SAMPLES = 2 ** 14
 
 # Define economic parameters for ROI analysis
 interventions_economic = {
@@ -58,13 +72,8 @@ interventions_economic = {
     }
 }
 
-# Define crop values for economic calculations (Naira per ton)
-crop_values = {
-    'Maize': 230000,
-    'Rice': 650000,
-    'Sorghum': 200000,
-    'Millet': 180000
-}
+# Define crop values for economic calculations (Naira per ton, national annual average)
+crop_values = load_price_store().crop_prices(['Maize', 'Rice', 'Sorghum', 'Millet'])
 
 # Estimate baseline losses (tons per hectare)
 baseline_losses = {
@@ -74,137 +83,90 @@ baseline_losses = {
     'Millet': 0.3   # 22% of 1.4 tons/ha average yield
 }
 
-# Calculate ROI for each intervention and crop combination
-roi_data = []
+# Interventions that only apply to some crops (e.g., rice mills only for rice)
+intervention_crops = {
+    'Mini Rice Mills': ['Rice']
+}
+
 
-for intervention, int_details in interventions_economic.items():
-    for crop, value in crop_values.items():
-        # Skip if not applicable (e.g., rice mills only for rice)
-        if intervention == 'Mini Rice Mills' and crop != 'Rice':
-            continue
-            
-        # Get baseline loss for this crop
-        baseline_loss = baseline_losses[crop]
-        
-        # Calculate potential loss reduction in tons
-        if int_details['capacity_tons'] is not None:
-            potential_reduction = baseline_loss * int_details['expected_loss_reduction'] * int_details['capacity_tons'] * 250  # Assume 250 working days per year
-        else:
-            # For training programs, assume 2 hectares per farmer
-            potential_reduction = baseline_loss * int_details['expected_loss_reduction'] * int_details['beneficiaries_per_unit'] * 2
-        
-        # Calculate value of loss reduction
-        annual_value = potential_reduction * value
-        
-        # Calculate total costs over lifespan
-        total_cost = int_details['implementation_cost'] + (int_details['annual_operating_cost'] * int_details['lifespan_years'])
-        
-        # Calculate benefits over lifespan
-        total_benefit = annual_value * int_details['lifespan_years']
-        
-        # Calculate ROI
-        roi = (total_benefit - total_cost) / total_cost * 100
-        
-        # Calculate payback period in years
-        if annual_value > int_details['annual_operating_cost']:
-            payback = int_details['implementation_cost'] / (annual_value - int_details['annual_operating_cost'])
-        else:
-            payback = float('inf')  # Infinite payback period if annual value doesn't exceed operating costs
-        
-        # Calculate cost per beneficiary
-        cost_per_beneficiary = int_details['implementation_cost'] / int_details['beneficiaries_per_unit']
-        
-        # Calculate cost per ton saved
-        if potential_reduction > 0:
-            cost_per_ton = int_details['implementation_cost'] / potential_reduction
-        else:
-            cost_per_ton = float('inf')
-        
-        # Add to result list
-        roi_data.append({
-            'Intervention': intervention,
-            'Crop': crop,
-            'Implementation Cost (₦)': int_details['implementation_cost'],
-            'Annual Operating Cost (₦)': int_details['annual_operating_cost'],
-            'Lifespan (years)': int_details['lifespan_years'],
-            'Expected Loss Reduction (%)': int_details['expected_loss_reduction'] * 100,
-            'Potential Annual Reduction (tons)': potential_reduction,
-            'Annual Value of Reduction (₦)': annual_value,
-            'Total Cost over Lifespan (₦)': total_cost,
-            'Total Benefit over Lifespan (₦)': total_benefit,
-            'ROI (%)': roi,
-            'Payback Period (years)': payback,
-            'Cost per Beneficiary (₦)': cost_per_beneficiary,
-            'Cost per Ton Saved (₦)': cost_per_ton
-        })
-
-# Convert to DataFrame
-roi_df = pd.DataFrame(roi_data)
-
-# Save the ROI analysis to CSV
-roi_df.to_csv('results/interventions/economic/roi_analysis.csv', index=False)
-print("ROI analysis saved to 'results/interventions/economic/roi_analysis.csv'")
-
-# Create a bar chart of ROI by intervention and crop
-plt.figure(figsize=(14, 8))
-
-# Group by intervention and crop
-roi_summary = roi_df.pivot(index='Intervention', columns='Crop', values='ROI (%)')
-
-# Plot as grouped bar chart
-roi_summary.plot(kind='bar', figsize=(14, 8))
-plt.title('ROI by Intervention and Crop Type', fontsize=16)
-plt.xlabel('Intervention', fontsize=14)
-plt.ylabel('ROI (%)', fontsize=14)
-plt.grid(axis='y', alpha=0.3)
-plt.legend(title='Crop Type')
-
-plt.tight_layout()
-plt.savefig('results/interventions/economic/roi_by_intervention.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("ROI chart saved to 'results/interventions/economic/roi_by_intervention.png'")
-
-# Create a scatter plot of payback period vs. cost per beneficiary
-plt.figure(figsize=(12, 8))
-
-# Create a color map for different interventions
-intervention_types = roi_df['Intervention'].unique()
-colors = plt.cm.tab10(np.linspace(0, 1, len(intervention_types)))
-intervention_colors = {intervention: colors[i] for i, intervention in enumerate(intervention_types)}
-
-# Create scatter plot
-for intervention in intervention_types:
-    subset = roi_df[roi_df['Intervention'] == intervention]
-    plt.scatter(
-        subset['Cost per Beneficiary (₦)'] / 1000,  # Convert to thousands
-        subset['Payback Period (years)'],
-        s=subset['ROI (%)'] / 10,  # Size based on ROI
-        label=intervention,
-        alpha=0.7,
-        c=[intervention_colors[intervention]] * len(subset)
-    )
+def run_roi_analysis():
+    """ROI, payback, cost per beneficiary and cost per ton for each intervention and crop"""
+    interventions = interventions_to_array(interventions_economic)
+    crops = crops_to_array(crop_values, baseline_losses)
+    mask = applicability_mask(interventions, crops, intervention_crops)
 
-plt.title('Investment Efficiency Analysis', fontsize=16)
-plt.xlabel('Cost per Beneficiary (₦ thousands)', fontsize=14)
-plt.ylabel('Payback Period (years)', fontsize=14)
-plt.grid(alpha=0.3)
-plt.legend(title='Intervention Type')
-
-# Add annotations for best options (low cost, quick payback)
-best_options = roi_df.sort_values(by=['Payback Period (years)', 'Cost per Beneficiary (₦)'])[:3]
-for _, row in best_options.iterrows():
-    plt.annotate(
-        f"{row['Intervention']} ({row['Crop']})",
-        (row['Cost per Beneficiary (₦)']/1000, row['Payback Period (years)']),
-        xytext=(10, -10),
-        textcoords='offset points',
-        arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=.2')
-    )
+    results = evaluate_roi(interventions, crops)
+    roi_df = roi_table(interventions, crops, results, mask)
+
+    # Save the ROI analysis to CSV
+    roi_df.to_csv('results/interventions/economic/roi_analysis.csv', index=False)
+    print("ROI analysis saved to 'results/interventions/economic/roi_analysis.csv'")
+    return roi_df
+
+
+def plot_roi_charts(roi_df):
+    """ROI by intervention and crop, and payback vs. cost per beneficiary"""
+    # Create a bar chart of ROI by intervention and crop
+    plt.figure(figsize=(14, 8))
+
+    # Group by intervention and crop
+    roi_summary = roi_df.pivot(index='Intervention', columns='Crop', values='ROI (%)')
+
+    # Plot as grouped bar chart
+    roi_summary.plot(kind='bar', figsize=(14, 8))
+    plt.title('ROI by Intervention and Crop Type', fontsize=16)
+    plt.xlabel('Intervention', fontsize=14)
+    plt.ylabel('ROI (%)', fontsize=14)
+    plt.grid(axis='y', alpha=0.3)
+    plt.legend(title='Crop Type')
+
+    plt.tight_layout()
+    plt.savefig('results/interventions/economic/roi_by_intervention.png', dpi=300, bbox_inches='tight')
+    plt.close()
+    print("ROI chart saved to 'results/interventions/economic/roi_by_intervention.png'")
+
+    # Create a scatter plot of payback period vs. cost per beneficiary
+    plt.figure(figsize=(12, 8))
+
+    # Create a color map for different interventions
+    intervention_types = roi_df['Intervention'].unique()
+    colors = plt.cm.tab10(np.linspace(0, 1, len(intervention_types)))
+    intervention_colors = {intervention: colors[i] for i, intervention in enumerate(intervention_types)}
+
+    # Create scatter plot
+    for intervention in intervention_types:
+        subset = roi_df[roi_df['Intervention'] == intervention]
+        plt.scatter(
+            subset['Cost per Beneficiary (₦)'] / 1000,  # Convert to thousands
+            subset['Payback Period (years)'],
+            s=subset['ROI (%)'] / 10,  # Size based on ROI
+            label=intervention,
+            alpha=0.7,
+            c=[intervention_colors[intervention]] * len(subset)
+        )
+
+    plt.title('Investment Efficiency Analysis', fontsize=16)
+    plt.xlabel('Cost per Beneficiary (₦ thousands)', fontsize=14)
+    plt.ylabel('Payback Period (years)', fontsize=14)
+    plt.grid(alpha=0.3)
+    plt.legend(title='Intervention Type')
+
+    # Add annotations for best options (low cost, quick payback)
+    best_options = roi_df.sort_values(by=['Payback Period (years)', 'Cost per Beneficiary (₦)'])[:3]
+    for _, row in best_options.iterrows():
+        plt.annotate(
+            f"{row['Intervention']} ({row['Crop']})",
+            (row['Cost per Beneficiary (₦)']/1000, row['Payback Period (years)']),
+            xytext=(10, -10),
+            textcoords='offset points',
+            arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=.2')
+        )
+
+    plt.tight_layout()
+    plt.savefig('results/interventions/economic/investment_efficiency.png', dpi=300, bbox_inches='tight')
+    plt.close()
+    print("Investment efficiency chart saved to 'results/interventions/economic/investment_efficiency.png'")
 
-plt.tight_layout()
-plt.savefig('results/interventions/economic/investment_efficiency.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("Investment efficiency chart saved to 'results/interventions/economic/investment_efficiency.png'")
 
 # Create a scale-up scenario analysis
 # Define three scenarios for scale-up
@@ -234,88 +196,207 @@ potential_beneficiaries = {
     'Millet': 2000000
 }
 
-# Create scenario analysis data
-scenario_data = []
-
-for intervention, int_details in interventions_economic.items():
-    # Choose the best crop for this intervention based on ROI
-    intervention_roi = roi_df[roi_df['Intervention'] == intervention]
-    if len(intervention_roi) == 0:
-        continue
-        
-    best_crop_row = intervention_roi.loc[intervention_roi['ROI (%)'].idxmax()]
-    crop = best_crop_row['Crop']
-    
-    for scenario_name, scenario_params in scenarios.items():
-        # Calculate number of units needed
-        beneficiaries = potential_beneficiaries[crop] * scenario_params['coverage']
-        units_needed = beneficiaries / int_details['beneficiaries_per_unit']
-        
-        # Calculate implementation cost
-        total_implementation_cost = units_needed * int_details['implementation_cost'] * scenario_params['cost_overrun']
-        
-        # Calculate annual operating cost
-        annual_operating_cost = units_needed * int_details['annual_operating_cost'] * scenario_params['cost_overrun']
-        
-        # Get baseline loss and calculate potential reduction
-        baseline_loss = baseline_losses[crop]
-        if int_details['capacity_tons'] is not None:
-            annual_reduction = baseline_loss * int_details['expected_loss_reduction'] * scenario_params['efficiency'] * int_details['capacity_tons'] * 250 * units_needed
-        else:
-            # For training programs
-            annual_reduction = baseline_loss * int_details['expected_loss_reduction'] * scenario_params['efficiency'] * beneficiaries * 2
-        
-        # Calculate value of loss reduction
-        annual_value = annual_reduction * crop_values[crop]
-        
-        # Calculate ROI over 5 years
-        five_year_cost = total_implementation_cost + (annual_operating_cost * 5)
-        five_year_benefit = annual_value * 5
-        five_year_roi = (five_year_benefit - five_year_cost) / five_year_cost * 100
-        
-        scenario_data.append({
-            'Intervention': intervention,
-            'Crop': crop,
-            'Scenario': scenario_name,
-            'Beneficiaries': beneficiaries,
-            'Units Required': units_needed,
-            'Total Implementation Cost (₦)': total_implementation_cost,
-            'Annual Operating Cost (₦)': annual_operating_cost,
-            'Annual Loss Reduction (tons)': annual_reduction,
-            'Annual Value (₦)': annual_value,
-            '5-Year Cost (₦)': five_year_cost,
-            '5-Year Benefit (₦)': five_year_benefit,
-            '5-Year ROI (%)': five_year_roi
-        })
-
-# Convert to DataFrame
-scenario_df = pd.DataFrame(scenario_data)
-
-# Save the scenario analysis to CSV
-scenario_df.to_csv('results/interventions/economic/scale_up_scenarios.csv', index=False)
-print("Scale-up scenario analysis saved to 'results/interventions/economic/scale_up_scenarios.csv'")
-
-# Create a visualization of 5-year ROI by scenario
-pivot_scenario = scenario_df.pivot_table(
-    values='5-Year ROI (%)', 
-    index='Intervention',
-    columns='Scenario'
-)
-
-plt.figure(figsize=(12, 8))
-pivot_scenario.plot(kind='bar', figsize=(12, 8))
-plt.title('5-Year ROI by Intervention and Scale-up Scenario', fontsize=16)
-plt.xlabel('Intervention', fontsize=14)
-plt.ylabel('5-Year ROI (%)', fontsize=14)
-plt.grid(axis='y', alpha=0.3)
-plt.legend(title='Scenario')
-
-# Add horizontal line at ROI = 0
-plt.axhline(y=0, color='red', linestyle='-', alpha=0.3)
-plt.tight_layout()
-
-plt.savefig('results/interventions/economic/scenario_roi_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-print("Scenario ROI analysis chart saved to 'results/interventions/economic/scenario_roi_analysis.png'")
-
-print("\nAll economic analyses completed successfully!")
\ No newline at end of file
+
+def run_scale_up_scenarios(roi_df):
+    """5-year ROI of scaling each intervention up for its best crop under each scenario"""
+    # Create scenario analysis data
+    scenario_data = []
+
+    for intervention, int_details in interventions_economic.items():
+        # Choose the best crop for this intervention based on ROI
+        intervention_roi = roi_df[roi_df['Intervention'] == intervention]
+        if len(intervention_roi) == 0:
+            continue
+
+        best_crop_row = intervention_roi.loc[intervention_roi['ROI (%)'].idxmax()]
+        crop = best_crop_row['Crop']
+
+        for scenario_name, scenario_params in scenarios.items():
+            # Calculate number of units needed
+            beneficiaries = potential_beneficiaries[crop] * scenario_params['coverage']
+            units_needed = beneficiaries / int_details['beneficiaries_per_unit']
+
+            # Calculate implementation cost
+            total_implementation_cost = units_needed * int_details['implementation_cost'] * scenario_params['cost_overrun']
+
+            # Calculate annual operating cost
+            annual_operating_cost = units_needed * int_details['annual_operating_cost'] * scenario_params['cost_overrun']
+
+            # Get baseline loss and calculate potential reduction
+            baseline_loss = baseline_losses[crop]
+            if int_details['capacity_tons'] is not None:
+                annual_reduction = baseline_loss * int_details['expected_loss_reduction'] * scenario_params['efficiency'] * int_details['capacity_tons'] * 250 * units_needed
+            else:
+                # For training programs
+                annual_reduction = baseline_loss * int_details['expected_loss_reduction'] * scenario_params['efficiency'] * beneficiaries * 2
+
+            # Calculate value of loss reduction
+            annual_value = annual_reduction * crop_values[crop]
+
+            # Calculate ROI over 5 years
+            five_year_cost = total_implementation_cost + (annual_operating_cost * 5)
+            five_year_benefit = annual_value * 5
+            five_year_roi = (five_year_benefit - five_year_cost) / five_year_cost * 100
+
+            scenario_data.append({
+                'Intervention': intervention,
+                'Crop': crop,
+                'Scenario': scenario_name,
+                'Beneficiaries': beneficiaries,
+                'Units Required': units_needed,
+                'Total Implementation Cost (₦)': total_implementation_cost,
+                'Annual Operating Cost (₦)': annual_operating_cost,
+                'Annual Loss Reduction (tons)': annual_reduction,
+                'Annual Value (₦)': annual_value,
+                '5-Year Cost (₦)': five_year_cost,
+                '5-Year Benefit (₦)': five_year_benefit,
+                '5-Year ROI (%)': five_year_roi
+            })
+
+    # Convert to DataFrame
+    scenario_df = pd.DataFrame(scenario_data)
+
+    # Save the scenario analysis to CSV
+    scenario_df.to_csv('results/interventions/economic/scale_up_scenarios.csv', index=False)
+    print("Scale-up scenario analysis saved to 'results/interventions/economic/scale_up_scenarios.csv'")
+
+    # Create a visualization of 5-year ROI by scenario
+    pivot_scenario = scenario_df.pivot_table(
+        values='5-Year ROI (%)', 
+        index='Intervention',
+        columns='Scenario'
+    )
+
+    plt.figure(figsize=(12, 8))
+    pivot_scenario.plot(kind='bar', figsize=(12, 8))
+    plt.title('5-Year ROI by Intervention and Scale-up Scenario', fontsize=16)
+    plt.xlabel('Intervention', fontsize=14)
+    plt.ylabel('5-Year ROI (%)', fontsize=14)
+    plt.grid(axis='y', alpha=0.3)
+    plt.legend(title='Scenario')
+
+    # Add horizontal line at ROI = 0
+    plt.axhline(y=0, color='red', linestyle='-', alpha=0.3)
+    plt.tight_layout()
+
+    plt.savefig('results/interventions/economic/scenario_roi_analysis.png', dpi=300, bbox_inches='tight')
+    plt.close()
+    print("Scenario ROI analysis chart saved to 'results/interventions/economic/scenario_roi_analysis.png'")
+    return scenario_df
+
+
+def run_monte_carlo_scale_up(roi_df, draws=MONTE_CARLO_DRAWS):
+    """Distribution of 5-year scale-up ROI with uncertain coverage, efficiency, costs, prices and losses"""
+    # Scale each intervention up for its best crop, as in the point-estimate scenarios
+    best_crops = roi_df.loc[roi_df.groupby('Intervention', sort=False)['ROI (%)'].idxmax()]
+    best_crops = best_crops.set_index('Intervention')['Crop']
+    interventions = interventions_to_array({
+        name: details for name, details in interventions_economic.items() if name in best_crops
+    })
+    crop_names = list(crop_values)
+
+    mc_df = run_monte_carlo(
+        interventions,
+        crop_names,
+        crop_index=[crop_names.index(best_crops[name]) for name in interventions['name']],
+        crop_values=[crop_values[crop] for crop in crop_names],
+        baseline_losses=[baseline_losses[crop] for crop in crop_names],
+        beneficiary_pool=[potential_beneficiaries[crop] for crop in crop_names],
+        distributions=default_distributions(scenarios),
+        draws=draws
+    )
+
+    mc_df.to_csv('results/interventions/economic/scale_up_monte_carlo.csv', index=False)
+    print("Monte Carlo scale-up analysis saved to 'results/interventions/economic/scale_up_monte_carlo.csv'")
+    return mc_df
+
+
+def run_portfolio_optimization(budget=PORTFOLIO_BUDGET):
+    """Mix of interventions, crops and states that saves the most tons within the budget"""
+    optimizer = PortfolioOptimizer(
+        interventions_economic,
+        crop_values,
+        baseline_losses,
+        pd.read_csv(STATE_LOSS_DATA),
+        potential_beneficiaries,
+        budget,
+        intervention_crops
+    )
+    summary = optimizer.solve()
+    allocation_df = optimizer.allocation()
+
+    allocation_df.to_csv('results/interventions/economic/portfolio_allocation.csv', index=False)
+    print(f"Portfolio allocation ({summary['solver']}): ₦{summary['spent']:,.0f} of ₦{budget:,.0f} "
+          f"saves {summary['tons_saved']:,.0f} tons over {optimizer.horizon_years} years")
+    print("Portfolio allocation saved to 'results/interventions/economic/portfolio_allocation.csv'")
+    return allocation_df
+
+
+def run_cash_flow_projection():
+    """Discounted cash flows, NPV, IRR and discounted payback per intervention, crop and scenario"""
+    interventions = interventions_to_array(interventions_economic)
+    crops = crops_to_array(crop_values, baseline_losses)
+    mask = applicability_mask(interventions, crops, intervention_crops)
+    cash_flow_df = cash_flow_table(interventions, crops, scenarios, mask)
+
+    cash_flow_df.to_csv('results/interventions/economic/cash_flow_projection.csv', index=False)
+    print("Cash flow projection saved to 'results/interventions/economic/cash_flow_projection.csv'")
+    return cash_flow_df
+
+
+def run_sensitivity_analysis(roi_df, samples=SENSITIVITY_SAMPLES):
+    """Sobol indices and tornado charts of ROI for each intervention at its best crop"""
+    best_crops = roi_df.loc[roi_df.groupby('Intervention', sort=False)['ROI (%)'].idxmax()]
+    pairs = list(zip(best_crops['Intervention'], best_crops['Crop']))
+    sensitivity_df = run_sensitivity(interventions_economic, crop_values, baseline_losses, pairs, samples)
+
+    os.makedirs('results/interventions/economic/sensitivity', exist_ok=True)
+    sensitivity_df.to_csv('results/interventions/economic/sensitivity/sobol_indices.csv', index=False)
+    for intervention, _ in pairs:
+        filename = intervention.lower().replace(' ', '_')
+        plot_tornado(sensitivity_df, intervention,
+                     f'results/interventions/economic/sensitivity/tornado_{filename}.png')
+    print("Sensitivity analysis saved to 'results/interventions/economic/sensitivity/'")
+    return sensitivity_df
+
+
+def run_mac_curve():
+    """Marginal abatement cost curve over every intervention, crop, state and stage"""
+    optimizer = PortfolioOptimizer(
+        interventions_economic,
+        crop_values,
+        baseline_losses,
+        pd.read_csv(STATE_LOSS_DATA),
+        potential_beneficiaries,
+        PORTFOLIO_BUDGET,
+        intervention_crops
+    )
+    options = mac_options(optimizer)
+    curve = build_mac_curve(options['cost_per_ton'], options['tons'], options['pool'], options['pool_capacity'])
+    mac_df = mac_table(curve, options, optimizer.interventions, optimizer.crops['name'],
+                       optimizer.states, optimizer.stages)
+
+    mac_df.to_csv('results/interventions/economic/mac_curve.csv', index=False)
+    plot_mac_curve(curve, 'results/interventions/economic/mac_curve.png')
+    if len(mac_df):
+        print(f"MAC curve: {len(mac_df):,} options saving {curve['cumulative_tons'][-1]:,.0f} tons per year")
+    else:
+        print("MAC curve: no abatement options save any tons")
+    print("MAC curve saved to 'results/interventions/economic/mac_curve.csv'")
+    return mac_df
+
+
+if __name__ == "__main__":
+    # Create output directory
+    os.makedirs('results/interventions/economic', exist_ok=True)
+
+    roi_df = run_roi_analysis()
+    plot_roi_charts(roi_df)
+    run_scale_up_scenarios(roi_df)
+    run_monte_carlo_scale_up(roi_df)
+    run_cash_flow_projection()
+    run_sensitivity_analysis(roi_df)
+    run_portfolio_optimization()
+    run_mac_curve()
+
+    print("\nAll economic analyses completed successfully!")
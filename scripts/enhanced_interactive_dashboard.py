@@ -1,14 +1,22 @@
 import os
 import json
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.patches import Patch
 from datetime import datetime
-
-# Ensure output directories exist
-os.makedirs('results/dashboard/interactive', exist_ok=True)
-os.makedirs('results/dashboard/static', exist_ok=True)
-os.makedirs('results/dashboard/data', exist_ok=True)
+from dashboard_payload import encode_dashboard_payload, payload_to_base64, PAYLOAD_BUDGET_BYTES
+from incremental_build import Artifact, IncrementalBuild
+from price_store import load_price_store, price_source_paths
+
+# Output locations
+DASHBOARD_DIR = 'results/dashboard'
+DATA_DIR = 'results/dashboard/data'
+STATIC_DIR = 'results/dashboard/static'
+INTERACTIVE_DIR = 'results/dashboard/interactive'
+BUILD_MANIFEST = 'results/dashboard/.build_manifest.json'
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Create more detailed regional PHL data for the dashboard
 # This would be connected to a proper database in a production environment
@@ -38,8 +46,7 @@ crops = {
             "South South": 0.5,
             "South West": 0.9
         },
-        "phl_rate": 30.5,  # percentage
-        "price_per_ton": 230000  # Naira
+        "phl_rate": 30.5  # percentage
     },
     "Rice": {
         "base_production": 600,
@@ -51,8 +58,7 @@ crops = {
             "South South": 1.1,
             "South West": 0.6
         },
-        "phl_rate": 35.0,
-        "price_per_ton": 650000
+        "phl_rate": 35.0
     },
     "Sorghum": {
         "base_production": 500,
@@ -64,8 +70,7 @@ crops = {
             "South South": 0.1,
             "South West": 0.3
         },
-        "phl_rate": 25.8,
-        "price_per_ton": 200000
+        "phl_rate": 25.8
     },
     "Millet": {
         "base_production": 450,
@@ -77,8 +82,7 @@ crops = {
             "South South": 0.1,
             "South West": 0.2
         },
-        "phl_rate": 22.4,
-        "price_per_ton": 180000
+        "phl_rate": 22.4
     },
     "Vegetables": {
         "base_production": 350,
@@ -90,8 +94,7 @@ crops = {
             "South South": 1.3,
             "South West": 1.5
         },
-        "phl_rate": 45.0,
-        "price_per_ton": 400000
+        "phl_rate": 45.0
     }
 }
 
@@ -159,156 +162,7 @@ business_model_details = {
     }
 }
 
-# Generate synthetic data for the dashboard
-np.random.seed(42)  # For reproducibility
-dashboard_data = []
-
-# Generate state-level data for each crop
-for state in all_states:
-    # Find which geopolitical zone this state belongs to
-    zone = next(z for z, states in geopolitical_zones.items() if state in states)
-    
-    for crop_name, crop_data in crops.items():
-        # Calculate production with some randomness
-        base = crop_data["base_production"]
-        regional_factor = crop_data["regional_multipliers"][zone]
-        random_factor = 0.8 + 0.4 * np.random.random()  # Between 0.8 and 1.2
-        
-        production = base * regional_factor * random_factor
-        
-        # Calculate losses with some variation in PHL rate
-        phl_variation = crop_data["phl_rate"] * (0.9 + 0.2 * np.random.random())
-        losses = production * (phl_variation / 100)
-        
-        # Calculate financial impact
-        financial_impact = losses * crop_data["price_per_ton"]
-        
-        # Calculate stage-specific losses
-        for stage, proportion in value_chain_stages.items():
-            stage_loss = losses * proportion
-            stage_financial_impact = stage_loss * crop_data["price_per_ton"]
-            
-            # Calculate intervention potential (how much could be saved)
-            # Assume interventions can save 40-70% of losses
-            intervention_efficiency = 0.4 + 0.3 * np.random.random()
-            intervention_potential = stage_loss * intervention_efficiency
-            intervention_value = intervention_potential * crop_data["price_per_ton"]
-            
-            # Determine applicable business models
-            applicable_models = business_models_by_stage.get(stage, [])
-            
-            dashboard_data.append({
-                "state": state,
-                "geopolitical_zone": zone,
-                "crop": crop_name,
-                "production_tons": round(production, 1),
-                "phl_rate": round(phl_variation, 1),
-                "value_chain_stage": stage,
-                "loss_tons": round(stage_loss, 1),
-                "financial_impact": round(stage_financial_impact, 0),
-                "intervention_potential_tons": round(intervention_potential, 1),
-                "intervention_value": round(intervention_value, 0),
-                "applicable_business_models": applicable_models
-            })
-
-# Convert to DataFrame
-df = pd.DataFrame(dashboard_data)
-
-# Save the complete dataset for the dashboard
-df.to_csv('results/dashboard/data/complete_phl_dashboard_data.csv', index=False)
-print("Complete dashboard dataset created and saved")
-
-# Create aggregated views for different dashboard perspectives
-state_summary = df.groupby('state').agg({
-    'production_tons': 'sum',
-    'loss_tons': 'sum',
-    'financial_impact': 'sum',
-    'intervention_value': 'sum'
-}).reset_index()
-
-crop_summary = df.groupby('crop').agg({
-    'production_tons': 'sum',
-    'loss_tons': 'sum',
-    'financial_impact': 'sum',
-    'intervention_value': 'sum'
-}).reset_index()
-
-zone_summary = df.groupby('geopolitical_zone').agg({
-    'production_tons': 'sum',
-    'loss_tons': 'sum',
-    'financial_impact': 'sum',
-    'intervention_value': 'sum'
-}).reset_index()
-
-stage_summary = df.groupby('value_chain_stage').agg({
-    'loss_tons': 'sum',
-    'financial_impact': 'sum',
-    'intervention_value': 'sum'
-}).reset_index()
-
-# Save summary datasets
-state_summary.to_csv('results/dashboard/data/state_summary.csv', index=False)
-crop_summary.to_csv('results/dashboard/data/crop_summary.csv', index=False)
-zone_summary.to_csv('results/dashboard/data/zone_summary.csv', index=False)
-stage_summary.to_csv('results/dashboard/data/stage_summary.csv', index=False)
-
-# Create a dataset for business model recommendations
-business_opportunity = []
-
-for state in all_states:
-    state_data = df[df['state'] == state]
-    zone = state_data['geopolitical_zone'].iloc[0]
-    
-    # Get total intervention value in this state
-    total_intervention = state_data['intervention_value'].sum()
-    
-    # Top crops by intervention value in this state
-    top_crops = state_data.groupby('crop')['intervention_value'].sum().sort_values(ascending=False).head(3)
-    
-    # Top value chain stages by intervention value
-    top_stages = state_data.groupby('value_chain_stage')['intervention_value'].sum().sort_values(ascending=False).head(3)
-    
-    # Compute business model scores based on intervention values and applicability
-    business_model_scores = {}
-    
-    for _, row in state_data.iterrows():
-        for model in row['applicable_business_models']:
-            if model not in business_model_scores:
-                business_model_scores[model] = 0
-            business_model_scores[model] += row['intervention_value']
-    
-    # Sort models by score
-    sorted_models = sorted(business_model_scores.items(), key=lambda x: x[1], reverse=True)
-    top_models = sorted_models[:3] if len(sorted_models) >= 3 else sorted_models
-    
-    for rank, (model_id, opportunity_value) in enumerate(top_models):
-        business_opportunity.append({
-            "state": state,
-            "geopolitical_zone": zone,
-            "model_id": model_id,
-            "model_name": business_model_details[model_id]['name'],
-            "opportunity_value": opportunity_value,
-            "investment_range": business_model_details[model_id]['investment'],
-            "roi": business_model_details[model_id]['roi'],
-            "impact": business_model_details[model_id]['impact'],
-            "rank": rank + 1,
-            "top_crops": ", ".join(top_crops.index.tolist()),
-            "top_stages": ", ".join(top_stages.index.tolist())
-        })
-
-# Convert to DataFrame
-business_opportunity_df = pd.DataFrame(business_opportunity)
-business_opportunity_df.to_csv('results/dashboard/data/business_opportunities.csv', index=False)
-print("Business opportunity data created and saved")
-
-# Create visualizations for the dashboard
-
-# 1. Choropleth-like bar chart of intervention opportunity by state
-plt.figure(figsize=(16, 12))
-state_summary_sorted = state_summary.sort_values('intervention_value', ascending=False)
-bars = plt.bar(state_summary_sorted['state'], state_summary_sorted['intervention_value'] / 1000000)
-
-# Color bars by geopolitical zone
+# Chart colours by geopolitical zone
 zone_colors = {
     "North Central": "#3498db",
     "North East": "#e74c3c",
@@ -318,96 +172,7 @@ zone_colors = {
     "South West": "#1abc9c"
 }
 
-for i, bar in enumerate(bars):
-    state = state_summary_sorted.iloc[i]['state']
-    zone = next(z for z, states in geopolitical_zones.items() if state in states)
-    bar.set_color(zone_colors[zone])
-
-plt.title('Post-Harvest Loss Intervention Value by State', fontsize=16)
-plt.xlabel('State', fontsize=14)
-plt.ylabel('Intervention Value (Million N)', fontsize=14)
-plt.xticks(rotation=90)
-plt.grid(axis='y', alpha=0.3)
-
-# Add legend for zones
-from matplotlib.patches import Patch
-legend_elements = [Patch(facecolor=color, label=zone) for zone, color in zone_colors.items()]
-plt.legend(handles=legend_elements, title="Geopolitical Zone", loc='upper right')
-
-plt.tight_layout()
-plt.savefig('results/dashboard/static/intervention_value_by_state.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 2. Value chain stage analysis
-plt.figure(figsize=(12, 8))
-stage_summary_sorted = stage_summary.sort_values('financial_impact', ascending=False)
-
-width = 0.35
-x = np.arange(len(stage_summary_sorted))
-
-ax = plt.gca()
-bars1 = ax.bar(x - width/2, stage_summary_sorted['financial_impact'] / 1000000, width, label='Financial Loss')
-bars2 = ax.bar(x + width/2, stage_summary_sorted['intervention_value'] / 1000000, width, label='Intervention Opportunity')
-
-plt.title('Losses and Intervention Opportunities by Value Chain Stage', fontsize=16)
-plt.xlabel('Value Chain Stage', fontsize=14)
-plt.ylabel('Value (Million N)', fontsize=14)
-plt.xticks(x, stage_summary_sorted['value_chain_stage'])
-plt.legend()
-plt.grid(axis='y', alpha=0.3)
-
-# Add value labels
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{height:.1f}',
-                ha='center', va='bottom', rotation=0, fontsize=9)
-
-plt.tight_layout()
-plt.savefig('results/dashboard/static/value_chain_analysis.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 3. Crop comparison visualization
-plt.figure(figsize=(14, 8))
-crop_summary_sorted = crop_summary.sort_values('intervention_value', ascending=False)
-
-x = np.arange(len(crop_summary_sorted))
-width = 0.25
-
-ax = plt.gca()
-bars1 = ax.bar(x - width, crop_summary_sorted['production_tons'] / 1000, width, label='Production (thousand tons)')
-bars2 = ax.bar(x, crop_summary_sorted['loss_tons'] / 1000, width, label='Losses (thousand tons)')
-bars3 = ax.bar(x + width, crop_summary_sorted['intervention_value'] / 1000000, width, label='Intervention Value (million N)')
-
-plt.title('Crop Production, Losses, and Intervention Opportunities', fontsize=16)
-plt.xlabel('Crop', fontsize=14)
-plt.ylabel('Value', fontsize=14)
-plt.xticks(x, crop_summary_sorted['crop'])
-plt.legend()
-plt.grid(axis='y', alpha=0.3)
-
-# Add percentage labels for losses as percentage of production
-for i, (prod, loss) in enumerate(zip(crop_summary_sorted['production_tons'], crop_summary_sorted['loss_tons'])):
-    percentage = (loss / prod) * 100
-    plt.text(i, loss/1000 + 0.2, f'{percentage:.1f}%', ha='center', fontsize=9)
-
-plt.tight_layout()
-plt.savefig('results/dashboard/static/crop_comparison.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# 4. Top business opportunities by geopolitical zone
-top_opportunities = business_opportunity_df.groupby(['geopolitical_zone', 'model_id']).agg({
-    'opportunity_value': 'sum'
-}).reset_index()
-
-# Get top model for each zone
-top_model_by_zone = top_opportunities.loc[top_opportunities.groupby('geopolitical_zone')['opportunity_value'].idxmax()]
-
-plt.figure(figsize=(14, 8))
-bars = plt.bar(top_model_by_zone['geopolitical_zone'], top_model_by_zone['opportunity_value'] / 1000000)
-
-# Color bars by model
+# Chart colours by business model
 model_colors = {
     "BM-01": "#3498db",
     "BM-02": "#e74c3c",
@@ -418,33 +183,328 @@ model_colors = {
     "BM-07": "#34495e"
 }
 
-for i, bar in enumerate(bars):
-    model_id = top_model_by_zone.iloc[i]['model_id']
-    bar.set_color(model_colors.get(model_id, "#7f8c8d"))
-
-plt.title('Top Business Opportunity by Geopolitical Zone', fontsize=16)
-plt.xlabel('Geopolitical Zone', fontsize=14)
-plt.ylabel('Opportunity Value (Million N)', fontsize=14)
-plt.grid(axis='y', alpha=0.3)
-
-# Add model names as labels on bars
-for i, row in enumerate(top_model_by_zone.itertuples()):
-    model_name = business_model_details[row.model_id]['name']
-    plt.text(i, row.opportunity_value/1000000 + 0.5, 
-             f"{row.model_id}: {model_name.split(' ')[0]}", 
-             ha='center', rotation=90, fontsize=9)
-
-# Add legend for business models
-legend_elements = [Patch(facecolor=color, label=f"{model_id}: {business_model_details[model_id]['name']}") 
-                  for model_id, color in model_colors.items() if model_id in top_model_by_zone['model_id'].values]
-plt.legend(handles=legend_elements, title="Business Models", loc='upper right')
-
-plt.tight_layout()
-plt.savefig('results/dashboard/static/top_opportunities_by_zone.png', dpi=300, bbox_inches='tight')
-plt.close()
-
-# Create interactive HTML dashboard
-html_content = """
+
+def load_dashboard_dataset():
+    """Read the complete dashboard dataset written by build_dataset"""
+    return pd.read_csv(f'{DATA_DIR}/complete_phl_dashboard_data.csv')
+
+
+def build_dataset():
+    """Generate synthetic state-level PHL data for the dashboard"""
+    np.random.seed(42)  # For reproducibility
+    prices = load_price_store()
+    dashboard_data = []
+
+    # Generate state-level data for each crop
+    for state in all_states:
+        # Find which geopolitical zone this state belongs to
+        zone = next(z for z, states in geopolitical_zones.items() if state in states)
+
+        for crop_name, crop_data in crops.items():
+            # Calculate production with some randomness
+            base = crop_data["base_production"]
+            regional_factor = crop_data["regional_multipliers"][zone]
+            random_factor = 0.8 + 0.4 * np.random.random()  # Between 0.8 and 1.2
+
+            production = base * regional_factor * random_factor
+
+            # Calculate losses with some variation in PHL rate
+            phl_variation = crop_data["phl_rate"] * (0.9 + 0.2 * np.random.random())
+            losses = production * (phl_variation / 100)
+
+            # Calculate financial impact at the state's market price
+            price_per_ton = prices.price(crop_name, state)
+            financial_impact = losses * price_per_ton
+
+            # Calculate stage-specific losses
+            for stage, proportion in value_chain_stages.items():
+                stage_loss = losses * proportion
+                stage_financial_impact = stage_loss * price_per_ton
+
+                # Calculate intervention potential (how much could be saved)
+                # Assume interventions can save 40-70% of losses
+                intervention_efficiency = 0.4 + 0.3 * np.random.random()
+                intervention_potential = stage_loss * intervention_efficiency
+                intervention_value = intervention_potential * price_per_ton
+
+                # Determine applicable business models
+                applicable_models = business_models_by_stage.get(stage, [])
+
+                dashboard_data.append({
+                    "state": state,
+                    "geopolitical_zone": zone,
+                    "crop": crop_name,
+                    "production_tons": round(production, 1),
+                    "phl_rate": round(phl_variation, 1),
+                    "value_chain_stage": stage,
+                    "loss_tons": round(stage_loss, 1),
+                    "financial_impact": round(stage_financial_impact, 0),
+                    "intervention_potential_tons": round(intervention_potential, 1),
+                    "intervention_value": round(intervention_value, 0),
+                    "applicable_business_models": applicable_models
+                })
+
+    # Convert to DataFrame
+    df = pd.DataFrame(dashboard_data)
+
+    # Save the complete dataset for the dashboard
+    df.to_csv(f'{DATA_DIR}/complete_phl_dashboard_data.csv', index=False)
+    print("Complete dashboard dataset created and saved")
+
+
+def build_payload():
+    """Encode the dataset as the compact columnar payload embedded in the HTML"""
+    df = load_dashboard_dataset()
+
+    # Encode the dataset as a compact columnar payload so the browser can filter,
+    # aggregate and redraw charts without round-trips (see dashboard_payload.py)
+    dashboard_payload = encode_dashboard_payload(
+        df,
+        dictionaries={
+            'state': all_states,
+            'geopolitical_zone': list(geopolitical_zones.keys()),
+            'crop': list(crops.keys()),
+            'value_chain_stage': list(value_chain_stages.keys())
+        },
+        meta={
+            'business_models_by_stage': business_models_by_stage,
+            'business_model_names': {model_id: details['name'] for model_id, details in business_model_details.items()}
+        }
+    )
+    with open(f'{DATA_DIR}/dashboard_payload.bin', 'wb') as f:
+        f.write(dashboard_payload)
+    print(f"Dashboard payload created: {len(dashboard_payload):,} bytes (budget {PAYLOAD_BUDGET_BYTES:,} bytes)")
+
+
+def build_summaries():
+    """Aggregate the dataset by state, crop, zone and value chain stage"""
+    df = load_dashboard_dataset()
+
+    # Create aggregated views for different dashboard perspectives
+    state_summary = df.groupby('state').agg({
+        'production_tons': 'sum',
+        'loss_tons': 'sum',
+        'financial_impact': 'sum',
+        'intervention_value': 'sum'
+    }).reset_index()
+
+    crop_summary = df.groupby('crop').agg({
+        'production_tons': 'sum',
+        'loss_tons': 'sum',
+        'financial_impact': 'sum',
+        'intervention_value': 'sum'
+    }).reset_index()
+
+    zone_summary = df.groupby('geopolitical_zone').agg({
+        'production_tons': 'sum',
+        'loss_tons': 'sum',
+        'financial_impact': 'sum',
+        'intervention_value': 'sum'
+    }).reset_index()
+
+    stage_summary = df.groupby('value_chain_stage').agg({
+        'loss_tons': 'sum',
+        'financial_impact': 'sum',
+        'intervention_value': 'sum'
+    }).reset_index()
+
+    # Save summary datasets
+    state_summary.to_csv(f'{DATA_DIR}/state_summary.csv', index=False)
+    crop_summary.to_csv(f'{DATA_DIR}/crop_summary.csv', index=False)
+    zone_summary.to_csv(f'{DATA_DIR}/zone_summary.csv', index=False)
+    stage_summary.to_csv(f'{DATA_DIR}/stage_summary.csv', index=False)
+
+
+def build_business_opportunities():
+    """Rank the top business models for every state"""
+    df = load_dashboard_dataset()
+
+    # Create a dataset for business model recommendations
+    business_opportunity = []
+
+    for state in all_states:
+        state_data = df[df['state'] == state]
+        zone = state_data['geopolitical_zone'].iloc[0]
+
+        # Get total intervention value in this state
+        total_intervention = state_data['intervention_value'].sum()
+
+        # Top crops by intervention value in this state
+        top_crops = state_data.groupby('crop')['intervention_value'].sum().sort_values(ascending=False).head(3)
+
+        # Top value chain stages by intervention value
+        top_stages = state_data.groupby('value_chain_stage')['intervention_value'].sum().sort_values(ascending=False).head(3)
+
+        # Compute business model scores based on intervention values and applicability
+        business_model_scores = {}
+
+        for _, row in state_data.iterrows():
+            for model in business_models_by_stage.get(row['value_chain_stage'], []):
+                if model not in business_model_scores:
+                    business_model_scores[model] = 0
+                business_model_scores[model] += row['intervention_value']
+
+        # Sort models by score
+        sorted_models = sorted(business_model_scores.items(), key=lambda x: x[1], reverse=True)
+        top_models = sorted_models[:3] if len(sorted_models) >= 3 else sorted_models
+
+        for rank, (model_id, opportunity_value) in enumerate(top_models):
+            business_opportunity.append({
+                "state": state,
+                "geopolitical_zone": zone,
+                "model_id": model_id,
+                "model_name": business_model_details[model_id]['name'],
+                "opportunity_value": opportunity_value,
+                "investment_range": business_model_details[model_id]['investment'],
+                "roi": business_model_details[model_id]['roi'],
+                "impact": business_model_details[model_id]['impact'],
+                "rank": rank + 1,
+                "top_crops": ", ".join(top_crops.index.tolist()),
+                "top_stages": ", ".join(top_stages.index.tolist())
+            })
+
+    # Convert to DataFrame
+    business_opportunity_df = pd.DataFrame(business_opportunity)
+    business_opportunity_df.to_csv(f'{DATA_DIR}/business_opportunities.csv', index=False)
+    print("Business opportunity data created and saved")
+
+
+def build_state_chart():
+    """Choropleth-like bar chart of intervention opportunity by state"""
+    state_summary = pd.read_csv(f'{DATA_DIR}/state_summary.csv')
+
+    plt.figure(figsize=(16, 12))
+    state_summary_sorted = state_summary.sort_values('intervention_value', ascending=False)
+    bars = plt.bar(state_summary_sorted['state'], state_summary_sorted['intervention_value'] / 1000000)
+
+    for i, bar in enumerate(bars):
+        state = state_summary_sorted.iloc[i]['state']
+        zone = next(z for z, states in geopolitical_zones.items() if state in states)
+        bar.set_color(zone_colors[zone])
+
+    plt.title('Post-Harvest Loss Intervention Value by State', fontsize=16)
+    plt.xlabel('State', fontsize=14)
+    plt.ylabel('Intervention Value (Million N)', fontsize=14)
+    plt.xticks(rotation=90)
+    plt.grid(axis='y', alpha=0.3)
+
+    # Add legend for zones
+    legend_elements = [Patch(facecolor=color, label=zone) for zone, color in zone_colors.items()]
+    plt.legend(handles=legend_elements, title="Geopolitical Zone", loc='upper right')
+
+    plt.tight_layout()
+    plt.savefig(f'{STATIC_DIR}/intervention_value_by_state.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def build_value_chain_chart():
+    """Losses and intervention opportunities by value chain stage"""
+    stage_summary = pd.read_csv(f'{DATA_DIR}/stage_summary.csv')
+
+    plt.figure(figsize=(12, 8))
+    stage_summary_sorted = stage_summary.sort_values('financial_impact', ascending=False)
+
+    width = 0.35
+    x = np.arange(len(stage_summary_sorted))
+
+    ax = plt.gca()
+    bars1 = ax.bar(x - width/2, stage_summary_sorted['financial_impact'] / 1000000, width, label='Financial Loss')
+    bars2 = ax.bar(x + width/2, stage_summary_sorted['intervention_value'] / 1000000, width, label='Intervention Opportunity')
+
+    plt.title('Losses and Intervention Opportunities by Value Chain Stage', fontsize=16)
+    plt.xlabel('Value Chain Stage', fontsize=14)
+    plt.ylabel('Value (Million N)', fontsize=14)
+    plt.xticks(x, stage_summary_sorted['value_chain_stage'])
+    plt.legend()
+    plt.grid(axis='y', alpha=0.3)
+
+    # Add value labels
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                    f'{height:.1f}',
+                    ha='center', va='bottom', rotation=0, fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig(f'{STATIC_DIR}/value_chain_analysis.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def build_crop_chart():
+    """Crop production, losses and intervention opportunities"""
+    crop_summary = pd.read_csv(f'{DATA_DIR}/crop_summary.csv')
+
+    plt.figure(figsize=(14, 8))
+    crop_summary_sorted = crop_summary.sort_values('intervention_value', ascending=False)
+
+    x = np.arange(len(crop_summary_sorted))
+    width = 0.25
+
+    ax = plt.gca()
+    bars1 = ax.bar(x - width, crop_summary_sorted['production_tons'] / 1000, width, label='Production (thousand tons)')
+    bars2 = ax.bar(x, crop_summary_sorted['loss_tons'] / 1000, width, label='Losses (thousand tons)')
+    bars3 = ax.bar(x + width, crop_summary_sorted['intervention_value'] / 1000000, width, label='Intervention Value (million N)')
+
+    plt.title('Crop Production, Losses, and Intervention Opportunities', fontsize=16)
+    plt.xlabel('Crop', fontsize=14)
+    plt.ylabel('Value', fontsize=14)
+    plt.xticks(x, crop_summary_sorted['crop'])
+    plt.legend()
+    plt.grid(axis='y', alpha=0.3)
+
+    # Add percentage labels for losses as percentage of production
+    for i, (prod, loss) in enumerate(zip(crop_summary_sorted['production_tons'], crop_summary_sorted['loss_tons'])):
+        percentage = (loss / prod) * 100
+        plt.text(i, loss/1000 + 0.2, f'{percentage:.1f}%', ha='center', fontsize=9)
+
+    plt.tight_layout()
+    plt.savefig(f'{STATIC_DIR}/crop_comparison.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+def build_opportunity_chart():
+    """Top business opportunity by geopolitical zone"""
+    business_opportunity_df = pd.read_csv(f'{DATA_DIR}/business_opportunities.csv')
+
+    top_opportunities = business_opportunity_df.groupby(['geopolitical_zone', 'model_id']).agg({
+        'opportunity_value': 'sum'
+    }).reset_index()
+
+    # Get top model for each zone
+    top_model_by_zone = top_opportunities.loc[top_opportunities.groupby('geopolitical_zone')['opportunity_value'].idxmax()]
+
+    plt.figure(figsize=(14, 8))
+    bars = plt.bar(top_model_by_zone['geopolitical_zone'], top_model_by_zone['opportunity_value'] / 1000000)
+
+    for i, bar in enumerate(bars):
+        model_id = top_model_by_zone.iloc[i]['model_id']
+        bar.set_color(model_colors.get(model_id, "#7f8c8d"))
+
+    plt.title('Top Business Opportunity by Geopolitical Zone', fontsize=16)
+    plt.xlabel('Geopolitical Zone', fontsize=14)
+    plt.ylabel('Opportunity Value (Million N)', fontsize=14)
+    plt.grid(axis='y', alpha=0.3)
+
+    # Add model names as labels on bars
+    for i, row in enumerate(top_model_by_zone.itertuples()):
+        model_name = business_model_details[row.model_id]['name']
+        plt.text(i, row.opportunity_value/1000000 + 0.5, 
+                 f"{row.model_id}: {model_name.split(' ')[0]}", 
+                 ha='center', rotation=90, fontsize=9)
+
+    # Add legend for business models
+    legend_elements = [Patch(facecolor=color, label=f"{model_id}: {business_model_details[model_id]['name']}") 
+                      for model_id, color in model_colors.items() if model_id in top_model_by_zone['model_id'].values]
+    plt.legend(handles=legend_elements, title="Business Models", loc='upper right')
+
+    plt.tight_layout()
+    plt.savefig(f'{STATIC_DIR}/top_opportunities_by_zone.png', dpi=300, bbox_inches='tight')
+    plt.close()
+
+
+# Interactive HTML dashboard; the payload placeholder is filled in by build_html
+dashboard_html_template = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -588,6 +648,17 @@ html_content = """
             object-fit: contain;
         }
         
+        .chart-canvas {
+            display: block;
+            width: 100%;
+            height: 320px;
+        }
+        
+        .chart-canvas[hidden],
+        .chart-image[hidden] {
+            display: none;
+        }
+        
         .opportunities-section {
             margin-top: 2rem;
         }
@@ -724,22 +795,22 @@ html_content = """
         <div class="kpi-container">
             <div class="kpi-card">
                 <div class="kpi-title">Total Production</div>
-                <div class="kpi-value">13.8M tons</div>
+                <div class="kpi-value" id="kpi-production">13.8M tons</div>
                 <div class="kpi-context">Across major grain crops</div>
             </div>
             <div class="kpi-card">
                 <div class="kpi-title">Post-Harvest Losses</div>
-                <div class="kpi-value">3.9M tons</div>
-                <div class="kpi-context">~28% of production</div>
+                <div class="kpi-value" id="kpi-losses">3.9M tons</div>
+                <div class="kpi-context" id="kpi-loss-share">~28% of production</div>
             </div>
             <div class="kpi-card">
                 <div class="kpi-title">Financial Impact</div>
-                <div class="kpi-value">N14.2B</div>
+                <div class="kpi-value" id="kpi-financial">N14.2B</div>
                 <div class="kpi-context">Annual loss value</div>
             </div>
             <div class="kpi-card">
                 <div class="kpi-title">Intervention Potential</div>
-                <div class="kpi-value">N6.8B</div>
+                <div class="kpi-value" id="kpi-intervention">N6.8B</div>
                 <div class="kpi-context">Addressable through youth businesses</div>
             </div>
         </div>
@@ -748,10 +819,12 @@ html_content = """
             <div class="chart-card">
                 <h3 class="chart-title">Intervention Value by State</h3>
                 <img src="static/intervention_value_by_state.png" alt="Intervention Value by State" class="chart-image">
+                <canvas id="state-chart" class="chart-canvas" hidden></canvas>
             </div>
             <div class="chart-card">
                 <h3 class="chart-title">Value Chain Stage Analysis</h3>
                 <img src="static/value_chain_analysis.png" alt="Value Chain Analysis" class="chart-image">
+                <canvas id="stage-chart" class="chart-canvas" hidden></canvas>
             </div>
         </div>
 
@@ -759,10 +832,12 @@ html_content = """
             <div class="chart-card">
                 <h3 class="chart-title">Crop Comparison</h3>
                 <img src="static/crop_comparison.png" alt="Crop Comparison" class="chart-image">
+                <canvas id="crop-chart" class="chart-canvas" hidden></canvas>
             </div>
             <div class="chart-card">
                 <h3 class="chart-title">Top Business Opportunities by Region</h3>
                 <img src="static/top_opportunities_by_zone.png" alt="Top Opportunities by Zone" class="chart-image">
+                <canvas id="model-chart" class="chart-canvas" hidden></canvas>
             </div>
         </div>
 
@@ -901,25 +976,291 @@ html_content = """
         <p>YouthHarvest Dashboard | Nigeria Post-Harvest Losses Analysis Project | Developed for the Nigeria Agri-Hackathon</p>
     </footer>
 
+    <!-- Compact columnar dashboard data: gzip-compressed, base64-encoded (see scripts/dashboard_payload.py) -->
+    <script id="dashboard-payload" type="application/octet-stream">__DASHBOARD_PAYLOAD__</script>
+
     <script>
-        // This would be expanded with interactive features in a real implementation
+        // Filtering, aggregation and chart redraws all run in the browser on the
+        // embedded payload. Browsers without DecompressionStream keep the static
+        // charts, so the page still works on older Android WebViews.
         document.addEventListener('DOMContentLoaded', function() {
-            console.log('Dashboard loaded successfully');
-            
-            // Filter functionality would be implemented here
+            const ZONE_COLORS = {
+                "North Central": "#3498db",
+                "North East": "#e74c3c",
+                "North West": "#2ecc71",
+                "South East": "#f39c12",
+                "South South": "#9b59b6",
+                "South West": "#1abc9c"
+            };
+            const MODEL_COLORS = {
+                "BM-01": "#3498db",
+                "BM-02": "#e74c3c",
+                "BM-03": "#2ecc71",
+                "BM-04": "#f39c12",
+                "BM-05": "#9b59b6",
+                "BM-06": "#1abc9c",
+                "BM-07": "#34495e"
+            };
+
             const regionFilter = document.getElementById('region-filter');
             const cropFilter = document.getElementById('crop-filter');
-            
-            regionFilter.addEventListener('change', function() {
-                console.log('Region filter changed to:', this.value);
-                // In a real implementation, this would update the dashboard data
-            });
-            
-            cropFilter.addEventListener('change', function() {
-                console.log('Crop filter changed to:', this.value);
-                // In a real implementation, this would update the dashboard data
-            });
-            
+            let dashboardData = null;
+            let renderScheduled = false;
+
+            function formatNaira(value) {
+                if (value >= 1e9) return 'N' + (value / 1e9).toFixed(1) + 'B';
+                if (value >= 1e6) return 'N' + (value / 1e6).toFixed(1) + 'M';
+                return 'N' + Math.round(value).toLocaleString();
+            }
+
+            function formatTons(value) {
+                if (value >= 1e6) return (value / 1e6).toFixed(1) + 'M tons';
+                if (value >= 1e3) return (value / 1e3).toFixed(1) + 'K tons';
+                return Math.round(value) + ' tons';
+            }
+
+            function parsePayload(buffer) {
+                const view = new DataView(buffer);
+                const magic = String.fromCharCode(view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3));
+                if (magic !== 'YHP1') {
+                    throw new Error('Unexpected dashboard payload format');
+                }
+                const headerLength = view.getUint32(4, true);
+                const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+                const arrayTypes = { uint8: Uint8Array, uint16: Uint16Array, float32: Float32Array };
+                const columns = {};
+                header.columns.forEach(function(column) {
+                    // Typed arrays use the platform byte order, which is little-endian on all supported devices
+                    columns[column.name] = new arrayTypes[column.type](buffer, column.offset, column.length);
+                });
+                const stateZone = new Uint8Array(header.dictionaries.state.length);
+                for (let i = 0; i < header.rows; i++) {
+                    stateZone[columns.state[i]] = columns.geopolitical_zone[i];
+                }
+                return { header: header, columns: columns, stateZone: stateZone };
+            }
+
+            function loadPayload() {
+                const encoded = document.getElementById('dashboard-payload').textContent.trim();
+                const binary = atob(encoded);
+                const bytes = new Uint8Array(binary.length);
+                for (let i = 0; i < binary.length; i++) {
+                    bytes[i] = binary.charCodeAt(i);
+                }
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                return new Response(stream).arrayBuffer().then(parsePayload);
+            }
+
+            // One pass over the rows accumulates every view the dashboard needs
+            function aggregate(data, region, crop) {
+                const dict = data.header.dictionaries;
+                const cols = data.columns;
+                const zoneCode = region === 'all' ? -1 : dict.geopolitical_zone.indexOf(region);
+                const cropCode = crop === 'all' ? -1 : dict.crop.indexOf(crop);
+                const result = {
+                    production: 0,
+                    losses: 0,
+                    financial: 0,
+                    intervention: 0,
+                    stateIntervention: new Float64Array(dict.state.length),
+                    stageFinancial: new Float64Array(dict.value_chain_stage.length),
+                    stageIntervention: new Float64Array(dict.value_chain_stage.length),
+                    cropProduction: new Float64Array(dict.crop.length),
+                    cropLosses: new Float64Array(dict.crop.length),
+                    cropIntervention: new Float64Array(dict.crop.length),
+                    modelScores: {}
+                };
+
+                for (let i = 0; i < data.header.rows; i++) {
+                    if (zoneCode >= 0 && cols.geopolitical_zone[i] !== zoneCode) continue;
+                    if (cropCode >= 0 && cols.crop[i] !== cropCode) continue;
+
+                    const stage = cols.value_chain_stage[i];
+                    const cropIndex = cols.crop[i];
+                    // Production is repeated on every stage row of a state/crop, so count it once
+                    if (stage === 0) {
+                        result.production += cols.production_tons[i];
+                        result.cropProduction[cropIndex] += cols.production_tons[i];
+                    }
+                    result.losses += cols.loss_tons[i];
+                    result.financial += cols.financial_impact[i];
+                    result.intervention += cols.intervention_value[i];
+                    result.stateIntervention[cols.state[i]] += cols.intervention_value[i];
+                    result.stageFinancial[stage] += cols.financial_impact[i];
+                    result.stageIntervention[stage] += cols.intervention_value[i];
+                    result.cropLosses[cropIndex] += cols.loss_tons[i];
+                    result.cropIntervention[cropIndex] += cols.intervention_value[i];
+                }
+
+                const modelsByStage = data.header.meta.business_models_by_stage;
+                dict.value_chain_stage.forEach(function(stage, code) {
+                    (modelsByStage[stage] || []).forEach(function(modelId) {
+                        result.modelScores[modelId] = (result.modelScores[modelId] || 0) + result.stageIntervention[code];
+                    });
+                });
+                return result;
+            }
+
+            function sortedIndices(values, keep) {
+                const indices = [];
+                for (let i = 0; i < values.length; i++) {
+                    if (!keep || keep(i)) indices.push(i);
+                }
+                return indices.sort(function(a, b) { return values[b] - values[a]; });
+            }
+
+            function drawBarChart(canvas, labels, series, options) {
+                const ratio = window.devicePixelRatio || 1;
+                const width = canvas.clientWidth;
+                const height = canvas.clientHeight;
+                canvas.width = Math.round(width * ratio);
+                canvas.height = Math.round(height * ratio);
+                const ctx = canvas.getContext('2d');
+                ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+                ctx.clearRect(0, 0, width, height);
+
+                const pad = { top: 28, right: 12, bottom: options.rotateLabels ? 86 : 36, left: 52 };
+                const plotWidth = width - pad.left - pad.right;
+                const plotHeight = height - pad.top - pad.bottom;
+                let max = 0;
+                series.forEach(function(s) {
+                    s.values.forEach(function(v) { max = Math.max(max, v); });
+                });
+                max = max || 1;
+
+                ctx.font = '11px sans-serif';
+                ctx.strokeStyle = '#e0e0e0';
+                ctx.fillStyle = '#555';
+                ctx.textAlign = 'right';
+                ctx.textBaseline = 'middle';
+                for (let g = 0; g <= 4; g++) {
+                    const y = pad.top + plotHeight - plotHeight * g / 4;
+                    ctx.beginPath();
+                    ctx.moveTo(pad.left, y);
+                    ctx.lineTo(pad.left + plotWidth, y);
+                    ctx.stroke();
+                    ctx.fillText((max * g / 4 / options.scale).toFixed(1), pad.left - 6, y);
+                }
+
+                const groupWidth = plotWidth / Math.max(labels.length, 1);
+                const barWidth = groupWidth * 0.8 / series.length;
+                series.forEach(function(s, si) {
+                    s.values.forEach(function(v, i) {
+                        const barHeight = v / max * plotHeight;
+                        ctx.fillStyle = s.colors ? s.colors[i] : s.color;
+                        ctx.fillRect(pad.left + i * groupWidth + groupWidth * 0.1 + si * barWidth,
+                                     pad.top + plotHeight - barHeight, barWidth, barHeight);
+                    });
+                });
+
+                ctx.fillStyle = '#212121';
+                labels.forEach(function(label, i) {
+                    const x = pad.left + i * groupWidth + groupWidth / 2;
+                    ctx.save();
+                    ctx.translate(x, pad.top + plotHeight + 6);
+                    if (options.rotateLabels) {
+                        ctx.rotate(-Math.PI / 2);
+                        ctx.textAlign = 'right';
+                        ctx.textBaseline = 'middle';
+                    } else {
+                        ctx.textAlign = 'center';
+                        ctx.textBaseline = 'top';
+                    }
+                    ctx.fillText(label, 0, 0);
+                    ctx.restore();
+                });
+
+                ctx.textAlign = 'left';
+                ctx.textBaseline = 'middle';
+                ctx.fillText(options.unit, 4, 10);
+                let legendX = pad.left + 60;
+                series.forEach(function(s) {
+                    if (!s.label) return;
+                    ctx.fillStyle = s.color;
+                    ctx.fillRect(legendX, 5, 10, 10);
+                    ctx.fillStyle = '#212121';
+                    ctx.fillText(s.label, legendX + 14, 10);
+                    legendX += ctx.measureText(s.label).width + 32;
+                });
+            }
+
+            function render() {
+                renderScheduled = false;
+                const data = dashboardData;
+                const dict = data.header.dictionaries;
+                const result = aggregate(data, regionFilter.value, cropFilter.value);
+
+                document.getElementById('kpi-production').textContent = formatTons(result.production);
+                document.getElementById('kpi-losses').textContent = formatTons(result.losses);
+                document.getElementById('kpi-loss-share').textContent =
+                    '~' + (result.production ? Math.round(result.losses / result.production * 100) : 0) + '% of production';
+                document.getElementById('kpi-financial').textContent = formatNaira(result.financial);
+                document.getElementById('kpi-intervention').textContent = formatNaira(result.intervention);
+
+                const states = sortedIndices(result.stateIntervention, function(i) { return result.stateIntervention[i] > 0; });
+                drawBarChart(document.getElementById('state-chart'),
+                    states.map(function(i) { return dict.state[i]; }),
+                    [{
+                        values: states.map(function(i) { return result.stateIntervention[i]; }),
+                        colors: states.map(function(i) { return ZONE_COLORS[dict.geopolitical_zone[data.stateZone[i]]]; })
+                    }],
+                    { scale: 1e6, unit: 'Million N', rotateLabels: true });
+
+                const stages = sortedIndices(result.stageFinancial);
+                drawBarChart(document.getElementById('stage-chart'),
+                    stages.map(function(i) { return dict.value_chain_stage[i]; }),
+                    [
+                        { label: 'Financial Loss', color: '#3498db', values: stages.map(function(i) { return result.stageFinancial[i]; }) },
+                        { label: 'Intervention Opportunity', color: '#ff8f00', values: stages.map(function(i) { return result.stageIntervention[i]; }) }
+                    ],
+                    { scale: 1e6, unit: 'Million N', rotateLabels: false });
+
+                const cropsShown = sortedIndices(result.cropIntervention, function(i) { return result.cropProduction[i] > 0; });
+                drawBarChart(document.getElementById('crop-chart'),
+                    cropsShown.map(function(i) { return dict.crop[i]; }),
+                    [
+                        { label: 'Production', color: '#3498db', values: cropsShown.map(function(i) { return result.cropProduction[i]; }) },
+                        { label: 'Losses', color: '#e74c3c', values: cropsShown.map(function(i) { return result.cropLosses[i]; }) }
+                    ],
+                    { scale: 1e3, unit: 'Thousand tons', rotateLabels: false });
+
+                const modelIds = Object.keys(result.modelScores).sort(function(a, b) {
+                    return result.modelScores[b] - result.modelScores[a];
+                });
+                drawBarChart(document.getElementById('model-chart'),
+                    modelIds,
+                    [{
+                        values: modelIds.map(function(id) { return result.modelScores[id]; }),
+                        colors: modelIds.map(function(id) { return MODEL_COLORS[id] || '#7f8c8d'; })
+                    }],
+                    { scale: 1e6, unit: 'Opportunity (Million N)', rotateLabels: false });
+            }
+
+            function scheduleRender() {
+                if (!dashboardData || renderScheduled) return;
+                renderScheduled = true;
+                window.requestAnimationFrame(render);
+            }
+
+            regionFilter.addEventListener('change', scheduleRender);
+            cropFilter.addEventListener('change', scheduleRender);
+            window.addEventListener('resize', scheduleRender);
+
+            if (window.DecompressionStream && window.TextDecoder) {
+                loadPayload().then(function(data) {
+                    dashboardData = data;
+                    document.querySelectorAll('.chart-card').forEach(function(card) {
+                        const canvas = card.querySelector('.chart-canvas');
+                        if (!canvas) return;
+                        canvas.hidden = false;
+                        card.querySelector('.chart-image').hidden = true;
+                    });
+                    scheduleRender();
+                }).catch(function(error) {
+                    console.warn('Interactive charts unavailable, showing static charts:', error);
+                });
+            }
+
             // Action buttons would link to implementation guides
             const actionButtons = document.querySelectorAll('.action-button');
             actionButtons.forEach(button => {
@@ -935,11 +1276,6 @@ html_content = """
 </html>
 """
 
-# Save the interactive HTML dashboard - FIXED WITH UTF-8 ENCODING
-with open('results/dashboard/interactive/yourthharvest_dashboard.html', 'w', encoding='utf-8') as f:
-    f.write(html_content)
-print("Interactive HTML dashboard created")
-
 # Create a dashboard API specification (would be implemented in a production environment)
 api_spec = {
     "openapi": "3.0.0",
@@ -1127,6 +1463,277 @@ api_spec = {
                 }
             }
         },
+        "/map/states": {
+            "get": {
+                "summary": "Get per-state losses for the map view, served from the precomputed aggregate cache",
+                "parameters": [
+                    {
+                        "name": "crop",
+                        "in": "query",
+                        "description": "Filter by crop ('all' for every crop)",
+                        "schema": {"type": "string", "default": "all"}
+                    },
+                    {
+                        "name": "stage",
+                        "in": "query",
+                        "description": "Filter by value chain stage ('all' for every stage)",
+                        "schema": {"type": "string", "default": "all"}
+                    },
+                    {
+                        "name": "season",
+                        "in": "query",
+                        "description": "Filter by season ('all' unless the dataset has a season column)",
+                        "schema": {"type": "string", "default": "all"}
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Successful response",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "filters": {"type": "object"},
+                                        "states": {"type": "array", "items": {"type": "string"}},
+                                        "metrics": {
+                                            "type": "object",
+                                            "properties": {
+                                                "loss_tons": {"type": "array", "items": {"type": "number"}},
+                                                "financial_impact": {"type": "array", "items": {"type": "number"}}
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    "400": {"description": "Unknown filter value"}
+                }
+            }
+        },
+        "/map/cache-stats": {
+            "get": {
+                "summary": "Get hit/miss counters for the map aggregate cache and open event streams",
+                "responses": {
+                    "200": {"description": "Successful response"}
+                }
+            }
+        },
+        "/scenario": {
+            "post": {
+                "summary": "What-if analysis: naira and tonnage impact of shifting volume between handling methods",
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "edits": {
+                                        "type": "array",
+                                        "items": {
+                                            "type": "object",
+                                            "required": ["state", "stage", "from_method", "to_method", "share"],
+                                            "properties": {
+                                                "state": {"type": "string"},
+                                                "crop": {"type": "string", "description": "Optional; all crops when omitted"},
+                                                "stage": {"type": "string"},
+                                                "from_method": {"type": "string", "example": "Bags in house"},
+                                                "to_method": {"type": "string", "example": "Improved structure"},
+                                                "share": {"type": "number", "description": "Fraction of the source method's volume moved (0-1)"}
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    }
+                },
+                "responses": {
+                    "200": {
+                        "description": "Successful response",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "rows_rescored": {"type": "integer"},
+                                        "rate_source": {"type": "string"},
+                                        "baseline_loss_tons": {"type": "number"},
+                                        "scenario_loss_tons": {"type": "number"},
+                                        "loss_change_tons": {"type": "number"},
+                                        "financial_change": {"type": "number"},
+                                        "rows": {"type": "array", "items": {"type": "object"}}
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    "400": {"description": "Unknown state, crop, stage or method, or an invalid share"}
+                }
+            }
+        },
+        "/economics/cash-flows": {
+            "get": {
+                "summary": "Get NPV, IRR, discounted payback and yearly net cash flows per intervention, crop and scenario",
+                "parameters": [
+                    {
+                        "name": "intervention",
+                        "in": "query",
+                        "description": "Filter by intervention (all when omitted)",
+                        "schema": {"type": "string"}
+                    },
+                    {
+                        "name": "crop",
+                        "in": "query",
+                        "description": "Filter by crop (all when omitted)",
+                        "schema": {"type": "string"}
+                    },
+                    {
+                        "name": "scenario",
+                        "in": "query",
+                        "description": "Filter by scale-up scenario: Conservative, Realistic or Optimistic (all when omitted)",
+                        "schema": {"type": "string"}
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Successful response; columns of results/interventions/economic/cash_flow_projection.csv, one array per column",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "filters": {"type": "object"},
+                                        "rows": {"type": "integer"},
+                                        "columns": {"type": "object"}
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    "400": {"description": "Unknown filter value"},
+                    "404": {"description": "The cash flow projection has not been generated"}
+                }
+            }
+        },
+        "/economics/break-even": {
+            "get": {
+                "summary": "Find the value of an intervention parameter at which its lifespan ROI breaks even, per crop and state",
+                "description": "Any other query parameter named after a solvable parameter overrides its current value before solving, e.g. implementation_cost=500000.",
+                "parameters": [
+                    {
+                        "name": "intervention",
+                        "in": "query",
+                        "required": True,
+                        "description": "Intervention name, e.g. 'Solar Dryers'",
+                        "schema": {"type": "string"}
+                    },
+                    {
+                        "name": "parameter",
+                        "in": "query",
+                        "required": True,
+                        "description": "Parameter to solve for",
+                        "schema": {
+                            "type": "string",
+                            "enum": ["crop_value", "baseline_loss", "expected_loss_reduction",
+                                     "implementation_cost", "annual_operating_cost", "lifespan_years"]
+                        }
+                    },
+                    {
+                        "name": "crop",
+                        "in": "query",
+                        "description": "Filter by crop (all when omitted)",
+                        "schema": {"type": "string"}
+                    },
+                    {
+                        "name": "state",
+                        "in": "query",
+                        "description": "Filter by state (all when omitted)",
+                        "schema": {"type": "string"}
+                    },
+                    {
+                        "name": "zone",
+                        "in": "query",
+                        "description": "Filter by geopolitical zone (all when omitted)",
+                        "schema": {"type": "string"}
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Successful response; break-even value, change needed and current ROI per crop and state, one array per column (null where ROI never crosses zero)",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "intervention": {"type": "string"},
+                                        "parameter": {"type": "string"},
+                                        "overrides": {"type": "object"},
+                                        "rows": {"type": "integer"},
+                                        "columns": {"type": "object"}
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    "400": {"description": "Unknown intervention, parameter, crop, state or zone, or an invalid override"}
+                }
+            }
+        },
+        "/events": {
+            "get": {
+                "summary": "Server-sent event stream of refreshed per-state aggregates for one map filter",
+                "description": "Sends a 'snapshot' event with the full state vectors on connect (skipped when Last-Event-ID matches the current version), then a 'delta' event with only the per-state values that changed after each dataset refresh, or a 'reload' event when the filter options themselves changed.",
+                "parameters": [
+                    {
+                        "name": "crop",
+                        "in": "query",
+                        "description": "Filter by crop ('all' for every crop)",
+                        "schema": {"type": "string", "default": "all"}
+                    },
+                    {
+                        "name": "stage",
+                        "in": "query",
+                        "description": "Filter by value chain stage ('all' for every stage)",
+                        "schema": {"type": "string", "default": "all"}
+                    },
+                    {
+                        "name": "season",
+                        "in": "query",
+                        "description": "Filter by season ('all' unless the dataset has a season column)",
+                        "schema": {"type": "string", "default": "all"}
+                    },
+                    {
+                        "name": "Last-Event-ID",
+                        "in": "header",
+                        "description": "Aggregate version last seen by the client",
+                        "schema": {"type": "string"}
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "Event stream",
+                        "content": {
+                            "text/event-stream": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "version": {"type": "integer"},
+                                        "metrics": {
+                                            "type": "object",
+                                            "description": "For delta events: {metric: {state: new value}}"
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    },
+                    "400": {"description": "Unknown filter value"}
+                }
+            }
+        },
         "/implementation-guides/{modelId}": {
             "get": {
                 "summary": "Get implementation guide for a specific business model",
@@ -1162,11 +1769,6 @@ api_spec = {
     }
 }
 
-# Save the API specification
-with open('results/dashboard/api_specification.json', 'w', encoding='utf-8') as f:
-    json.dump(api_spec, f, indent=4)
-print("API specification created")
-
 # Create a dashboard documentation file
 dashboard_documentation = {
     "title": "YouthHarvest Dashboard Documentation",
@@ -1244,10 +1846,6 @@ dashboard_documentation = {
     }
 }
 
-# Save the dashboard documentation
-with open('results/dashboard/dashboard_documentation.json', 'w', encoding='utf-8') as f:
-    json.dump(dashboard_documentation, f, indent=4)
-
 # Create a README for the dashboard
 dashboard_readme = """# YouthHarvest Dashboard
 
@@ -1264,6 +1862,7 @@ The YouthHarvest Dashboard is an interactive tool that helps young Nigerian entr
 - `interactive/` - Contains the interactive HTML dashboard
 - `static/` - Contains static visualizations used in the dashboard
 - `data/` - Contains the underlying data files
+- `data/dashboard_payload.bin` - Compact columnar payload used by the interactive dashboard (also embedded in the HTML)
 - `api_specification.json` - Technical specification for the dashboard API
 - `dashboard_documentation.json` - Detailed documentation of the dashboard
 
@@ -1274,6 +1873,30 @@ The YouthHarvest Dashboard is an interactive tool that helps young Nigerian entr
 4. Review the recommended business opportunities
 5. Click "View Implementation Guide" for detailed information on a specific business model
 
+## Data Payload
+The interactive dashboard filters, aggregates and redraws its charts entirely in the browser. The generator embeds a compact columnar payload in the HTML (and writes the same bytes to `data/dashboard_payload.bin` for serving alongside it):
+- Categorical columns (state, geopolitical zone, crop, value chain stage) are dictionary-encoded as 8-bit codes
+- Numeric columns (production, PHL rate, losses, financial impact, intervention potential and value) are 32-bit float arrays
+- The whole payload is gzip-compressed and decoded with the browser's built-in `DecompressionStream`; browsers without it fall back to the static charts
+
+**Size budget:** the compressed payload must stay under 64 KiB, which keeps the download under ~3 seconds on a 3G connection (~200 kbit/s). The generator fails if the budget is exceeded. All filtering is a single pass over the rows with typed arrays, so redraws stay responsive on low-end Android devices.
+
+## Rebuilding the Dashboard
+`python scripts/enhanced_interactive_dashboard.py` rebuilds only the artifacts whose inputs changed since the last run. Each artifact (dataset, payload, summaries, business opportunities, each static chart, HTML, API specification, documentation and this README) declares its inputs; their hashes are recorded in `.build_manifest.json`.
+- `--dry-run` lists the artifacts that would rebuild and why, without writing anything
+- `--force` rebuilds everything
+
+## API Server
+`scripts/dashboard_server.py` serves the dashboard API (Flask; `gunicorn --chdir scripts 'dashboard_server:create_app()'` in production). Map views use `/map/states?crop=&stage=&season=`, which returns per-state `loss_tons` and `financial_impact` from a precomputed aggregate cache (in-memory LRU plus on-disk `.npy` files under `cache/state_aggregates/`). The most significant filter combinations are warmed at startup, and `/map/cache-stats` reports hit/miss counters.
+
+Open dashboards can subscribe to `/events?crop=&stage=&season=` (server-sent events) instead of polling. The server watches the dataset file; on a change it folds only the changed rows into the aggregate cube and pushes each client just the per-state values that moved for its filter (e.g. `{"loss_tons": {"Kano": 1356.3}}`). Reconnecting clients send `Last-Event-ID` and get a full snapshot only if they missed an update. Long-lived streams need threaded workers: `gunicorn --chdir scripts --worker-class gthread --threads 32 'dashboard_server:create_app()'`.
+
+`POST /scenario` answers what-if questions such as "if Kano moves 30% of storage from 'Bags in house' to 'Improved structure', what is the naira impact?". Each dashboard row starts from an even mix of the methods at its stage; only the rows an edit touches are re-scored with the PHL prediction model (or its influence factors when no trained model is present), and per-(state, crop, stage, method) loss rates are memoized so repeated scenarios return in milliseconds.
+
+`/economics/cash-flows?intervention=&crop=&scenario=` serves the discounted cash flow projection written by `scripts/economic_analysis.py` (`results/interventions/economic/cash_flow_projection.csv`): NPV, IRR, discounted payback and yearly net cash flows per unit of each intervention, crop and scale-up scenario, as one array per column. The table is re-read only when the file changes.
+
+`/economics/break-even?intervention=&parameter=` answers questions such as "at what crop price does Solar Dryers break even in the North East?" (`intervention=Solar Dryers&parameter=crop_value&zone=North East`). The value at which lifespan ROI is zero is found for every crop and state at once by vectorised bisection, using each state's price and loss rate, and cached per intervention, parameter and overrides. The same search is available from the command line: `python scripts/break_even.py "Solar Dryers" crop_value --zone "North East"`.
+
 ## Technical Implementation
 This is a prototype version of the dashboard. In a production environment, it would be implemented as a full-stack web application with:
 - Frontend: React.js with visualization libraries
@@ -1283,7 +1906,6 @@ This is a prototype version of the dashboard. In a production environment, it wo
 
 ## Next Steps for Development
 - Create user account system
-- Implement filtering functionality
 - Connect to real-time market price data
 - Add mobile responsiveness
 - Integrate directly with financial institutions
@@ -1292,8 +1914,138 @@ This is a prototype version of the dashboard. In a production environment, it wo
 For more information about this project, please contact the YouthHarvest team.
 """
 
-# Save the dashboard README with UTF-8 encoding
-with open('results/dashboard/README.md', 'w', encoding='utf-8') as f:
-    f.write(dashboard_readme)
 
-print("\nEnhanced interactive dashboard and associated components created successfully!")
\ No newline at end of file
+def build_html():
+    """Write the interactive HTML dashboard with the payload embedded"""
+    with open(f'{DATA_DIR}/dashboard_payload.bin', 'rb') as f:
+        dashboard_payload = f.read()
+
+    # Save the interactive HTML dashboard - FIXED WITH UTF-8 ENCODING
+    html_content = dashboard_html_template.replace('__DASHBOARD_PAYLOAD__', payload_to_base64(dashboard_payload))
+    with open(f'{INTERACTIVE_DIR}/yourthharvest_dashboard.html', 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    print("Interactive HTML dashboard created")
+
+
+def build_api_spec():
+    """Write the dashboard API specification"""
+    with open(f'{DASHBOARD_DIR}/api_specification.json', 'w', encoding='utf-8') as f:
+        json.dump(api_spec, f, indent=4)
+    print("API specification created")
+
+
+def build_documentation():
+    """Write the dashboard documentation file"""
+    with open(f'{DASHBOARD_DIR}/dashboard_documentation.json', 'w', encoding='utf-8') as f:
+        json.dump(dashboard_documentation, f, indent=4)
+
+
+def build_readme():
+    """Write the dashboard README with UTF-8 encoding"""
+    with open(f'{DASHBOARD_DIR}/README.md', 'w', encoding='utf-8') as f:
+        f.write(dashboard_readme)
+
+
+def define_dashboard_build():
+    """Declare every dashboard artifact with its inputs and outputs"""
+    build = IncrementalBuild(BUILD_MANIFEST)
+    business_model_names = {model_id: details['name'] for model_id, details in business_model_details.items()}
+
+    build.add(Artifact(
+        'dataset', build_dataset,
+        outputs=[f'{DATA_DIR}/complete_phl_dashboard_data.csv'],
+        values={
+            'geopolitical_zones': geopolitical_zones,
+            'crops': crops,
+            'value_chain_stages': value_chain_stages,
+            'business_models_by_stage': business_models_by_stage
+        },
+        # The price CSVs rather than the store: build_dataset rebuilds the store from them when they change
+        files=[path for path in price_source_paths() if os.path.isfile(path)]
+    ))
+    build.add(Artifact(
+        'payload', build_payload,
+        outputs=[f'{DATA_DIR}/dashboard_payload.bin'],
+        values={
+            'geopolitical_zones': geopolitical_zones,
+            'business_models_by_stage': business_models_by_stage,
+            'business_model_names': business_model_names
+        },
+        files=[os.path.join(SCRIPT_DIR, 'dashboard_payload.py')],
+        depends_on=['dataset']
+    ))
+    build.add(Artifact(
+        'summaries', build_summaries,
+        outputs=[f'{DATA_DIR}/{name}_summary.csv' for name in ['state', 'crop', 'zone', 'stage']],
+        depends_on=['dataset']
+    ))
+    build.add(Artifact(
+        'business_opportunities', build_business_opportunities,
+        outputs=[f'{DATA_DIR}/business_opportunities.csv'],
+        values={
+            'business_model_details': business_model_details,
+            'business_models_by_stage': business_models_by_stage
+        },
+        depends_on=['dataset']
+    ))
+    build.add(Artifact(
+        'state_chart', build_state_chart,
+        outputs=[f'{STATIC_DIR}/intervention_value_by_state.png'],
+        values={'geopolitical_zones': geopolitical_zones, 'zone_colors': zone_colors},
+        depends_on=['summaries']
+    ))
+    build.add(Artifact(
+        'value_chain_chart', build_value_chain_chart,
+        outputs=[f'{STATIC_DIR}/value_chain_analysis.png'],
+        depends_on=['summaries']
+    ))
+    build.add(Artifact(
+        'crop_chart', build_crop_chart,
+        outputs=[f'{STATIC_DIR}/crop_comparison.png'],
+        depends_on=['summaries']
+    ))
+    build.add(Artifact(
+        'opportunity_chart', build_opportunity_chart,
+        outputs=[f'{STATIC_DIR}/top_opportunities_by_zone.png'],
+        values={'business_model_details': business_model_details, 'model_colors': model_colors},
+        depends_on=['business_opportunities']
+    ))
+    build.add(Artifact(
+        'html', build_html,
+        outputs=[f'{INTERACTIVE_DIR}/yourthharvest_dashboard.html'],
+        values={'template': dashboard_html_template},
+        depends_on=['payload']
+    ))
+    build.add(Artifact(
+        'api_spec', build_api_spec,
+        outputs=[f'{DASHBOARD_DIR}/api_specification.json'],
+        values={'api_spec': api_spec}
+    ))
+    build.add(Artifact(
+        'documentation', build_documentation,
+        outputs=[f'{DASHBOARD_DIR}/dashboard_documentation.json'],
+        values={'dashboard_documentation': dashboard_documentation}
+    ))
+    build.add(Artifact(
+        'readme', build_readme,
+        outputs=[f'{DASHBOARD_DIR}/README.md'],
+        values={'dashboard_readme': dashboard_readme}
+    ))
+    return build
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the YouthHarvest dashboard, regenerating only artifacts whose inputs changed")
+    parser.add_argument('--dry-run', action='store_true', help="List the artifacts that would rebuild without writing anything")
+    parser.add_argument('--force', action='store_true', help="Rebuild every artifact regardless of the manifest")
+    args = parser.parse_args()
+
+    # Ensure output directories exist
+    os.makedirs(INTERACTIVE_DIR, exist_ok=True)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+    define_dashboard_build().run(dry_run=args.dry_run, force=args.force)
+
+    if not args.dry_run:
+        print("\nEnhanced interactive dashboard and associated components created successfully!")
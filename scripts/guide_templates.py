@@ -0,0 +1,512 @@
+"""
+YouthHarvest Project: compiled templates for the business implementation guides
+
+The guides used to be built by concatenating one markdown string per model.
+Localized guides for every business model x state x language run to
+thousands of files, so a guide template is now compiled once per language:
+the label catalog is resolved into the static text of every heading, label
+and table header, leaving a list of section writers that render a model
+(and optionally a state's local context) straight into a buffered file.
+
+Labels come from GUIDE_LABELS (English). A language's catalog in
+GUIDE_LABEL_DIR/<code>.json overrides any of them; labels it does not
+translate stay in English, and model content is written as given.
+
+render_localized_guides writes the markdown guide for each model, state and
+language (by default English and the languages that have a catalog), plus
+one JSON guide per model and state, across a process pool.
+Each output's inputs (model, local context, labels and this module's source)
+are hashed into a manifest, and outputs whose hash is unchanged are skipped
+without being rendered again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from incremental_build import hash_file, hash_value
+
+GUIDE_LANGUAGES = {
+    'en': 'English',
+    'ha': 'Hausa',
+    'yo': 'Yoruba',
+    'ig': 'Igbo',
+    'pcm': 'Nigerian Pidgin'
+}
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GUIDE_LABEL_DIR = os.path.join(SCRIPT_DIR, 'data/guide_labels')
+LOCALIZED_GUIDE_DIR = 'results/youth_opportunities/implementation_guides/localized'
+WRITE_BUFFER = 1 << 16
+
+# Headings take {placeholders} where the text around a value differs between languages
+GUIDE_LABELS = {
+    'guide_title': '{model_name} Implementation Guide',
+    'model_id': 'Model ID',
+    'tagline': 'Tagline',
+    'overview': 'Overview',
+    'value_proposition': 'Value Proposition',
+    'target_crops': 'Target Crops',
+    'target_customers': 'Target Customers',
+    'geographical_focus': 'Geographical Focus',
+    'local_context': 'Local Context: {state}',
+    'zone': 'Geopolitical Zone',
+    'crop': 'Crop',
+    'production': 'Production (tons)',
+    'loss_rate': 'Loss Rate',
+    'tons_lost': 'Tons Lost',
+    'no_local_data': 'No state production data is available for this model\'s target crops.',
+    'equipment_needs': 'Equipment Needs',
+    'essential_equipment': 'Essential Equipment',
+    'optional_equipment': 'Optional Equipment',
+    'item': 'Item',
+    'specifications': 'Specifications',
+    'estimated_cost': 'Estimated Cost',
+    'lifespan': 'Lifespan',
+    'setup_costs': 'Setup Costs',
+    'category': 'Category',
+    'cost': 'Cost',
+    'revenue_model': 'Revenue Model',
+    'operating_costs': 'Operating Costs',
+    'profitability': 'Profitability',
+    'key_success_factors': 'Key Success Factors',
+    'challenges_and_solutions': 'Challenges and Solutions',
+    'challenge': 'Challenge: {challenge}',
+    'solutions': 'Solutions',
+    'implementation_steps': 'Implementation Steps',
+    'activities': 'Activities',
+    'timeframe': 'Timeframe',
+    'resources_needed': 'Resources Needed',
+    'success_indicators': 'Success Indicators',
+    'digital_enhancements': 'Digital Enhancements',
+    'essential_tools': 'Essential Digital Tools',
+    'advanced_tools': 'Advanced Digital Tools',
+    'description': 'Description',
+    'benefits': 'Benefits',
+    'implementation': 'Implementation',
+    'financing_options': 'Financing Options',
+    'providers': 'Providers',
+    'features': 'Features',
+    'requirements': 'Requirements',
+    'application_process': 'Application Process',
+    'case_study_title': 'Case Study: {title}',
+    'entrepreneur': 'Entrepreneur',
+    'background': 'Background',
+    'starting_point': 'Starting Point',
+    'challenges_faced': 'Challenges Faced',
+    'results': 'Results',
+    'key_lessons': 'Key Lessons',
+    'future_plans': 'Future Plans'
+}
+
+# Guide sections in order: (model key, heading label, body kind). The 'local' section is the state's context.
+GUIDE_SECTIONS = [
+    ('description', 'overview', 'paragraph'),
+    ('value_proposition', 'value_proposition', 'bullets'),
+    ('target_crops', 'target_crops', 'inline_list'),
+    ('target_customers', 'target_customers', 'grouped_bullets'),
+    ('geographical_focus', 'geographical_focus', 'bullets'),
+    ('local', 'local_context', 'local_context'),
+    ('equipment_needs', 'equipment_needs', 'equipment'),
+    ('setup_costs', 'setup_costs', 'cost_table'),
+    ('revenue_model', 'revenue_model', 'revenue'),
+    ('operating_costs', 'operating_costs', 'cost_table'),
+    ('profitability', 'profitability', 'fields'),
+    ('key_success_factors', 'key_success_factors', 'bullets'),
+    ('challenges_and_solutions', 'challenges_and_solutions', 'challenges'),
+    ('implementation_steps', 'implementation_steps', 'steps'),
+    ('digital_enhancements', 'digital_enhancements', 'digital_tools'),
+    ('financing_options', 'financing_options', 'financing')
+]
+
+CASE_STUDY_SECTIONS = [
+    ('background', 'paragraph'),
+    ('starting_point', 'paragraph'),
+    ('implementation', 'paragraph'),
+    ('challenges_faced', 'paragraph'),
+    ('results', 'paragraph'),
+    ('key_lessons', 'bullets'),
+    ('future_plans', 'paragraph')
+]
+
+_templates = {}   # per process: labels hash -> (guide, case study) templates
+
+
+def load_labels(language, label_dir=GUIDE_LABEL_DIR):
+    """Label catalog for a language: English, overridden by GUIDE_LABEL_DIR/<code>.json where it exists"""
+    if language not in GUIDE_LANGUAGES:
+        raise ValueError(f"Unknown guide language '{language}'; expected one of {list(GUIDE_LANGUAGES)}")
+    labels = dict(GUIDE_LABELS)
+    path = os.path.join(label_dir, f'{language}.json')
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            translated = json.load(f)
+        unknown = set(translated) - set(GUIDE_LABELS)
+        if unknown:
+            raise ValueError(f"'{path}' has unknown labels {sorted(unknown)}")
+        labels.update(translated)
+    return labels
+
+
+def catalog_languages(label_dir=GUIDE_LABEL_DIR):
+    """English plus every language with a label catalog in label_dir, in GUIDE_LANGUAGES order"""
+    return [language for language in GUIDE_LANGUAGES
+            if language == 'en' or os.path.exists(os.path.join(label_dir, f'{language}.json'))]
+
+
+def _title(key):
+    return key.replace('_', ' ').title()
+
+
+def _literal(text):
+    """Label text for use in a format string"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def _table_header(*columns):
+    return '| ' + ' | '.join(columns) + ' |\n|' + '|'.join('-' * (len(column) + 2) for column in columns) + '|\n'
+
+
+# Body writers: each factory resolves its labels once and returns write_body(write, value)
+
+def _paragraph(labels):
+    def write_body(write, text):
+        write(f"{text.strip()}\n\n")
+    return write_body
+
+
+def _bullets(labels):
+    def write_body(write, items):
+        for item in items:
+            write(f"- {item}\n")
+        write("\n")
+    return write_body
+
+
+def _inline_list(labels):
+    def write_body(write, items):
+        write(", ".join(items) + "\n\n")
+    return write_body
+
+
+def _grouped_bullets(labels):
+    def write_body(write, groups):
+        if isinstance(groups, list):
+            for item in groups:
+                write(f"- {item}\n")
+        elif isinstance(groups, dict):
+            for group, items in groups.items():
+                write(f"### {group.title()}\n\n")
+                for item in items:
+                    write(f"- {item}\n")
+                write("\n")
+        write("\n")
+    return write_body
+
+
+def _fields(labels):
+    def write_body(write, fields):
+        for key, value in fields.items():
+            write(f"**{_title(key)}:** {value}\n\n")
+    return write_body
+
+
+def _cost_table(labels):
+    header = _table_header(labels['category'], labels['cost'])
+
+    def write_body(write, costs):
+        write(header)
+        for category, cost in costs.items():
+            write(f"| {_title(category)} | {cost} |\n")
+        write("\n")
+    return write_body
+
+
+def _equipment(labels):
+    header = _table_header(labels['item'], labels['specifications'], labels['estimated_cost'], labels['lifespan'])
+    groups = [('essential', f"### {labels['essential_equipment']}\n\n"),
+              ('optional', f"### {labels['optional_equipment']}\n\n")]
+
+    def write_body(write, equipment):
+        for group, heading in groups:
+            if group in equipment:
+                write(heading)
+                write(header)
+                for item in equipment[group]:
+                    write(f"| {item['item']} | {item['specifications']} | {item['estimated_cost']} | {item['lifespan']} |\n")
+                write("\n")
+    return write_body
+
+
+def _revenue(labels):
+    def write_body(write, revenue_model):
+        for key, value in revenue_model.items():
+            if isinstance(value, list):
+                write(f"### {_title(key)}\n\n")
+                for item in value:
+                    if isinstance(item, dict):
+                        for k, v in item.items():
+                            write(f"**{_title(k)}:** {v}\n\n")
+                    else:
+                        write(f"- {item}\n")
+                write("\n")
+            else:
+                write(f"**{_title(key)}:** {value}\n\n")
+    return write_body
+
+
+def _challenges(labels):
+    heading = "### " + labels['challenge'] + "\n\n"
+    solutions = f"**{labels['solutions']}:**\n\n"
+
+    def write_body(write, challenges):
+        for item in challenges:
+            write(heading.format(challenge=item['challenge']))
+            write(solutions)
+            for solution in item['solutions']:
+                write(f"- {solution}\n")
+            write("\n")
+    return write_body
+
+
+def _steps(labels):
+    details = (f"**{_literal(labels['timeframe'])}:** {{timeframe}}\n\n"
+               f"**{_literal(labels['resources_needed'])}:** {{resources_needed}}\n\n"
+               f"**{_literal(labels['success_indicators'])}:** {{success_indicators}}\n\n")
+    activities = f"**{labels['activities']}:**\n\n"
+
+    def write_body(write, steps):
+        for item in steps:
+            write(f"### {item['step']}\n\n")
+            write(activities)
+            for activity in item['activities']:
+                write(f"- {activity}\n")
+            write("\n")
+            write(details.format_map(item))
+    return write_body
+
+
+def _digital_tools(labels):
+    tool = (f"#### {{technology}}\n\n"
+            f"**{_literal(labels['description'])}:** {{description}}\n\n"
+            f"**{_literal(labels['benefits'])}:** {{benefits}}\n\n"
+            f"**{_literal(labels['implementation'])}:** {{implementation}}\n\n")
+    groups = [('essential', f"### {labels['essential_tools']}\n\n"),
+              ('advanced', f"### {labels['advanced_tools']}\n\n")]
+
+    def write_body(write, enhancements):
+        for group, heading in groups:
+            if group in enhancements:
+                write(heading)
+                for item in enhancements[group]:
+                    write(tool.format_map(item))
+    return write_body
+
+
+def _financing(labels):
+    option = (f"### {{option}}\n\n"
+              f"**{_literal(labels['providers'])}:** {{providers}}\n\n"
+              f"**{_literal(labels['features'])}:** {{features}}\n\n"
+              f"**{_literal(labels['requirements'])}:** {{requirements}}\n\n"
+              f"**{_literal(labels['application_process'])}:** {{application_process}}\n\n")
+
+    def write_body(write, options):
+        for item in options:
+            write(option.format_map(item))
+    return write_body
+
+
+def _local_context(labels):
+    zone = f"**{labels['zone']}:** "
+    header = _table_header(labels['crop'], labels['production'], labels['loss_rate'], labels['tons_lost'])
+    no_data = f"{labels['no_local_data']}\n\n"
+
+    def write_body(write, local):
+        write(f"{zone}{local['zone']}\n\n")
+        if not local['crops']:
+            write(no_data)
+            return
+        write(header)
+        for crop in local['crops']:
+            write(f"| {crop['crop']} | {crop['production_tons']:,.0f} | {crop['loss_rate']:.1f}% | "
+                  f"{crop['tons_lost']:,.0f} |\n")
+        write("\n")
+    return write_body
+
+
+_BODIES = {
+    'paragraph': _paragraph,
+    'bullets': _bullets,
+    'inline_list': _inline_list,
+    'grouped_bullets': _grouped_bullets,
+    'fields': _fields,
+    'cost_table': _cost_table,
+    'equipment': _equipment,
+    'revenue': _revenue,
+    'challenges': _challenges,
+    'steps': _steps,
+    'digital_tools': _digital_tools,
+    'financing': _financing,
+    'local_context': _local_context
+}
+
+
+class GuideTemplate:
+    """Implementation guide template compiled for one label catalog"""
+
+    def __init__(self, labels, sections=GUIDE_SECTIONS):
+        self.header = (f"# {labels['guide_title']}\n\n"
+                       f"**{_literal(labels['model_id'])}:** {{model_id}}\n\n"
+                       f"**{_literal(labels['tagline'])}:** {{tagline}}\n\n")
+        self.sections = []
+        for key, label, kind in sections:
+            if kind not in _BODIES:
+                raise ValueError(f"Unknown guide section kind '{kind}'")
+            # Only the local context heading has a placeholder, filled in per state
+            heading = f"## {labels[label]}\n\n"
+            self.sections.append((key, heading, _BODIES[kind](labels)))
+
+    def render(self, stream, model, local=None):
+        """Write the guide for `model` (with a state's local context, if given) to a text stream"""
+        write = stream.write
+        write(self.header.format(model_name=model['model_name'], model_id=model['model_id'],
+                                 tagline=model.get('tagline', '')))
+        for key, heading, write_body in self.sections:
+            if key == 'local':
+                if local is not None:
+                    write(heading.format(state=local['state']))
+                    write_body(write, local)
+            elif key in model:
+                write(heading)
+                write_body(write, model[key])
+
+
+class CaseStudyTemplate:
+    """Case study template compiled for one label catalog"""
+
+    def __init__(self, labels, sections=CASE_STUDY_SECTIONS):
+        self.header = (f"# {labels['case_study_title']}\n\n"
+                       f"**{_literal(labels['entrepreneur'])}:** {{entrepreneur}}\n\n")
+        self.sections = [(key, f"## {labels[key]}\n\n", _BODIES[kind](labels)) for key, kind in sections]
+
+    def render(self, stream, case_study):
+        write = stream.write
+        write(self.header.format(title=case_study['title'], entrepreneur=case_study['entrepreneur']))
+        for key, heading, write_body in self.sections:
+            write(heading)
+            write_body(write, case_study[key])
+
+
+def compiled_templates(labels):
+    """(guide, case study) templates for a label catalog, compiled once per process"""
+    key = hash_value(labels)
+    if key not in _templates:
+        _templates[key] = (GuideTemplate(labels), CaseStudyTemplate(labels))
+    return _templates[key]
+
+
+def write_rendered(path, render, *args):
+    """Render into a buffered file at `path`, written to a temporary file and swapped in"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+        render(f, *args)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _write_json(stream, document):
+    # json.dumps without indentation runs the C encoder; json.dump and indented output use the Python one
+    stream.write(json.dumps(document, ensure_ascii=False, separators=(',', ':')))
+
+
+def state_slug(state):
+    return re.sub(r'[^a-z0-9]+', '-', state.lower()).strip('-')
+
+
+def _render_task(task):
+    """Worker: render one model's stale outputs; returns the paths written"""
+    model, jobs = task
+    written = []
+    for kind, labels, local, path in jobs:
+        if kind == 'json':
+            write_rendered(path, _write_json, {**model, 'local_context': local})
+        else:
+            write_rendered(path, compiled_templates(labels)[0].render, model, local)
+        written.append(path)
+    return written
+
+
+def render_localized_guides(models, local_contexts, output_dir=LOCALIZED_GUIDE_DIR, languages=None, workers=None,
+                            force=False, label_dir=GUIDE_LABEL_DIR):
+    """
+    Write the guides for every model x state x language (by default
+    catalog_languages(label_dir), so untranslated languages are not written
+    as copies of the English guides).
+
+    local_contexts maps (model_id, state) to the state's local context
+    ({'state', 'zone', 'crops': [...]}). Markdown guides go to
+    <output_dir>/<language>/<state>/<model_id>_implementation_guide.md and
+    JSON guides (the model with its local context) to
+    <output_dir>/json/<state>/<model_id>_implementation_guide.json.
+    Outputs whose inputs are unchanged since the last run are skipped; the
+    rest are rendered across a process pool, one task per model.
+    Returns a summary of the run.
+    """
+    started = time.perf_counter()
+    languages = list(languages or catalog_languages(label_dir))
+    catalogs = {language: load_labels(language, label_dir) for language in languages}
+    catalog_hashes = {language: hash_value(labels) for language, labels in catalogs.items()}
+    code_hash = hash_file(os.path.abspath(__file__))
+    model_hashes = {model['model_id']: hash_value(model) for model in models}
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    outputs, tasks = {}, {}
+    for model in models:
+        model_id = model['model_id']
+        for (local_model, state), local in local_contexts.items():
+            if local_model != model_id:
+                continue
+            local_hash = hash_value(local)
+            jobs = [('json', None, os.path.join(output_dir, 'json', state_slug(state),
+                                                f'{model_id}_implementation_guide.json'), code_hash)]
+            jobs += [('markdown', language, os.path.join(output_dir, language, state_slug(state),
+                                                         f'{model_id}_implementation_guide.md'),
+                      catalog_hashes[language]) for language in languages]
+            for kind, language, path, extra_hash in jobs:
+                key = os.path.relpath(path, output_dir)
+                outputs[key] = hashlib.sha256(
+                    f'{code_hash}:{model_hashes[model_id]}:{local_hash}:{extra_hash}'.encode('utf-8')).hexdigest()
+                if manifest.get(key) != outputs[key] or not os.path.exists(path):
+                    tasks.setdefault(model_id, (model, []))[1].append(
+                        (kind, catalogs.get(language), local, path))
+
+    stale = sum(len(jobs) for _, jobs in tasks.values())
+    workers = workers or min(os.cpu_count() or 1, max(len(tasks), 1))
+    if workers <= 1 or len(tasks) <= 1:
+        written = [path for task in tasks.values() for path in _render_task(task)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = [path for paths in executor.map(_render_task, tasks.values()) for path in paths]
+
+    # Outputs of models or states no longer generated drop out of the manifest; their files are left in place
+    os.makedirs(output_dir, exist_ok=True)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(outputs, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    untranslated = {language: sum(labels[key] == GUIDE_LABELS[key] for key in GUIDE_LABELS)
+                    for language, labels in catalogs.items() if language != 'en'}
+    return {
+        'outputs': len(outputs),
+        'rendered': len(written),
+        'skipped': len(outputs) - stale,
+        'untranslated_labels': untranslated,
+        'seconds': round(time.perf_counter() - started, 2)
+    }
@@ -0,0 +1,166 @@
+"""
+YouthHarvest Project: incremental artifact builds
+
+A small dependency-tracking build runner. Each artifact names the outputs it
+writes and declares its inputs:
+
+  - values:     in-memory configuration (dicts, lists, template strings)
+  - files:      source files on disk
+  - depends_on: other artifacts, whose output files become inputs
+
+The runner hashes all declared inputs together with the source code of the
+build function and compares the result with the manifest from the previous run.
+Only artifacts whose inputs changed (or whose outputs are missing) are rebuilt.
+Upstream outputs are hashed by content, so an upstream rebuild that writes
+identical bytes does not cascade to its dependants.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+
+
+def hash_value(value):
+    """Stable hash of a JSON-serialisable value"""
+    encoded = json.dumps(value, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Content hash of a file, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Artifact:
+    """A named build step with declared inputs and outputs"""
+
+    def __init__(self, name, build, outputs, values=None, files=(), depends_on=()):
+        self.name = name
+        self.build = build
+        self.outputs = list(outputs)
+        self.values = dict(values or {})
+        self.files = list(files)
+        self.depends_on = list(depends_on)
+
+    def code_hash(self):
+        try:
+            source = inspect.getsource(self.build)
+        except (OSError, TypeError):
+            source = getattr(self.build, '__qualname__', repr(self.build))
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class IncrementalBuild:
+    """Runs artifacts in dependency order, rebuilding only what changed"""
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.artifacts = {}
+
+    def add(self, artifact):
+        for dependency in artifact.depends_on:
+            if dependency not in self.artifacts:
+                raise ValueError(f"Artifact '{artifact.name}' depends on unknown artifact '{dependency}'")
+        if artifact.name in self.artifacts:
+            raise ValueError(f"Duplicate artifact '{artifact.name}'")
+        self.artifacts[artifact.name] = artifact
+        return artifact
+
+    def load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest):
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def input_hash(self, artifact, output_hashes):
+        """Hash of everything the artifact declares as input"""
+        parts = {
+            'code': artifact.code_hash(),
+            'values': {key: hash_value(value) for key, value in artifact.values.items()},
+            'files': {path: hash_file(path) for path in artifact.files},
+            'upstream': {name: output_hashes[name] for name in artifact.depends_on}
+        }
+        return hash_value(parts)
+
+    def run(self, dry_run=False, force=False, verbose=True):
+        """
+        Build every artifact whose inputs changed since the last run.
+
+        In dry-run mode nothing is written; an artifact downstream of one that
+        would rebuild is reported as rebuilding too, since its upstream outputs
+        cannot be hashed until they exist. Returns a list of
+        (artifact name, status, reason) tuples.
+        """
+        manifest = self.load_manifest()
+        output_hashes = {}
+        pending = set()
+        report = []
+
+        for name, artifact in self.artifacts.items():
+            previous = manifest.get(name, {})
+            stale_upstream = [dep for dep in artifact.depends_on if dep in pending]
+
+            if stale_upstream:
+                reason = f"upstream {', '.join(stale_upstream)} will rebuild"
+                current_hash = None
+            else:
+                current_hash = self.input_hash(artifact, output_hashes)
+                missing = [path for path in artifact.outputs if not os.path.exists(path)]
+                if force:
+                    reason = 'forced'
+                elif not previous:
+                    reason = 'never built'
+                elif missing:
+                    reason = f"missing output {missing[0]}"
+                elif previous.get('input_hash') != current_hash:
+                    reason = 'inputs changed'
+                else:
+                    reason = None
+
+            if reason is None:
+                output_hashes[name] = {path: hash_file(path) for path in artifact.outputs}
+                report.append((name, 'up to date', ''))
+                continue
+
+            if dry_run:
+                pending.add(name)
+                report.append((name, 'would rebuild', reason))
+                if verbose:
+                    print(f"  would rebuild {name}: {reason}")
+                continue
+
+            started = time.perf_counter()
+            artifact.build()
+            elapsed = time.perf_counter() - started
+
+            output_hashes[name] = {path: hash_file(path) for path in artifact.outputs}
+            manifest[name] = {
+                'input_hash': current_hash,
+                'output_hashes': output_hashes[name],
+                'built_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'build_seconds': round(elapsed, 3)
+            }
+            self.save_manifest(manifest)
+            report.append((name, 'rebuilt', reason))
+            if verbose:
+                print(f"  rebuilt {name} in {elapsed:.2f}s ({reason})")
+
+        if verbose:
+            up_to_date = sum(1 for _, status, _ in report if status == 'up to date')
+            print(f"{up_to_date} of {len(report)} artifacts up to date")
+        return report
@@ -0,0 +1,291 @@
+"""
+YouthHarvest Project: JSON document output for the roadmap and documentation scripts
+
+The roadmap and documentation scripts write large nested documents that are
+read back by machines (the dashboard) far more often than by people, so
+documents are written compact by default:
+
+  - compact JSON with orjson when it is installed, or the stdlib's C encoder
+    otherwise (json.dump and indented output run the pure-Python encoder)
+  - MessagePack, when msgpack is installed and the path ends in .msgpack
+  - pretty JSON only on request, from the stdlib encoder with the scripts'
+    original settings, so pretty output matches what they wrote before
+
+Compact JSON is strict JSON whichever encoder writes it: NaN and infinity
+are written as null, as orjson does (pretty JSON keeps json.dump's NaN).
+Top-level keys that are not strings are written as json.dump writes them
+(1 as "1", True as "true").
+
+Each document is written to a temporary file and swapped in. The top-level
+entries of a document are encoded one at a time and their byte ranges are
+saved in a small index next to documents of INDEX_MIN_BYTES or more
+(<path>.idx), so read_section can read a single section, such as one
+roadmap phase, without parsing the whole document. Small documents, and
+documents whose index is missing or older than them, are read whole.
+
+Run this module directly for write and read timings on the committed
+documentation files.
+"""
+
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # without orjson compact JSON is encoded and parsed by the stdlib
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # without msgpack documents can only be written as JSON
+    msgpack = None
+
+DOCUMENT_FORMATS = {'.json': 'json', '.msgpack': 'msgpack'}
+INDEX_SUFFIX = '.idx'
+INDEX_MIN_BYTES = 64 * 1024   # smaller documents are cheaper to parse whole than to index
+BENCHMARK_SOURCES = 'results/documentation'
+
+
+def document_path(stem, fmt='json'):
+    """Path of a document saved in format `fmt` ('json' or 'msgpack')"""
+    extension = {value: key for key, value in DOCUMENT_FORMATS.items()}.get(fmt)
+    if extension is None:
+        raise ValueError(f"Unknown document format '{fmt}'; expected one of {list(DOCUMENT_FORMATS.values())}")
+    return stem + extension
+
+
+def _format(path):
+    fmt = DOCUMENT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"'{path}' is not a .json or .msgpack document")
+    if fmt == 'msgpack' and msgpack is None:
+        raise ValueError(f"msgpack is required to read or write '{path}'")
+    return fmt
+
+
+def _finite(value):
+    """value with NaN and infinite floats replaced by None, as orjson encodes them"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _encode(value, fmt, indent=None):
+    if fmt == 'msgpack':
+        return msgpack.packb(value)
+    if indent is not None:
+        return json.dumps(value, indent=indent).encode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    except ValueError:  # NaN or infinity somewhere in value; written as null, like orjson
+        return json.dumps(_finite(value), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode(data, fmt):
+    if fmt == 'msgpack':
+        return msgpack.unpackb(data, strict_map_key=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _key_text(key):
+    """A top-level key as json.dump writes it"""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    raise ValueError(f"Document keys must be strings, numbers, booleans or None, got {key!r}")
+
+
+def _sections(document, fmt, indent):
+    """Encoded document as a list of byte chunks, and the (offset, length) of each top-level value"""
+    if fmt == 'msgpack':
+        chunks, separator, opening, closing = [msgpack.Packer().pack_map_header(len(document))], b'', b'', b''
+    elif indent is None:
+        chunks, separator, opening, closing = [b'{'], b',', b'', b'}'
+    else:
+        # Same layout as json.dumps(document, indent=indent): one entry per line, nested values shifted one level
+        margin = b'\n' + b' ' * indent
+        chunks, separator, opening, closing = [b'{'], b',', margin, b'\n}' if document else b'}'
+
+    offset = len(chunks[0])
+    sections = {}
+    for position, (key, value) in enumerate(document.items()):
+        encoded_value = _encode(value, fmt, indent)
+        if indent is not None:
+            encoded_value = encoded_value.replace(b'\n', margin)
+        if fmt == 'msgpack':
+            prefix = msgpack.packb(key)
+        else:
+            prefix = (separator if position else b'') + opening + json.dumps(_key_text(key)).encode('utf-8') + (
+                b': ' if indent is not None else b':')
+        chunks.append(prefix)
+        offset += len(prefix)
+        # MessagePack keeps keys as given; the index, being JSON, holds them as text
+        sections[_key_text(key)] = (offset, len(encoded_value))
+        chunks.append(encoded_value)
+        offset += len(encoded_value)
+    chunks.append(closing)
+    return chunks, sections
+
+
+def dump_document(document, path, pretty=False, indent=4):
+    """
+    Write `document` to `path` (format from the extension), atomically.
+
+    JSON is compact unless pretty=True, which indents it by `indent` like
+    json.dump. For a dict of at least INDEX_MIN_BYTES, an index of its
+    top-level sections is written next to the document for read_section.
+    Returns path.
+    """
+    fmt = _format(path)
+    if pretty and fmt != 'json':
+        raise ValueError("Pretty output is only available for JSON documents")
+    indent = indent if pretty else None
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    if isinstance(document, dict):
+        chunks, sections = _sections(document, fmt, indent)
+    else:
+        chunks, sections = [_encode(document, fmt, indent)], None
+    with open(tmp_path, 'wb') as f:
+        f.writelines(chunks)
+    os.replace(tmp_path, path)
+
+    index_path = path + INDEX_SUFFIX
+    stat = os.stat(path)
+    if sections is None or stat.st_size < INDEX_MIN_BYTES:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        return path
+    index = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sections': sections}
+    with open(index_path + f'.{os.getpid()}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(index_path + f'.{os.getpid()}.tmp', index_path)
+    return path
+
+
+def load_document(path):
+    """The whole document at `path`"""
+    fmt = _format(path)
+    with open(path, 'rb') as f:
+        return _decode(f.read(), fmt)
+
+
+def _load_index(path):
+    """The section index of a document, or None if it is missing or does not match the document"""
+    try:
+        with open(path + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    if index.get('size') != stat.st_size or index.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return index
+
+
+def section_keys(path):
+    """Top-level keys of a document, from its index when it has one"""
+    index = _load_index(path)
+    if index is None:
+        return list(load_document(path))
+    return list(index['sections'])
+
+
+def read_section(path, key):
+    """One top-level section of a document, reading only its bytes when the document is indexed"""
+    fmt = _format(path)
+    index = _load_index(path)
+    if index is None:
+        return load_document(path)[key]
+    if _key_text(key) not in index['sections']:
+        raise KeyError(key)
+    offset, length = index['sections'][_key_text(key)]
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return _decode(f.read(length), fmt)
+
+
+def benchmark(source_dir=BENCHMARK_SOURCES, copies=50, repeats=3):
+    """
+    Seconds to write and read the documents in source_dir: json.dump(indent=4)
+    as the scripts used to, then pretty and compact JSON and MessagePack
+    through dump_document, with full reads and a single-section read.
+
+    Two cases: 'many documents' writes every document `copies` times, and
+    'one large document' writes one document with all of those as its
+    top-level sections.
+    """
+    documents = []
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            if name.endswith('.json'):
+                with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+                if isinstance(document, dict):
+                    documents.append(document)
+    if not documents:
+        raise ValueError(f"No JSON documents found in '{source_dir}'")
+    cases = {
+        'many documents': documents * copies,
+        'one large document': [{f'section_{i}': document for i, document in enumerate(documents * copies)}]
+    }
+
+    def best_of(run):
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    work_dir = tempfile.mkdtemp(prefix='json_store_benchmark_')
+    modes = [('pretty JSON', 'json', True), ('compact JSON', 'json', False)]
+    if msgpack is not None:
+        modes.append(('MessagePack', 'msgpack', False))
+    rows = []
+    try:
+        for case, case_documents in cases.items():
+            def write_stdlib():
+                for i, document in enumerate(case_documents):
+                    with open(os.path.join(work_dir, f'stdlib_{i}.json'), 'w') as f:
+                        json.dump(document, f, indent=4)
+            rows.append({'case': case, 'mode': 'json.dump indent=4 (before)', 'write_s': best_of(write_stdlib)})
+
+            # The section read fetches the last top-level section of each document
+            keys = [list(document)[-1] for document in case_documents]
+            for label, fmt, pretty in modes:
+                paths = [document_path(os.path.join(work_dir, f'{fmt}_{pretty}_{i}'), fmt)
+                         for i in range(len(case_documents))]
+                rows.append({
+                    'case': case,
+                    'mode': label,
+                    'write_s': best_of(lambda: [dump_document(document, path, pretty=pretty)
+                                                for document, path in zip(case_documents, paths)]),
+                    'read_s': best_of(lambda: [load_document(path) for path in paths]),
+                    'section_read_s': best_of(lambda: [read_section(path, key) for path, key in zip(paths, keys)]),
+                    'size_kb': sum(os.path.getsize(path) for path in paths) / 1024
+                })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return pd.DataFrame(rows).round(4)
+
+
+if __name__ == "__main__":
+    print(f"orjson: {'yes' if orjson is not None else 'no'}, msgpack: {'yes' if msgpack is not None else 'no'}")
+    print(benchmark().to_string(index=False))
@@ -0,0 +1,208 @@
+"""
+YouthHarvest Project: multi-pattern keyword matcher for risk texts
+
+Tags free text (mitigation strategies, field risk logs) with every
+mitigation approach whose keywords it contains. The original classification
+lowercased and rescanned each text once per keyword; this builds an
+Aho-Corasick automaton from all approaches' keywords once and finds every
+approach in a single pass over the lowercased text.
+
+Matching keeps the original semantics: a keyword matches anywhere in the text,
+including inside longer words ("adapt" in "adaptation"), case-insensitively.
+The automaton runs over UTF-8 bytes and is compiled into a dense
+state x byte transition table (failure links resolved ahead of time), with a
+bitmask per state of the approaches matched on reaching it.
+
+A batch of texts is matched in lockstep: texts are grouped by length into a
+byte matrix and each step advances every text's state with one table lookup,
+so the per-character work runs in NumPy rather than the interpreter. Large
+batches (e.g. a column of field risk logs) are also split across a process
+pool; each worker receives the compiled matcher once.
+
+Run this module directly for throughput against the substring loop.
+"""
+
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 20_000
+LOCKSTEP_BATCH = 4096    # texts advanced together; texts are sorted by length first
+
+_worker_matcher = None
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping texts to the labels whose keywords they contain"""
+
+    def __init__(self, keywords_by_label):
+        self.labels = list(keywords_by_label)
+        if len(self.labels) > 63:
+            raise ValueError("KeywordMatcher supports at most 63 labels")
+
+        # Trie of lowercased UTF-8 keywords; each node records the labels ending there
+        transitions = [{}]
+        outputs = [0]
+        for bit, label in enumerate(self.labels):
+            for keyword in keywords_by_label[label]:
+                node = 0
+                for byte in keyword.lower().encode('utf-8'):
+                    if byte not in transitions[node]:
+                        transitions.append({})
+                        outputs.append(0)
+                        transitions[node][byte] = len(transitions) - 1
+                    node = transitions[node][byte]
+                outputs[node] |= 1 << bit
+
+        # Breadth-first: failure links, inherited outputs and the complete transition table.
+        # Bytes missing from the root's row (including the zero padding byte) stay at the root.
+        table = np.zeros((len(transitions), 256), dtype=np.int32)
+        failure = [0] * len(transitions)
+        for byte, child in transitions[0].items():
+            table[0, byte] = child
+        queue = deque(transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            outputs[node] |= outputs[failure[node]]
+            table[node] = table[failure[node]]
+            for byte, child in transitions[node].items():
+                failure[child] = table[failure[node], byte]
+                table[node, byte] = child
+                queue.append(child)
+        self._table = table
+        self._outputs = np.array(outputs, dtype=np.int64)
+
+    @property
+    def states(self):
+        return len(self._table)
+
+    def _lockstep(self, encoded):
+        """Label masks for byte strings advanced through the automaton together"""
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        width = int(lengths.max(initial=0))
+        # One column per text so each step reads a contiguous row
+        buffer = np.zeros((width, len(encoded)), dtype=np.uint8)
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        columns = np.repeat(np.arange(len(encoded)), lengths)
+        rows = np.arange(len(data)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        buffer[rows, columns] = data
+
+        table, outputs = self._table, self._outputs
+        state = np.zeros(len(encoded), dtype=np.int32)
+        found = np.zeros(len(encoded), dtype=np.int64)
+        for row in buffer:
+            state = table[state, row]
+            found |= outputs[state]
+        return found
+
+    def masks(self, texts):
+        """Bitmask of the labels found in each text (bit i for self.labels[i])"""
+        encoded = [text.lower().encode('utf-8') for text in texts]
+        order = np.argsort(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), kind='stable')
+        found = np.zeros(len(encoded), dtype=np.int64)
+        for start in range(0, len(order), LOCKSTEP_BATCH):
+            batch = order[start:start + LOCKSTEP_BATCH]
+            found[batch] = self._lockstep([encoded[i] for i in batch])
+        return found
+
+    def mask(self, text):
+        return int(self.masks([text])[0])
+
+    def match(self, text):
+        """Labels whose keywords appear in `text`, in label order"""
+        found = self.mask(text)
+        return [label for bit, label in enumerate(self.labels) if found >> bit & 1]
+
+    def match_many(self, texts, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Labels found in many texts, as a boolean DataFrame with one column per label.
+
+        Missing texts match nothing. Chunks of texts are matched across a
+        process pool; workers=1 (or a single chunk) matches in this process.
+        """
+        texts = ['' if text is None or text != text else str(text) for text in texts]
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        workers = workers or min(os.cpu_count() or 1, len(chunks))
+        if workers <= 1 or len(chunks) <= 1:
+            masks = self.masks(texts)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+                masks = np.concatenate(list(executor.map(_match_chunk, chunks)))
+        return self.to_frame(masks)
+
+    def to_frame(self, masks):
+        """Boolean DataFrame (texts x labels) from label masks"""
+        masks = np.asarray(masks, dtype=np.int64)
+        return pd.DataFrame({label: (masks >> bit & 1).astype(bool) for bit, label in enumerate(self.labels)})
+
+
+def _init_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _match_chunk(texts):
+    return _worker_matcher.masks(texts)
+
+
+def substring_labels(text, keywords_by_label):
+    """Reference implementation: the per-keyword substring loop the matcher replaces"""
+    return [label for label, keywords in keywords_by_label.items()
+            if any(keyword.lower() in text.lower() for keyword in keywords)]
+
+
+def synthetic_risk_logs(keywords_by_label, count, seed=42):
+    """Free-text risk logs mixing filler words with occasional keywords (for benchmarks)"""
+    rng = random.Random(seed)
+    keywords = [keyword for words in keywords_by_label.values() for keyword in words]
+    filler = ("the store in our community lost grain after rain because bags were torn and the truck "
+              "arrived late so farmers sold early at low prices while youth operators waited for repairs").split()
+    logs = []
+    for _ in range(count):
+        words = rng.choices(filler, k=rng.randint(20, 120))
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords).title())
+        logs.append(' '.join(words))
+    return logs
+
+
+def benchmark(keywords_by_label, sizes=(10_000, 100_000), workers=None):
+    """Texts per second for the substring loop, the matcher, and the matcher over a process pool"""
+    matcher = KeywordMatcher(keywords_by_label)
+    rows = []
+    for size in sizes:
+        texts = synthetic_risk_logs(keywords_by_label, size)
+        timings = {}
+        started = time.perf_counter()
+        expected = [substring_labels(text, keywords_by_label) for text in texts]
+        timings['substring loop'] = time.perf_counter() - started
+        started = time.perf_counter()
+        frame = matcher.match_many(texts, workers=1)
+        timings['aho-corasick'] = time.perf_counter() - started
+        started = time.perf_counter()
+        pooled = matcher.match_many(texts, workers=workers, chunk_size=max(1, size // (os.cpu_count() or 1)))
+        timings['aho-corasick, process pool'] = time.perf_counter() - started
+
+        found = [list(frame.columns[row]) for row in frame.to_numpy()]
+        if found != expected or not frame.equals(pooled):
+            raise AssertionError("Matcher and substring loop disagree")
+        for method, seconds in timings.items():
+            rows.append({
+                'texts': size,
+                'method': method,
+                'seconds': round(seconds, 3),
+                'texts_per_second': round(size / seconds),
+                'speedup': round(timings['substring loop'] / seconds, 2)
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from risk_mitigation_config import mitigation_keywords
+
+    print(benchmark(mitigation_keywords).to_string(index=False))
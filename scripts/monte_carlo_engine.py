@@ -0,0 +1,140 @@
+"""
+YouthHarvest Project: Monte Carlo uncertainty for scale-up scenarios
+
+The Conservative/Realistic/Optimistic scenarios in economic_analysis.py give
+three point estimates of 5-year ROI per intervention. This engine instead
+samples the scale-up inputs from distributions:
+
+  - coverage, efficiency and cost_overrun: triangular, with the conservative
+    and optimistic scenarios as bounds and the realistic scenario as the mode
+  - crop prices and baseline loss rates: mean-preserving lognormal noise
+    around the values used in the point estimates
+
+Draws are evaluated in vectorised chunks across a process pool. Each chunk gets
+its own child of a single SeedSequence, so results are reproducible for a given
+seed and chunk size whatever the number of workers. Chunks are summarised into
+QuantileSketch objects instead of keeping every draw, so memory stays bounded
+at a few thousand buckets per intervention for any number of draws.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from quantile_sketch import QuantileSketch
+from roi_engine import scale_up_roi
+
+DEFAULT_DRAWS = 1_000_000
+DEFAULT_CHUNK_SIZE = 100_000
+PRICE_VOLATILITY = 0.15      # lognormal sigma for crop prices
+LOSS_RATE_VOLATILITY = 0.20  # lognormal sigma for baseline loss rates
+
+
+def triangular_from_scenarios(scenarios, parameter, mode_scenario='Realistic'):
+    """(low, mode, high) for a scenario parameter, spanning the scenario values"""
+    values = [params[parameter] for params in scenarios.values()]
+    return (min(values), scenarios[mode_scenario][parameter], max(values))
+
+
+def default_distributions(scenarios):
+    """Sampling distributions derived from the point-estimate scenarios"""
+    return {
+        'coverage': triangular_from_scenarios(scenarios, 'coverage'),
+        'efficiency': triangular_from_scenarios(scenarios, 'efficiency'),
+        'cost_overrun': triangular_from_scenarios(scenarios, 'cost_overrun'),
+        'price_volatility': PRICE_VOLATILITY,
+        'loss_rate_volatility': LOSS_RATE_VOLATILITY
+    }
+
+
+def _lognormal_noise(rng, sigma, shape):
+    """Multiplicative noise with mean 1"""
+    return np.exp(sigma * rng.standard_normal(shape) - sigma ** 2 / 2)
+
+
+def sample_inputs(rng, draws, distributions, crop_values, baseline_losses):
+    """One chunk of sampled inputs; scenario parameters have shape (draws, 1), crop inputs (draws, crops)"""
+    samples = {
+        name: rng.triangular(*distributions[name], size=(draws, 1))
+        for name in ('coverage', 'efficiency', 'cost_overrun')
+    }
+    crops = len(crop_values)
+    samples['crop_value'] = crop_values * _lognormal_noise(rng, distributions['price_volatility'], (draws, crops))
+    samples['baseline_loss'] = baseline_losses * _lognormal_noise(
+        rng, distributions['loss_rate_volatility'], (draws, crops))
+    return samples
+
+
+def simulate_chunk(seed, draws, model):
+    """Sketch the 5-year ROI of every intervention over one chunk of draws"""
+    rng = np.random.default_rng(seed)
+    samples = sample_inputs(rng, draws, model['distributions'], model['crop_values'], model['baseline_losses'])
+    crop_index = model['crop_index']
+    roi = scale_up_roi(
+        model['interventions'],
+        model['beneficiary_pool'][crop_index],
+        samples['coverage'],
+        samples['efficiency'],
+        samples['cost_overrun'],
+        samples['crop_value'][:, crop_index],
+        samples['baseline_loss'][:, crop_index],
+        years=model['years']
+    )
+    sketches = []
+    for column in roi.T:
+        sketch = QuantileSketch(model['relative_accuracy'])
+        sketch.add(column)
+        sketches.append(sketch)
+    return sketches
+
+
+def run_monte_carlo(interventions, crop_names, crop_index, crop_values, baseline_losses, beneficiary_pool,
+                    distributions, draws=DEFAULT_DRAWS, chunk_size=DEFAULT_CHUNK_SIZE, workers=None,
+                    seed=42, years=5, relative_accuracy=0.005):
+    """
+    Monte Carlo distribution of multi-year ROI for each intervention.
+
+    `crop_index` picks the crop each intervention is scaled up for (an index
+    into `crop_names` and the per-crop arrays). Returns a DataFrame with the
+    mean, P5/P50/P95 ROI and the probability of a negative ROI.
+    """
+    model = {
+        'interventions': interventions,
+        'crop_index': np.asarray(crop_index),
+        'crop_values': np.asarray(crop_values, dtype=float),
+        'baseline_losses': np.asarray(baseline_losses, dtype=float),
+        'beneficiary_pool': np.asarray(beneficiary_pool, dtype=float),
+        'distributions': distributions,
+        'years': years,
+        'relative_accuracy': relative_accuracy
+    }
+    chunk_sizes = [chunk_size] * (draws // chunk_size)
+    if draws % chunk_size:
+        chunk_sizes.append(draws % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    workers = workers or min(os.cpu_count() or 1, len(chunk_sizes))
+    totals = [QuantileSketch(relative_accuracy) for _ in interventions]
+    if workers == 1:
+        results = (simulate_chunk(s, n, model) for s, n in zip(seeds, chunk_sizes))
+        for sketches in results:
+            for total, sketch in zip(totals, sketches):
+                total.merge(sketch)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for sketches in executor.map(simulate_chunk, seeds, chunk_sizes, [model] * len(chunk_sizes)):
+                for total, sketch in zip(totals, sketches):
+                    total.merge(sketch)
+
+    return pd.DataFrame({
+        'Intervention': interventions['name'],
+        'Crop': np.asarray(crop_names)[model['crop_index']],
+        'Draws': [sketch.count for sketch in totals],
+        f'Mean {years}-Year ROI (%)': [sketch.mean for sketch in totals],
+        f'P5 {years}-Year ROI (%)': [sketch.quantile(0.05) for sketch in totals],
+        f'P50 {years}-Year ROI (%)': [sketch.quantile(0.50) for sketch in totals],
+        f'P95 {years}-Year ROI (%)': [sketch.quantile(0.95) for sketch in totals],
+        'P(ROI < 0)': [sketch.fraction_below(0) for sketch in totals]
+    })
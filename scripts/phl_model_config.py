@@ -0,0 +1,129 @@
+"""
+YouthHarvest PHL model: shared parameters and influence factors
+
+The parameters, base loss rates and influence factors used to generate the
+PHL training data and to interpret the trained model. Kept in their own module
+so the scenario engine can use them without re-running model training.
+"""
+
+import os
+
+# Trained model artifacts written by predictive_loss_model.py, under the repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(REPO_ROOT, 'results/dashboard/predictive_model/model_files')
+MODEL_PATH = f'{MODEL_DIR}/phl_prediction_model.joblib'
+ENCODERS_PATH = f'{MODEL_DIR}/categorical_encoders.joblib'
+
+# Model input features, in training order
+MODEL_FEATURES = [
+    'crop_encoded', 'geopolitical_zone_encoded', 'season_encoded',
+    'value_chain_stage_encoded', 'method_encoded',
+    'transportation_distance_km', 'storage_duration_days', 'base_loss_rate'
+]
+
+# Define parameters that influence post-harvest losses
+# These parameters will be used to create our synthetic training data
+params = {
+    "geopolitical_zones": ["North Central", "North East", "North West", "South East", "South South", "South West"],
+    "crops": ["Maize", "Rice", "Sorghum", "Millet", "Vegetables"],
+    "seasons": ["Wet", "Dry"],
+    "value_chain_stages": ["Harvesting", "Processing", "Storage", "Transportation", "Market"],
+    "transportation_distance_km": {
+        "min": 5,
+        "max": 200
+    },
+    "storage_duration_days": {
+        "min": 1,
+        "max": 180
+    },
+    "harvesting_method": ["Manual", "Mechanical", "Semi-Mechanical"],
+    "processing_method": ["Traditional", "Improved Traditional", "Modern", "None"],
+    "storage_type": ["Open air", "Bags in house", "Traditional structure", "Improved structure", "Modern warehouse"],
+    "transportation_type": ["Head load", "Animal drawn", "Motorcycle", "Small vehicle", "Large truck"],
+    "market_type": ["Local/Village", "District", "Regional/State", "Export"]
+}
+
+# Base loss rates for each crop (percentage)
+base_loss_rates = {
+    "Maize": 28,
+    "Rice": 32,
+    "Sorghum": 25,
+    "Millet": 22,
+    "Vegetables": 45
+}
+
+# Influence factors for each parameter on post-harvest losses
+# These will be used to adjust the base loss rates
+influence_factors = {
+    "geopolitical_zones": {
+        "North Central": 0.0,  # baseline
+        "North East": 0.05,    # 5% higher losses than baseline
+        "North West": -0.02,   # 2% lower losses than baseline
+        "South East": 0.03,
+        "South South": 0.08,
+        "South West": -0.04
+    },
+    "seasons": {
+        "Wet": 0.15,    # 15% higher losses in wet season
+        "Dry": -0.10    # 10% lower losses in dry season
+    },
+    "value_chain_stages": {
+        "Harvesting": {
+            "influence": 0.2,  # Harvesting contributes 20% of total losses
+            "methods": {
+                "Manual": 0.0,           # baseline
+                "Semi-Mechanical": -0.3,  # 30% reduction compared to manual
+                "Mechanical": -0.6       # 60% reduction compared to manual
+            }
+        },
+        "Processing": {
+            "influence": 0.25,  # Processing contributes 25% of total losses
+            "methods": {
+                "None": 0.0,             # No processing (baseline for some crops)
+                "Traditional": 0.0,      # baseline for crops that need processing
+                "Improved Traditional": -0.4,
+                "Modern": -0.7
+            }
+        },
+        "Storage": {
+            "influence": 0.35,  # Storage contributes 35% of total losses
+            "methods": {
+                "Open air": 0.0,             # baseline
+                "Bags in house": -0.2,
+                "Traditional structure": -0.3,
+                "Improved structure": -0.6,
+                "Modern warehouse": -0.85
+            },
+            "duration_factor": 0.001   # Loss increases by 0.1% per day of storage (simplified)
+        },
+        "Transportation": {
+            "influence": 0.15,  # Transportation contributes 15% of total losses
+            "methods": {
+                "Head load": 0.0,         # baseline
+                "Animal drawn": -0.1,
+                "Motorcycle": -0.3,
+                "Small vehicle": -0.5,
+                "Large truck": -0.6
+            },
+            "distance_factor": 0.0005   # Loss increases by 0.05% per km transported (simplified)
+        },
+        "Market": {
+            "influence": 0.05,  # Market handling contributes 5% of total losses
+            "methods": {
+                "Local/Village": 0.0,      # baseline
+                "District": -0.2,
+                "Regional/State": -0.4,
+                "Export": -0.7
+            }
+        }
+    }
+}
+
+# Which parameter lists the methods for each value chain stage
+stage_method_params = {
+    "Harvesting": "harvesting_method",
+    "Processing": "processing_method",
+    "Storage": "storage_type",
+    "Transportation": "transportation_type",
+    "Market": "market_type"
+}
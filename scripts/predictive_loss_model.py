@@ -9,6 +9,7 @@ from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.metrics import mean_absolute_error, r2_score, mean_squared_error
 import joblib
 from datetime import datetime
+from phl_model_config import params, base_loss_rates, influence_factors, MODEL_PATH, ENCODERS_PATH
 
 # Ensure directories exist
 os.makedirs('results/dashboard/predictive_model', exist_ok=True)
@@ -19,103 +20,8 @@ os.makedirs('results/dashboard/predictive_model/model_files', exist_ok=True)
 # Generate synthetic data for training the PHL predictive model
 np.random.seed(42)  # For reproducibility
 
-# Define parameters that influence post-harvest losses
-# These parameters will be used to create our synthetic training data
-params = {
-    "geopolitical_zones": ["North Central", "North East", "North West", "South East", "South South", "South West"],
-    "crops": ["Maize", "Rice", "Sorghum", "Millet", "Vegetables"],
-    "seasons": ["Wet", "Dry"],
-    "value_chain_stages": ["Harvesting", "Processing", "Storage", "Transportation", "Market"],
-    "transportation_distance_km": {
-        "min": 5,
-        "max": 200
-    },
-    "storage_duration_days": {
-        "min": 1,
-        "max": 180
-    },
-    "harvesting_method": ["Manual", "Mechanical", "Semi-Mechanical"],
-    "processing_method": ["Traditional", "Improved Traditional", "Modern", "None"],
-    "storage_type": ["Open air", "Bags in house", "Traditional structure", "Improved structure", "Modern warehouse"],
-    "transportation_type": ["Head load", "Animal drawn", "Motorcycle", "Small vehicle", "Large truck"],
-    "market_type": ["Local/Village", "District", "Regional/State", "Export"]
-}
-
-# Base loss rates for each crop (percentage)
-base_loss_rates = {
-    "Maize": 28,
-    "Rice": 32,
-    "Sorghum": 25,
-    "Millet": 22,
-    "Vegetables": 45
-}
-
-# Influence factors for each parameter on post-harvest losses
-# These will be used to adjust the base loss rates
-influence_factors = {
-    "geopolitical_zones": {
-        "North Central": 0.0,  # baseline
-        "North East": 0.05,    # 5% higher losses than baseline
-        "North West": -0.02,   # 2% lower losses than baseline
-        "South East": 0.03,
-        "South South": 0.08,
-        "South West": -0.04
-    },
-    "seasons": {
-        "Wet": 0.15,    # 15% higher losses in wet season
-        "Dry": -0.10    # 10% lower losses in dry season
-    },
-    "value_chain_stages": {
-        "Harvesting": {
-            "influence": 0.2,  # Harvesting contributes 20% of total losses
-            "methods": {
-                "Manual": 0.0,           # baseline
-                "Semi-Mechanical": -0.3,  # 30% reduction compared to manual
-                "Mechanical": -0.6       # 60% reduction compared to manual
-            }
-        },
-        "Processing": {
-            "influence": 0.25,  # Processing contributes 25% of total losses
-            "methods": {
-                "None": 0.0,             # No processing (baseline for some crops)
-                "Traditional": 0.0,      # baseline for crops that need processing
-                "Improved Traditional": -0.4,
-                "Modern": -0.7
-            }
-        },
-        "Storage": {
-            "influence": 0.35,  # Storage contributes 35% of total losses
-            "methods": {
-                "Open air": 0.0,             # baseline
-                "Bags in house": -0.2,
-                "Traditional structure": -0.3,
-                "Improved structure": -0.6,
-                "Modern warehouse": -0.85
-            },
-            "duration_factor": 0.001   # Loss increases by 0.1% per day of storage (simplified)
-        },
-        "Transportation": {
-            "influence": 0.15,  # Transportation contributes 15% of total losses
-            "methods": {
-                "Head load": 0.0,         # baseline
-                "Animal drawn": -0.1,
-                "Motorcycle": -0.3,
-                "Small vehicle": -0.5,
-                "Large truck": -0.6
-            },
-            "distance_factor": 0.0005   # Loss increases by 0.05% per km transported (simplified)
-        },
-        "Market": {
-            "influence": 0.05,  # Market handling contributes 5% of total losses
-            "methods": {
-                "Local/Village": 0.0,      # baseline
-                "District": -0.2,
-                "Regional/State": -0.4,
-                "Export": -0.7
-            }
-        }
-    }
-}
+# Parameters, base loss rates and influence factors that drive the synthetic data
+# live in phl_model_config (shared with the scenario engine)
 
 # Generate synthetic dataset for model training
 def generate_synthetic_phl_data(num_samples=5000):
@@ -268,7 +174,7 @@ def preprocess_data(df):
 processed_data, features, target, encoders = preprocess_data(phl_data)
 
 # Save the encoders for future use
-joblib.dump(encoders, 'results/dashboard/predictive_model/model_files/categorical_encoders.joblib')
+joblib.dump(encoders, ENCODERS_PATH)
 
 # Split data into training and testing sets
 X = processed_data[features]
@@ -310,7 +216,7 @@ with open('results/dashboard/predictive_model/model_files/model_metrics.json', '
     json.dump(model_metrics, f, indent=4)
 
 # Save the trained model
-joblib.dump(model, 'results/dashboard/predictive_model/model_files/phl_prediction_model.joblib')
+joblib.dump(model, MODEL_PATH)
 print("Model saved successfully")
 
 # Generate feature importance visualization
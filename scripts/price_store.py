@@ -0,0 +1,234 @@
+"""
+YouthHarvest Project: crop price store
+
+Single source of crop prices (Naira per ton) for every financial impact
+calculation. Prices are ingested from:
+
+  - raw/prices/reference_prices.csv: one national reference price per crop
+    (columns crop, price_per_ton)
+  - raw/prices/monthly/*.csv: monthly market prices per state and crop
+    (columns crop, state, month as YYYY-MM, price_per_ton), optional
+
+into a dense float64 array of shape (crops, states + 1, months + 1), saved as
+results/prices/price_store.npy next to a JSON index of the crop, state and
+month labels. The extra state is the national average and the extra month
+the average over all months, so every lookup, including the "national" and
+"annual" ones, is a single array read. Gaps are filled when the store is
+built: a state without a quote for a month takes the national price for that
+month, and a month without any quotes takes the reference price.
+
+The array is opened memory-mapped, so processes share one copy of the pages
+and nothing is re-parsed after the first build. The store is rebuilt only
+when a source file changes, and load_price_store checks the sources on each
+call, so it never returns a store older than them.
+
+Rebuild by hand with:
+    python scripts/price_store.py
+"""
+
+import glob
+import json
+import os
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Source and store directories are under the repository root, whichever directory a script runs from
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRICE_SOURCE_DIR = os.path.join(REPO_ROOT, 'raw/prices')
+REFERENCE_PRICES = 'reference_prices.csv'
+MONTHLY_PRICES = 'monthly/*.csv'
+PRICE_STORE_DIR = os.path.join(REPO_ROOT, 'results/prices')
+NATIONAL = 'National'
+ANNUAL = 'annual'
+
+# State spellings used by the raw production data, mapped to the dashboard names
+STATE_ALIASES = {
+    'Abuja Federal Capital Territory': 'FCT',
+    'Federal Capital Territory': 'FCT',
+    'Abuja': 'FCT'
+}
+
+
+def normalize_state(state):
+    state = str(state).strip()
+    return STATE_ALIASES.get(state, state)
+
+
+def normalize_month(month):
+    """'YYYY-MM' label for a month given as a string, date or Timestamp"""
+    return pd.Timestamp(month).strftime('%Y-%m')
+
+
+def _source_files(source_dir):
+    return [os.path.join(source_dir, REFERENCE_PRICES)] + sorted(
+        glob.glob(os.path.join(source_dir, MONTHLY_PRICES)))
+
+
+def _signatures(paths):
+    signatures = {}
+    for path in paths:
+        stat = os.stat(path)
+        signatures[path] = [stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+
+def build_price_store(source_dir=PRICE_SOURCE_DIR, store_dir=PRICE_STORE_DIR):
+    """Ingest the reference and monthly price files into the store; returns the index"""
+    sources = _source_files(source_dir)
+    reference = pd.read_csv(sources[0])
+    reference_prices = dict(zip(reference['crop'], reference['price_per_ton'].astype(float)))
+
+    monthly = [pd.read_csv(path) for path in sources[1:]]
+    if monthly:
+        monthly = pd.concat(monthly, ignore_index=True)
+        monthly['state'] = monthly['state'].map(normalize_state)
+        monthly['month'] = pd.to_datetime(monthly['month']).dt.strftime('%Y-%m')
+    else:
+        monthly = pd.DataFrame(columns=['crop', 'state', 'month', 'price_per_ton'])
+
+    crops = list(reference_prices) + sorted(set(monthly['crop']) - set(reference_prices))
+    states = sorted(set(monthly['state']))
+    months = sorted(set(monthly['month']))
+    values = np.full((len(crops), len(states) + 1, len(months) + 1), np.nan)
+
+    quotes = monthly.groupby(['crop', 'state', 'month'])['price_per_ton'].mean()
+    if len(quotes):
+        crop_codes = quotes.index.get_level_values('crop').map({c: i for i, c in enumerate(crops)})
+        state_codes = quotes.index.get_level_values('state').map({s: i for i, s in enumerate(states)})
+        month_codes = quotes.index.get_level_values('month').map({m: i for i, m in enumerate(months)})
+        values[crop_codes, state_codes, month_codes] = quotes.to_numpy()
+
+    reference_column = np.array([reference_prices.get(crop, np.nan) for crop in crops])
+    with warnings.catch_warnings():
+        # nanmean warns about crops or months without any quotes; those are filled below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        national = np.nanmean(values[:, :-1, :-1], axis=1) if states else np.full((len(crops), len(months)), np.nan)
+        # Crops without a reference price fall back to the average of their quotes
+        reference_column = np.where(np.isnan(reference_column), np.nanmean(national, axis=1), reference_column)
+    national = np.where(np.isnan(national), reference_column[:, np.newaxis], national)
+
+    values[:, -1, :-1] = national
+    values[:, :-1, :-1] = np.where(np.isnan(values[:, :-1, :-1]), national[:, np.newaxis, :], values[:, :-1, :-1])
+    values[:, :, -1] = values[:, :, :-1].mean(axis=2) if months else reference_column[:, np.newaxis]
+
+    index = {
+        'crops': crops,
+        'states': states + [NATIONAL],
+        'months': months + [ANNUAL],
+        'sources': _signatures(sources)
+    }
+    os.makedirs(store_dir, exist_ok=True)
+    # Write to temporary files and swap them in, so readers never see a partial store
+    with open(os.path.join(store_dir, 'price_store.npy.tmp'), 'wb') as f:
+        np.save(f, values)
+    with open(os.path.join(store_dir, 'price_index.json.tmp'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(os.path.join(store_dir, 'price_store.npy.tmp'), os.path.join(store_dir, 'price_store.npy'))
+    os.replace(os.path.join(store_dir, 'price_index.json.tmp'), os.path.join(store_dir, 'price_index.json'))
+    return index
+
+
+class PriceStore:
+    """Memory-mapped crop x state x month prices with constant-time lookup"""
+
+    def __init__(self, store_dir=PRICE_STORE_DIR):
+        with open(os.path.join(store_dir, 'price_index.json'), encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.values = np.load(os.path.join(store_dir, 'price_store.npy'), mmap_mode='r')
+        self.crops = self.index['crops']
+        self.states = self.index['states'][:-1]
+        self.months = self.index['months'][:-1]
+        self._crop_codes = {crop: i for i, crop in enumerate(self.crops)}
+        self._state_codes = {state: i for i, state in enumerate(self.states)}
+        self._month_codes = {month: i for i, month in enumerate(self.months)}
+
+    @classmethod
+    def open(cls, source_dir=PRICE_SOURCE_DIR, store_dir=PRICE_STORE_DIR):
+        """Open the store, rebuilding it first if a source file changed"""
+        try:
+            with open(os.path.join(store_dir, 'price_index.json'), encoding='utf-8') as f:
+                stale = json.load(f)['sources'] != _signatures(_source_files(source_dir))
+        except (OSError, ValueError, KeyError):
+            stale = True
+        if stale:
+            build_price_store(source_dir, store_dir)
+        return cls(store_dir)
+
+    def __contains__(self, crop):
+        return crop in self._crop_codes
+
+    def _crop_code(self, crop):
+        try:
+            return self._crop_codes[crop]
+        except KeyError:
+            raise KeyError(f"No price for crop '{crop}'") from None
+
+    def _state_code(self, state):
+        # States without market quotes use the national price
+        if state is None:
+            return len(self.states)
+        code = self._state_codes.get(state)
+        return code if code is not None else self._state_codes.get(normalize_state(state), len(self.states))
+
+    def _month_code(self, month):
+        # Months outside the price series use the average over all months
+        if month is None:
+            return len(self.months)
+        code = self._month_codes.get(month)
+        return code if code is not None else self._month_codes.get(normalize_month(month), len(self.months))
+
+    def price(self, crop, state=None, month=None):
+        """Naira per ton for a crop; national and/or annual average when state or month is omitted"""
+        return float(self.values[self._crop_code(crop), self._state_code(state), self._month_code(month)])
+
+    def prices(self, crops, states=None, months=None):
+        """Vectorised price lookup; `states` and `months` may be scalars or sequences matching `crops`"""
+        crop_codes = np.array([self._crop_code(crop) for crop in crops])
+
+        def codes(labels, code):
+            if labels is None or isinstance(labels, str):
+                return np.full(len(crop_codes), code(labels))
+            return np.array([code(label) for label in labels])
+
+        return np.asarray(self.values[crop_codes, codes(states, self._state_code), codes(months, self._month_code)])
+
+    def crop_prices(self, crops=None, state=None, month=None):
+        """{crop: Naira per ton} for the given crops (all crops by default)"""
+        return {crop: self.price(crop, state, month) for crop in (crops or self.crops)}
+
+    def series(self, crop, state=None):
+        """Monthly prices for a crop as a Series indexed by month"""
+        return pd.Series(self.values[self._crop_code(crop), self._state_code(state), :-1], index=self.months,
+                         name=crop)
+
+
+_stores = {}   # (source_dir, store_dir) -> (source signatures, store)
+_stores_lock = threading.Lock()
+
+
+def price_source_paths(source_dir=PRICE_SOURCE_DIR):
+    """Files (and the monthly directory, for files being added) that load_price_store depends on"""
+    return _source_files(source_dir) + [os.path.dirname(os.path.join(source_dir, MONTHLY_PRICES))]
+
+
+def load_price_store(source_dir=PRICE_SOURCE_DIR, store_dir=PRICE_STORE_DIR):
+    """
+    The price store shared by the analysis scripts, opened once per process
+    and opened again (rebuilt) when a price source file changes, so a
+    long-running server picks up price edits on its next call.
+    """
+    signatures = _signatures(_source_files(source_dir))
+    with _stores_lock:
+        cached = _stores.get((source_dir, store_dir))
+        if cached is None or cached[0] != signatures:
+            cached = _stores[(source_dir, store_dir)] = (signatures, PriceStore.open(source_dir, store_dir))
+        return cached[1]
+
+
+if __name__ == "__main__":
+    index = build_price_store()
+    print(f"Price store built: {len(index['crops'])} crops, {len(index['states']) - 1} states, "
+          f"{len(index['months']) - 1} months -> {PRICE_STORE_DIR}")
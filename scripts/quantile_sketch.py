@@ -0,0 +1,138 @@
+"""
+YouthHarvest Project: streaming quantile sketch
+
+A DDSketch-style sketch for summarising millions of simulated values in
+bounded memory. Values are counted in logarithmic buckets whose width is set
+by the relative accuracy, so any quantile read back is within that relative
+error of the true value, however many values were added. Sketches built on
+separate chunks (or in separate processes) merge exactly by adding counts.
+"""
+
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative-accuracy guarantee"""
+
+    def __init__(self, relative_accuracy=0.005):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_counts(self, magnitudes):
+        keys = np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+        return zip(*np.unique(keys, return_counts=True))
+
+    def add(self, values):
+        """Add an array of values"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        # Values too small to bucket are counted as zero
+        tiny = np.abs(values) < 1e-12
+        self.zero_count += int(tiny.sum())
+        for store, selected in ((self.positive, values[(values > 0) & ~tiny]),
+                                (self.negative, -values[(values < 0) & ~tiny])):
+            for key, n in self._bucket_counts(selected):
+                store[int(key)] = store.get(int(key), 0) + int(n)
+
+    def merge(self, other):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in other_store.items():
+                store[key] = store.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bucket_value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Estimated q-quantile (0 <= q <= 1), or NaN for an empty sketch"""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Walk buckets from the most negative value to the most positive
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(-self._bucket_value(key), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self._bucket_value(key), self.max)
+        return self.max
+
+    def fraction_below(self, threshold=0.0):
+        """Share of values below `threshold`; exact at zero, bucket-resolution elsewhere"""
+        if not self.count:
+            return math.nan
+        if threshold == 0:
+            return sum(self.negative.values()) / self.count
+        below = 0
+        for key, n in self.negative.items():
+            if -self._bucket_value(key) < threshold:
+                below += n
+        if threshold > 0:
+            below += self.zero_count
+            below += sum(n for key, n in self.positive.items() if self._bucket_value(key) < threshold)
+        return below / self.count
+
+    def tail_mean(self, q):
+        """
+        Mean of the values above the q-quantile (the expected shortfall of the
+        upper tail), from bucket values; NaN for an empty sketch.
+        """
+        if not self.count:
+            return math.nan
+        tail = (1 - q) * self.count
+        if tail <= 0:
+            return self.max
+        # Walk buckets from the most positive value to the most negative
+        buckets = [(min(self._bucket_value(key), self.max), self.positive[key])
+                   for key in sorted(self.positive, reverse=True)]
+        buckets.append((0.0, self.zero_count))
+        buckets += [(max(-self._bucket_value(key), self.min), self.negative[key]) for key in sorted(self.negative)]
+        remaining, total = tail, 0.0
+        for value, n in buckets:
+            taken = min(n, remaining)
+            total += taken * value
+            remaining -= taken
+            if remaining <= 0:
+                break
+        return total / tail
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    @property
+    def buckets(self):
+        return len(self.positive) + len(self.negative)
@@ -1,8 +1,15 @@
 import os
-import json
+import argparse
 import pandas as pd
 from datetime import datetime
 
+from json_store import document_path, dump_document
+
+parser = argparse.ArgumentParser(description="Create the regional implementation roadmaps")
+parser.add_argument('--pretty', action='store_true', help="Write indented JSON for reading instead of compact JSON")
+parser.add_argument('--format', choices=['json', 'msgpack'], default='json', help="Document format (default: json)")
+args = parser.parse_args()
+
 # Ensure directories exist
 os.makedirs('results/interventions/regional', exist_ok=True)
 
@@ -719,10 +726,8 @@ regional_roadmaps = [
 # Save each regional roadmap as a separate JSON file
 for roadmap in regional_roadmaps:
     region_name = roadmap["region"].replace(" ", "_").lower()
-    filename = f"{region_name}_implementation_roadmap.json"
-    
-    with open(f'results/interventions/regional/{filename}', 'w') as f:
-        json.dump(roadmap, f, indent=4)
+    path = document_path(f'results/interventions/regional/{region_name}_implementation_roadmap', args.format)
+    dump_document(roadmap, path, pretty=args.pretty, indent=4)
     print(f"Saved implementation roadmap for {roadmap['region']}")
 
 # Create a regional comparison and overview document
@@ -916,8 +921,8 @@ regional_comparison = {
 }
 
 # Save the regional comparison document
-with open('results/interventions/regional/regional_comparison_overview.json', 'w') as f:
-    json.dump(regional_comparison, f, indent=4)
+dump_document(regional_comparison, document_path('results/interventions/regional/regional_comparison_overview', args.format),
+              pretty=args.pretty, indent=4)
 print("Saved regional comparison and overview document")
 
 # Create an implementation guide for using the regional roadmaps
@@ -1157,8 +1162,8 @@ implementation_guide = {
 }
 
 # Save the implementation guide
-with open('results/interventions/regional/implementation_guide.json', 'w') as f:
-    json.dump(implementation_guide, f, indent=4)
+dump_document(implementation_guide, document_path('results/interventions/regional/implementation_guide', args.format),
+              pretty=args.pretty, indent=4)
 print("Saved regional implementation guide")
 
 print("\nRegional implementation roadmaps and supporting documents created successfully!")
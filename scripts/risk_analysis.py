@@ -1,67 +1,41 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 import json
 
+from risk_register import count_items, load_risk_register, scatter_risks
+
 # Ensure directories exist
 os.makedirs('results/interventions/risks', exist_ok=True)
 
 # Read the comprehensive risk register that was previously created
-risk_df = pd.read_csv('results/interventions/risks/comprehensive_risk_register.csv')
+# (list columns come back as lists, from the Parquet copy when pyarrow is installed)
+risk_df = load_risk_register('results/interventions/risks/comprehensive_risk_register.csv')
 
 print("Columns available in risk_df:", risk_df.columns.tolist())
 
-# The error is happening because 'mitigation_strategies' is already a list, not a string
-# Fix: Check if the value is a string before trying to split it
-def count_strategies(strategies):
-    if isinstance(strategies, str):
-        return len(strategies.split('; '))
-    elif isinstance(strategies, list):
-        return len(strategies)
-    else:
-        return 0
-
-# Apply the fixed function to count strategies
-risk_df['num_strategies'] = risk_df['mitigation_strategies'].apply(count_strategies)
-
-# Same approach for root causes
-def count_causes(causes):
-    if isinstance(causes, str):
-        return len(causes.split('; '))
-    elif isinstance(causes, list):
-        return len(causes)
-    else:
-        return 0
-
-risk_df['num_causes'] = risk_df['root_causes'].apply(count_causes)
+# Count mitigation strategies and root causes per risk
+risk_df['num_strategies'] = count_items(risk_df['mitigation_strategies'])
+risk_df['num_causes'] = count_items(risk_df['root_causes'])
 
 # Create risk vs mitigation analysis visualization
+# (labelled points for small registers, density mode for large ones)
 plt.figure(figsize=(12, 8))
-plt.scatter(
+points = scatter_risks(
+    plt.gca(),
     risk_df['num_causes'],
     risk_df['num_strategies'],
-    s=100,
-    c=risk_df['risk_score'],
+    risk_df['risk_score'],
+    labels=risk_df['risk_id'],
     cmap='YlOrRd',
     alpha=0.7
 )
 
-# Add risk IDs as labels
-for idx, risk in risk_df.iterrows():
-    plt.annotate(
-        risk['risk_id'],
-        (risk['num_causes'], risk['num_strategies']),
-        xytext=(5, 5),
-        textcoords="offset points",
-        fontsize=8
-    )
-
 plt.xlabel('Number of Root Causes Identified', fontsize=12)
 plt.ylabel('Number of Mitigation Strategies Developed', fontsize=12)
 plt.title('Risk Analysis: Causes vs. Mitigation Strategies', fontsize=14)
 plt.grid(True, alpha=0.3)
-plt.colorbar(label='Risk Score')
+plt.colorbar(points, label='Risk Score')
 plt.tight_layout()
 plt.savefig('results/interventions/risks/risk_mitigation_analysis.png', dpi=300, bbox_inches='tight')
 plt.close()
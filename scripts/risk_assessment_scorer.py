@@ -0,0 +1,345 @@
+"""
+YouthHarvest Project: batch scorer for filled risk mitigation planning templates
+
+Youth agripreneurs fill in risk_mitigation_planning_template.json through
+partner apps; submissions arrive as JSON Lines, one filled template per line.
+This scorer streams any number of such files and, for each business model
+and location:
+
+  - validates each submission against a schema compiled once from the
+    template (known risks, likelihood and impact rated 1-5); invalid lines are
+    written to rejected_submissions.jsonl with their errors
+  - accumulates a likelihood x impact matrix (5 x 5 counts of risk ratings)
+    per LGA, written out and re-rendered as heat maps every
+    `checkpoint_every` submissions, so partial results are usable while a
+    large file is still being processed
+  - ranks risks by mean likelihood x impact score, and mitigation approaches
+    (classified from the free-text plans with the mitigation keyword matcher)
+    by the total score of the risks they are planned against
+
+Submissions are parsed in batches into arrays and folded into fixed-size
+accumulators per LGA and per (business model, location), so memory depends
+on the number of locations, not on the number of submissions.
+
+A submission's location is either "LGA, State" or {"lga": ..., "state": ...}.
+
+Command line:
+    python scripts/risk_assessment_scorer.py submissions/*.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+from risk_mitigation_config import mitigation_keywords
+
+TEMPLATE_PATH = 'results/interventions/risks/risk_mitigation_planning_template.json'
+OUTPUT_DIR = 'results/interventions/risks/assessments'
+RATING_SCALE = 5             # likelihood and impact are rated 1..RATING_SCALE
+BATCH_SIZE = 5_000
+CHECKPOINT_EVERY = 50_000
+
+
+class SubmissionError(ValueError):
+    """Raised when a filled template does not match the compiled schema"""
+
+
+def compile_schema(template, scale=RATING_SCALE):
+    """
+    Validator for filled templates, built once from the blank template.
+
+    Returns (risks, validate): the (section, risk) slots in template order,
+    and validate(record) -> (business_model, location, likelihood, impact,
+    plans), where likelihood and impact are arrays over the slots (0 for a
+    risk left unrated) and plans the mitigation plan texts. Raises
+    SubmissionError listing every problem found in the record.
+    """
+    risks = [(section, item['risk']) for section, items in template['risk_assessment'].items()
+             if isinstance(items, list) for item in items]
+    slot_index = {(section, risk): i for i, (section, risk) in enumerate(risks)}
+    sections = {section for section, _ in risks}
+    valid_ratings = set(range(1, scale + 1))
+
+    def location_label(location):
+        if isinstance(location, dict) and isinstance(location.get('lga'), str) and isinstance(location.get('state'), str):
+            location = f"{location['lga']}, {location['state']}"
+        if not isinstance(location, str) or not location.strip():
+            return None
+        return re.sub(r'\s+', ' ', location.strip())
+
+    def validate(record):
+        errors = []
+        if not isinstance(record, dict):
+            raise SubmissionError(["submission is not a JSON object"])
+        business_model = record.get('business_model')
+        if not isinstance(business_model, str) or not business_model.strip():
+            errors.append("business_model must be a non-empty string")
+        location = location_label(record.get('location'))
+        if location is None:
+            errors.append('location must be "LGA, State" or {"lga": ..., "state": ...}')
+
+        likelihood = np.zeros(len(risks), dtype=np.int8)
+        impact = np.zeros(len(risks), dtype=np.int8)
+        plans = [''] * len(risks)
+        assessment = record.get('risk_assessment')
+        if not isinstance(assessment, dict):
+            errors.append("risk_assessment must be an object")
+            assessment = {}
+        for section, items in assessment.items():
+            if section == 'instructions':
+                continue
+            if section not in sections or not isinstance(items, list):
+                errors.append(f"unknown risk section '{section}'")
+                continue
+            for item in items:
+                risk = item.get('risk') if isinstance(item, dict) else None
+                if not isinstance(risk, str):
+                    errors.append(f"risk in {section} must be an object with a string 'risk': {item!r:.80}")
+                    continue
+                slot = slot_index.get((section, risk))
+                if slot is None:
+                    errors.append(f"unknown risk in {section}: {item!r:.80}")
+                    continue
+                rating = (item.get('likelihood'), item.get('impact'))
+                if rating == (0, 0):
+                    continue    # left blank, as in the template
+                if not all(type(value) is int and value in valid_ratings for value in rating):
+                    errors.append(f"{item['risk']}: likelihood and impact must be integers 1-{scale}")
+                    continue
+                likelihood[slot], impact[slot] = rating
+                plan = item.get('mitigation_plan', '')
+                plans[slot] = plan if isinstance(plan, str) else ''
+        if not errors and not likelihood.any():
+            errors.append("no risks rated")
+        if errors:
+            raise SubmissionError(errors)
+        return business_model.strip(), location, likelihood, impact, plans
+
+    return risks, validate
+
+
+def read_batches(paths, batch_size=BATCH_SIZE):
+    """(path, line number, text) batches from JSON Lines files, skipping blank lines"""
+    batch = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, start=1):
+                if line.strip():
+                    batch.append((path, number, line))
+                    if len(batch) == batch_size:
+                        yield batch
+                        batch = []
+    if batch:
+        yield batch
+
+
+class RiskAssessmentScorer:
+    """Streaming aggregation of filled risk assessment templates"""
+
+    def __init__(self, template, output_dir=OUTPUT_DIR, checkpoint_every=CHECKPOINT_EVERY, plots=True,
+                 scale=RATING_SCALE):
+        self.risks, self.validate = compile_schema(template, scale)
+        self.scale = scale
+        self.output_dir = output_dir
+        self.heatmap_dir = os.path.join(output_dir, 'lga_heatmaps')
+        self.checkpoint_every = checkpoint_every
+        self.plots = plots
+        self.matcher = KeywordMatcher(mitigation_keywords)
+        self.approaches = self.matcher.labels
+
+        # Accumulators grow with the number of locations, not submissions
+        self.lga_codes = {}
+        self.group_codes = {}
+        self.lga_matrices = np.zeros((0, scale, scale), dtype=np.int64)
+        self.group_submissions = np.zeros(0, dtype=np.int64)
+        self.group_counts = np.zeros((0, len(self.risks)), dtype=np.int64)
+        self.group_likelihood = np.zeros((0, len(self.risks)))
+        self.group_impact = np.zeros((0, len(self.risks)))
+        self.group_score = np.zeros((0, len(self.risks)))
+        self.group_approach_score = np.zeros((0, len(self.approaches)))
+        self.group_approach_plans = np.zeros((0, len(self.approaches)), dtype=np.int64)
+        self.dirty_lgas = set()
+        self.accepted = 0
+        self.rejected = 0
+        self._since_checkpoint = 0
+
+    @staticmethod
+    def _codes(labels, codes):
+        return np.array([codes.setdefault(label, len(codes)) for label in labels], dtype=np.int64)
+
+    @staticmethod
+    def _grow(array, size):
+        # Capacity doubles, so adding locations one batch at a time stays linear overall
+        if len(array) >= size:
+            return array
+        grown = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _fold(self, records):
+        """Add a batch of validated submissions to the accumulators"""
+        business_models, locations, likelihood, impact, plans = zip(*records)
+        likelihood, impact = np.array(likelihood), np.array(impact)
+        rated = likelihood > 0
+        score = likelihood.astype(float) * impact
+
+        lga = self._codes(locations, self.lga_codes)
+        group = self._codes(zip(business_models, locations), self.group_codes)
+        self.lga_matrices = self._grow(self.lga_matrices, len(self.lga_codes))
+        for name in ('group_submissions', 'group_counts', 'group_likelihood', 'group_impact',
+                     'group_score', 'group_approach_score', 'group_approach_plans'):
+            setattr(self, name, self._grow(getattr(self, name), len(self.group_codes)))
+
+        rows, slots = np.nonzero(rated)
+        np.add.at(self.lga_matrices, (lga[rows], likelihood[rows, slots] - 1, impact[rows, slots] - 1), 1)
+        np.add.at(self.group_submissions, group, 1)
+        np.add.at(self.group_counts, group, rated)
+        np.add.at(self.group_likelihood, group, likelihood)
+        np.add.at(self.group_impact, group, impact)
+        np.add.at(self.group_score, group, score)
+
+        # Approaches named in each rated risk's plan, weighted by that risk's score
+        masks = self.matcher.masks([plan for row_plans in plans for plan in row_plans]).reshape(rated.shape)
+        found = (masks[..., np.newaxis] >> np.arange(len(self.approaches))) & 1
+        np.add.at(self.group_approach_score, group, (found * score[..., np.newaxis]).sum(axis=1))
+        np.add.at(self.group_approach_plans, group, found.sum(axis=1))
+        self.dirty_lgas.update(np.unique(lga).tolist())
+
+    def process(self, paths, batch_size=BATCH_SIZE):
+        """Score every submission in the JSON Lines files; returns the number accepted"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, 'rejected_submissions.jsonl'), 'w', encoding='utf-8') as rejects:
+            for batch in read_batches(paths, batch_size):
+                records = []
+                for path, number, line in batch:
+                    try:
+                        records.append(self.validate(json.loads(line)))
+                    except json.JSONDecodeError as error:
+                        errors = [f"invalid JSON: {error}"]
+                    except SubmissionError as error:
+                        errors = error.args[0]
+                    except Exception as error:  # a record validate() did not anticipate; reject it, keep streaming
+                        errors = [f"invalid submission: {type(error).__name__}: {error}"]
+                    else:
+                        continue
+                    self.rejected += 1
+                    rejects.write(json.dumps({'file': path, 'line': number, 'errors': errors}) + '\n')
+                if records:
+                    self._fold(records)
+                    self.accepted += len(records)
+                    self._since_checkpoint += len(records)
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self.checkpoint()
+        self.checkpoint()
+        self.rankings()
+        return self.accepted
+
+    def _write_csv(self, df, name):
+        # Written to a temporary file and swapped in, so readers never see a partial file
+        path = os.path.join(self.output_dir, name)
+        df.to_csv(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+    def lga_matrix_table(self):
+        """Long-form likelihood x impact counts per LGA"""
+        lgas = np.array(list(self.lga_codes), dtype=object)
+        l, i, m = np.meshgrid(np.arange(self.scale), np.arange(self.scale), np.arange(len(lgas)), indexing='ij')
+        counts = self.lga_matrices[m, l, i].ravel()
+        table = pd.DataFrame({
+            'LGA': lgas[m.ravel()],
+            'Likelihood': l.ravel() + 1,
+            'Impact': i.ravel() + 1,
+            'Risk Ratings': counts
+        })
+        return table[table['Risk Ratings'] > 0].sort_values(['LGA', 'Likelihood', 'Impact'])
+
+    def checkpoint(self):
+        """Write the LGA matrices and re-render heat maps of LGAs changed since the last checkpoint"""
+        self._write_csv(self.lga_matrix_table(), 'lga_risk_matrices.csv')
+        if self.plots:
+            os.makedirs(self.heatmap_dir, exist_ok=True)
+            lgas = list(self.lga_codes)
+            for code in sorted(self.dirty_lgas):
+                self.plot_lga_heatmap(lgas[code], self.lga_matrices[code])
+        self.dirty_lgas.clear()
+        self._since_checkpoint = 0
+
+    def plot_lga_heatmap(self, lga, matrix):
+        fig, ax = plt.subplots(figsize=(7, 6))
+        im = ax.imshow(matrix, cmap='YlOrRd', origin='lower')
+        ticks = np.arange(self.scale)
+        ax.set_xticks(ticks)
+        ax.set_yticks(ticks)
+        ax.set_xticklabels(ticks + 1)
+        ax.set_yticklabels(ticks + 1)
+        for (row, column), count in np.ndenumerate(matrix):
+            ax.text(column, row, count, ha='center', va='center',
+                    color='white' if im.norm(count) > 0.5 else 'black', fontsize=9)
+        ax.set_xlabel('Impact')
+        ax.set_ylabel('Likelihood')
+        ax.set_title(f'Risk Ratings: {lga}')
+        fig.colorbar(im, ax=ax, label='Risk Ratings')
+        fig.tight_layout()
+        fig.savefig(os.path.join(self.heatmap_dir, re.sub(r'[^\w-]+', '_', lga).strip('_') + '.png'), dpi=150)
+        plt.close(fig)
+
+    def rankings(self):
+        """Write and return (risk rankings, mitigation approach rankings) per business model and location"""
+        groups = pd.DataFrame(list(self.group_codes), columns=['Business Model', 'Location'])
+        n = len(groups)
+        counts = self.group_counts[:n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_likelihood = self.group_likelihood[:n] / counts
+            mean_impact = self.group_impact[:n] / counts
+            mean_score = self.group_score[:n] / counts
+
+        g, r = np.nonzero(counts)
+        risk_df = pd.DataFrame({
+            'Business Model': groups['Business Model'].to_numpy()[g],
+            'Location': groups['Location'].to_numpy()[g],
+            'Submissions': self.group_submissions[g],
+            'Risk': [self.risks[slot][1] for slot in r],
+            'Section': [self.risks[slot][0] for slot in r],
+            'Ratings': counts[g, r],
+            'Mean Likelihood': mean_likelihood[g, r],
+            'Mean Impact': mean_impact[g, r],
+            'Mean Risk Score': mean_score[g, r]
+        }).sort_values(['Business Model', 'Location', 'Mean Risk Score'], ascending=[True, True, False])
+        risk_df.insert(2, 'Rank', risk_df.groupby(['Business Model', 'Location']).cumcount() + 1)
+
+        g, a = np.nonzero(self.group_approach_plans[:n])
+        approach_df = pd.DataFrame({
+            'Business Model': groups['Business Model'].to_numpy()[g],
+            'Location': groups['Location'].to_numpy()[g],
+            'Mitigation Approach': np.asarray(self.approaches)[a],
+            'Plans': self.group_approach_plans[g, a],
+            'Risk Score Addressed': self.group_approach_score[g, a]
+        }).sort_values(['Business Model', 'Location', 'Risk Score Addressed'], ascending=[True, True, False])
+        approach_df.insert(2, 'Rank', approach_df.groupby(['Business Model', 'Location']).cumcount() + 1)
+
+        self._write_csv(risk_df, 'risk_rankings.csv')
+        self._write_csv(approach_df, 'mitigation_rankings.csv')
+        return risk_df, approach_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score filled risk mitigation planning templates (JSON Lines)")
+    parser.add_argument('paths', nargs='+', help="JSON Lines files of filled templates")
+    parser.add_argument('--output', default=OUTPUT_DIR)
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY,
+                        help="Write LGA matrices and heat maps after this many accepted submissions")
+    parser.add_argument('--no-plots', action='store_true', help="Skip the per-LGA heat map images")
+    args = parser.parse_args()
+
+    with open(TEMPLATE_PATH, encoding='utf-8') as f:
+        template = json.load(f)
+    scorer = RiskAssessmentScorer(template, args.output, args.checkpoint_every, plots=not args.no_plots)
+    scorer.process(args.paths)
+    print(f"Scored {scorer.accepted:,} submissions ({scorer.rejected:,} rejected) "
+          f"across {len(scorer.lga_codes):,} LGAs -> {args.output}")
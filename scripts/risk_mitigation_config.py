@@ -0,0 +1,20 @@
+"""
+YouthHarvest Project: mitigation approach keywords
+
+Keywords that identify each mitigation approach in free-text mitigation
+strategies and risk logs. Kept in their own module so the keyword matcher can
+classify new texts without re-running the risk mitigation strategy script.
+"""
+
+mitigation_keywords = {
+    "Participatory Design": ["participatory", "user input", "co-creation", "collaborative design"],
+    "Capacity Building": ["training", "skills", "capacity", "knowledge"],
+    "Technology Adaptation": ["adapt", "flexible", "modular", "resilient design"],
+    "Financial Innovation": ["financing", "leasing", "pay-as-you", "credit", "loans"],
+    "Market Linkages": ["market", "linkage", "buyer", "contract", "aggregation"],
+    "Digital Solutions": ["digital", "mobile", "app", "online", "software"],
+    "Partnership Models": ["partnership", "collaboration", "cooperative", "collective"],
+    "Diversification": ["diversif", "multiple crops", "variety", "portfolio"],
+    "Policy Engagement": ["policy", "advocacy", "regulatory", "compliance"],
+    "Resource Efficiency": ["efficient", "conservation", "renewable", "sustainable"]
+}
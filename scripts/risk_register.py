@@ -0,0 +1,154 @@
+"""
+YouthHarvest Project: risk register helpers
+
+Shared by the risk scripts, which now run over per-business and per-location
+registers of tens of thousands of risks as well as the 18-risk register:
+
+  - the register is saved as CSV (list columns such as root causes and
+    mitigation strategies joined with "; ") and, when pyarrow is installed,
+    as Parquet next to it with real list<string> columns. The loader prefers
+    the Parquet file and returns the list columns as Arrow-backed lists, so
+    counts are O(n) array operations with no string splitting; from CSV the
+    columns are split once into Python lists (an empty cell is an empty list)
+  - risks are drawn with a single scatter call; once there are more than
+    MAX_LABELLED_POINTS the plot switches to density mode instead of labelling
+    every point: one marker per position sized by the number of risks there
+    (the register's scores are small integers), or a hexbin when positions are
+    too many to label either
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # without pyarrow the register is stored and read as CSV only
+    pa = None
+
+LIST_COLUMNS = ['affected_interventions', 'root_causes', 'mitigation_strategies', 'monitoring_indicators']
+LIST_SEPARATOR = '; '
+SCORE_MAP = {"Low": 1, "Medium": 2, "High": 3}
+MAX_LABELLED_POINTS = 50
+HEXBIN_GRIDSIZE = 30
+
+
+def _is_arrow_list(values):
+    return isinstance(values.dtype, pd.ArrowDtype) and pa.types.is_list(values.dtype.pyarrow_dtype)
+
+
+def parquet_path(path):
+    """Parquet file stored next to a register CSV"""
+    return os.path.splitext(path)[0] + '.parquet'
+
+
+def split_list_columns(risk_df, columns=LIST_COLUMNS, separator=LIST_SEPARATOR):
+    """
+    Parse "; "-joined list columns into list-typed columns (in place); returns
+    risk_df. Empty or missing cells are empty lists, as join_list_columns
+    writes them.
+    """
+    for column in columns:
+        if column in risk_df and pd.api.types.infer_dtype(risk_df[column], skipna=True) == 'string':
+            risk_df[column] = [text.split(separator) if isinstance(text, str) and text else []
+                               for text in risk_df[column]]
+    return risk_df
+
+
+def join_list_columns(risk_df, columns=LIST_COLUMNS, separator=LIST_SEPARATOR):
+    """Copy of risk_df with list columns joined into "; "-separated strings, as in the CSV"""
+    risk_df = risk_df.copy()
+    for column in columns:
+        if column in risk_df and pd.api.types.infer_dtype(risk_df[column], skipna=True) != 'string':
+            risk_df[column] = risk_df[column].map(
+                lambda items: separator.join(items) if isinstance(items, (list, tuple, np.ndarray)) else items)
+    return risk_df
+
+
+def save_risk_register(risk_df, path, columns=LIST_COLUMNS):
+    """
+    Write the register to CSV at `path` and, with pyarrow, to Parquet next to
+    it with list<string> columns. Each file is written to a temporary file
+    and swapped in, so readers never see a partial register.
+    """
+    risk_df = split_list_columns(risk_df.copy(), columns)
+    join_list_columns(risk_df, columns).to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    if pa is not None:
+        schema = pa.Schema.from_pandas(risk_df, preserve_index=False)
+        for column in columns:
+            if column in risk_df:
+                schema = schema.set(schema.get_field_index(column), pa.field(column, pa.list_(pa.string())))
+        table = pa.Table.from_pandas(risk_df, schema=schema, preserve_index=False)
+        pq.write_table(table, parquet_path(path) + '.tmp')
+        os.replace(parquet_path(path) + '.tmp', parquet_path(path))
+
+
+def read_risk_register(path, columns=LIST_COLUMNS):
+    """
+    Register with list-typed list columns: Arrow lists from the Parquet copy
+    when pyarrow is installed and the copy is at least as new as the CSV,
+    Python lists split from the CSV otherwise.
+    """
+    parquet = parquet_path(path)
+    if pa is not None and os.path.exists(parquet) and (
+            not os.path.exists(path) or os.path.getmtime(parquet) >= os.path.getmtime(path)):
+        # Only the list columns become Arrow-backed; the rest load as usual
+        return pq.read_table(parquet).to_pandas(
+            types_mapper=lambda arrow_type: pd.ArrowDtype(arrow_type) if pa.types.is_list(arrow_type) else None)
+    return split_list_columns(pd.read_csv(path), columns)
+
+
+def count_items(values):
+    """Number of items in each entry of a list-typed column (0 where missing)"""
+    if pa is not None and _is_arrow_list(values):
+        return values.list.len().fillna(0).astype(int)
+    return values.str.len().fillna(0).astype(int)
+
+
+def load_risk_register(path):
+    """Risk register with list-typed list columns and likelihood/impact scores"""
+    risk_df = read_risk_register(path)
+    risk_df['likelihood_score'] = risk_df['likelihood'].map(SCORE_MAP)
+    risk_df['impact_score'] = risk_df['impact'].map(SCORE_MAP)
+    return risk_df
+
+
+def scatter_risks(ax, x, y, values, labels=None, max_labels=MAX_LABELLED_POINTS, annotate=None,
+                  cmap='YlOrRd', vmin=None, vmax=None, s=100, gridsize=HEXBIN_GRIDSIZE, **kwargs):
+    """
+    Plot risks at (x, y) coloured by `values`; returns the mappable for a colorbar.
+
+    Up to `max_labels` points are drawn with one scatter call and labelled by
+    calling annotate(ax, label, x, y) (or a small offset label by default).
+    Beyond that, risks at the same position are merged into one marker sized
+    by their number, coloured by their mean value and labelled with the count;
+    if even the positions are too many to label, a hexbin of mean values is
+    drawn instead.
+    """
+    x, y, values = (np.asarray(v, dtype=float) for v in (x, y, values))
+    if len(x) <= max_labels:
+        points = ax.scatter(x, y, c=values, s=s, cmap=cmap, vmin=vmin, vmax=vmax, **kwargs)
+        if labels is not None:
+            for label, px, py in zip(labels, x, y):
+                if annotate is not None:
+                    annotate(ax, label, px, py)
+                else:
+                    ax.annotate(label, (px, py), xytext=(5, 5), textcoords="offset points", fontsize=8)
+        return points
+
+    positions = pd.DataFrame({'x': x, 'y': y, 'value': values}).groupby(['x', 'y'], sort=False)['value'].agg(
+        ['size', 'mean']).reset_index()
+    if len(positions) > max_labels:
+        return ax.hexbin(x, y, C=values, reduce_C_function=np.mean, gridsize=gridsize, mincnt=1,
+                         cmap=cmap, vmin=vmin, vmax=vmax)
+
+    # Marker area grows with the number of risks, up to 4 * s for the densest position
+    sizes = s * (1 + 3 * positions['size'] / positions['size'].max())
+    points = ax.scatter(positions['x'], positions['y'], c=positions['mean'], s=sizes, cmap=cmap,
+                        vmin=vmin, vmax=vmax, **kwargs)
+    for count, px, py in zip(positions['size'], positions['x'], positions['y']):
+        ax.annotate(f'{count:,}', (px, py), ha='center', va='center', fontsize=8, fontweight='bold')
+    return points
@@ -0,0 +1,242 @@
+"""
+YouthHarvest Project: Monte Carlo loss exposure from the risk register
+
+The comprehensive risk register scores each risk 1-3 for likelihood and
+impact. This engine turns those scores into money for each youth business
+model over the 5-year horizon:
+
+  - each risk is an event that occurs in a year with the probability implied
+    by its likelihood (LIKELIHOOD_PROBABILITY)
+  - an occurrence costs a lognormal share of the business model's initial
+    investment, with the median implied by its impact (IMPACT_SEVERITY)
+  - occurrences are correlated through a Gaussian copula: each risk's latent
+    normal loads on a factor for its category, and the category factors are
+    correlated (CATEGORY_CORRELATION), so a bad market year makes financial
+    trouble more likely
+  - a business model bears the risks whose affected interventions mention it
+    (BUSINESS_MODEL_EXPOSURE, matched with the mitigation keyword matcher)
+
+Trials are simulated in vectorised chunks across a process pool, each chunk
+with its own child of a single SeedSequence as in monte_carlo_engine.py, and
+summarised into QuantileSketch objects, so memory stays bounded for millions
+of trials. Results are value-at-risk and expected shortfall of the 5-year
+loss per business model, and the expected loss each risk contributes.
+
+Run this module directly to write the results next to the risk register.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordMatcher
+from quantile_sketch import QuantileSketch
+
+RISK_REGISTER = 'results/interventions/risks/comprehensive_risk_register.csv'
+BUSINESS_MODELS = 'results/youth_opportunities/business_model_comparison_tool.json'
+OUTPUT_DIR = 'results/interventions/risks'
+
+DEFAULT_TRIALS = 1_000_000
+DEFAULT_CHUNK_SIZE = 50_000
+HORIZON_YEARS = 5
+CONFIDENCE_LEVELS = (0.95, 0.99)
+
+# Annual probability of occurrence for each likelihood rating
+LIKELIHOOD_PROBABILITY = {'Low': 0.05, 'Medium': 0.15, 'High': 0.30}
+# Median cost of one occurrence as a share of the initial investment, for each impact rating
+IMPACT_SEVERITY = {'Low': 0.01, 'Medium': 0.03, 'High': 0.08}
+SEVERITY_SIGMA = 0.75            # lognormal sigma of the cost of an occurrence
+WITHIN_CATEGORY_LOADING = 0.6    # share of a risk's latent variance from its category factor
+
+# Correlation between category factors; pairs not listed use the default
+DEFAULT_CATEGORY_CORRELATION = 0.2
+CATEGORY_CORRELATION = {
+    ('Financial Risks', 'Market Risks'): 0.5,
+    ('Environmental and Climate Risks', 'Market Risks'): 0.4,
+    ('Environmental and Climate Risks', 'Financial Risks'): 0.3,
+    ('Implementation Risks', 'Financial Risks'): 0.3,
+    ('Policy and Regulatory Risks', 'Financial Risks'): 0.3
+}
+
+# Terms in a risk's affected interventions that expose each business model to it
+BUSINESS_MODEL_EXPOSURE = {
+    'BM-01': ['processing', 'mobile services', 'service-based', 'field-based', 'transport', 'youth-led'],
+    'BM-02': ['aggregation', 'storage', 'quality testing', 'collective marketing', 'cooperative',
+              'long-term investments', 'youth-led'],
+    'BM-03': ['drying', 'service-based', 'field-based', 'shared facilities', 'subsidized services', 'youth-led']
+}
+
+
+def parse_naira_range(text):
+    """Midpoint of a range such as 'N955,000 - N1,625,000'"""
+    amounts = [float(amount.replace(',', '')) for amount in re.findall(r'\d[\d,]*(?:\.\d+)?', text)]
+    if not amounts:
+        raise ValueError(f"No amount in '{text}'")
+    return sum(amounts) / len(amounts)
+
+
+def load_business_models(path=BUSINESS_MODELS):
+    """Business models with their initial investment (midpoint of the range, Naira)"""
+    with open(path, encoding='utf-8') as f:
+        models = json.load(f)['models']
+    return pd.DataFrame({
+        'model_id': [model['model_id'] for model in models],
+        'model_name': [model['model_name'] for model in models],
+        'investment': [parse_naira_range(model['investment_range']) for model in models]
+    })
+
+
+def category_correlation(categories, overrides=CATEGORY_CORRELATION, default=DEFAULT_CATEGORY_CORRELATION):
+    """Correlation matrix of the category factors"""
+    matrix = np.full((len(categories), len(categories)), default)
+    np.fill_diagonal(matrix, 1.0)
+    position = {category: i for i, category in enumerate(categories)}
+    for (a, b), rho in overrides.items():
+        if a in position and b in position:
+            matrix[position[a], position[b]] = matrix[position[b], position[a]] = rho
+    return matrix
+
+
+def exposure_matrix(affected_interventions, models, exposure=BUSINESS_MODEL_EXPOSURE):
+    """
+    Risks x business models matrix, 1 where a model bears a risk. Every model
+    needs an exposure entry: a model without one would bear no risks and show
+    as risk-free.
+    """
+    unmapped = [model for model in models if not exposure.get(model)]
+    if unmapped:
+        raise ValueError(f"No BUSINESS_MODEL_EXPOSURE terms for business models {unmapped}")
+    matcher = KeywordMatcher({model: exposure[model] for model in models})
+    return matcher.match_many(affected_interventions, workers=1).to_numpy(dtype=float)
+
+
+def build_model(register, business_models, within_loading=WITHIN_CATEGORY_LOADING,
+                severity_sigma=SEVERITY_SIGMA, horizon_years=HORIZON_YEARS):
+    """Simulation inputs from the risk register and the business models"""
+    unknown = (set(register['likelihood']) - set(LIKELIHOOD_PROBABILITY)) | (
+        set(register['impact']) - set(IMPACT_SEVERITY))
+    if unknown:
+        raise ValueError(f"Unknown likelihood or impact ratings in the risk register: {sorted(unknown)}")
+
+    categories = list(dict.fromkeys(register['category']))
+    correlation = category_correlation(categories)
+    try:
+        factor_loadings = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("CATEGORY_CORRELATION does not give a valid correlation matrix") from None
+
+    probability = register['likelihood'].map(LIKELIHOOD_PROBABILITY).to_numpy(dtype=float)
+    return {
+        'category_index': register['category'].map({c: i for i, c in enumerate(categories)}).to_numpy(),
+        'factor_loadings': factor_loadings,
+        'within_loading': within_loading,
+        # A risk occurs when its latent standard normal falls below this threshold
+        'threshold': np.array([NormalDist().inv_cdf(p) for p in probability]),
+        'log_severity': np.log(register['impact'].map(IMPACT_SEVERITY).to_numpy(dtype=float)),
+        'severity_sigma': severity_sigma,
+        # Cost of an occurrence of each risk to each business model, per unit of severity
+        'exposure': exposure_matrix(register['affected_interventions'], business_models['model_id'])
+                    * business_models['investment'].to_numpy(dtype=float),
+        'horizon_years': horizon_years
+    }
+
+
+def simulate_chunk(seed, trials, model, relative_accuracy=0.005):
+    """
+    Sketch the horizon loss of every business model over one chunk of trials.
+
+    Returns the sketches and the summed loss each risk caused each model.
+    """
+    rng = np.random.default_rng(seed)
+    years = model['horizon_years']
+    risks = len(model['threshold'])
+    # Correlated category factors, then each risk's latent normal
+    factors = rng.standard_normal((trials, years, len(model['factor_loadings']))) @ model['factor_loadings'].T
+    latent = (np.sqrt(model['within_loading']) * factors[..., model['category_index']]
+              + np.sqrt(1 - model['within_loading']) * rng.standard_normal((trials, years, risks)))
+    occurred = latent < model['threshold']
+    severity = np.exp(model['log_severity'] + model['severity_sigma'] * rng.standard_normal((trials, years, risks)))
+    risk_losses = (occurred * severity).sum(axis=1)        # [trial, risk], summed over the horizon
+    losses = risk_losses @ model['exposure']               # [trial, business model]
+
+    sketches = []
+    for column in losses.T:
+        sketch = QuantileSketch(relative_accuracy)
+        sketch.add(column)
+        sketches.append(sketch)
+    contributions = risk_losses.sum(axis=0)[:, np.newaxis] * model['exposure']
+    return sketches, contributions
+
+
+def run_risk_simulation(register, business_models, trials=DEFAULT_TRIALS, chunk_size=DEFAULT_CHUNK_SIZE,
+                        workers=None, seed=42, confidence_levels=CONFIDENCE_LEVELS, relative_accuracy=0.005):
+    """
+    Monte Carlo loss exposure of each business model over the horizon.
+
+    Returns (summary, contributions): the summary has the expected loss and
+    the VaR and expected shortfall at each confidence level per business
+    model; contributions has the expected loss each risk causes each model.
+    """
+    model = build_model(register, business_models)
+    chunk_sizes = [chunk_size] * (trials // chunk_size)
+    if trials % chunk_size:
+        chunk_sizes.append(trials % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+    workers = workers or min(os.cpu_count() or 1, len(chunk_sizes))
+    totals = [QuantileSketch(relative_accuracy) for _ in range(len(business_models))]
+    contributions = np.zeros_like(model['exposure'])
+    accuracies = [relative_accuracy] * len(chunk_sizes)
+    if workers == 1:
+        results = (simulate_chunk(s, n, model, a) for s, n, a in zip(seeds, chunk_sizes, accuracies))
+        for sketches, chunk_contributions in results:
+            for total, sketch in zip(totals, sketches):
+                total.merge(sketch)
+            contributions += chunk_contributions
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for sketches, chunk_contributions in executor.map(
+                    simulate_chunk, seeds, chunk_sizes, [model] * len(chunk_sizes), accuracies):
+                for total, sketch in zip(totals, sketches):
+                    total.merge(sketch)
+                contributions += chunk_contributions
+
+    years = model['horizon_years']
+    investment = business_models['investment'].to_numpy(dtype=float)
+    summary = {
+        'Business Model ID': business_models['model_id'],
+        'Business Model': business_models['model_name'],
+        'Initial Investment (₦)': investment,
+        'Risks Exposed': (model['exposure'] > 0).sum(axis=0),
+        'Trials': [sketch.count for sketch in totals],
+        f'Expected {years}-Year Loss (₦)': [sketch.mean for sketch in totals]
+    }
+    for level in confidence_levels:
+        percent = f'{level * 100:g}'
+        summary[f'VaR {percent}% (₦)'] = [sketch.quantile(level) for sketch in totals]
+        summary[f'Expected Shortfall {percent}% (₦)'] = [sketch.tail_mean(level) for sketch in totals]
+    summary['P(Loss > Investment)'] = [1 - sketch.fraction_below(total) for sketch, total in zip(totals, investment)]
+
+    r, m = np.nonzero(model['exposure'])
+    contribution_df = pd.DataFrame({
+        'Business Model ID': business_models['model_id'].to_numpy()[m],
+        'Risk ID': register['risk_id'].to_numpy()[r],
+        'Risk': register['risk_name'].to_numpy()[r],
+        'Category': register['category'].to_numpy()[r],
+        f'Expected {years}-Year Loss (₦)': contributions[r, m] / trials
+    })
+    return pd.DataFrame(summary), contribution_df
+
+
+if __name__ == "__main__":
+    register = pd.read_csv(RISK_REGISTER)
+    summary_df, contribution_df = run_risk_simulation(register, load_business_models())
+    summary_df.to_csv(os.path.join(OUTPUT_DIR, 'risk_simulation_summary.csv'), index=False)
+    contribution_df.to_csv(os.path.join(OUTPUT_DIR, 'risk_loss_contributions.csv'), index=False)
+    print(summary_df.to_string(index=False))
+    print(f"Risk simulation results saved to '{OUTPUT_DIR}'")
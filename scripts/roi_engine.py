@@ -0,0 +1,219 @@
+"""
+YouthHarvest Project: array-based ROI engine
+
+Evaluates the intervention economics from economic_analysis.py for every
+intervention x crop x location x year combination at once. Intervention and
+crop parameters are held as NumPy structured arrays and broadcast against each
+other, so an LGA x crop run over several planning years is a handful of array
+operations instead of millions of Python-level loop iterations.
+
+Axes of every result array: [intervention, crop, location, year]. Locations and
+years are optional; pass per-location/per-year baseline losses or crop values
+with shape (crops, locations, years) to use them.
+
+Cases where the annual value never exceeds the operating cost (payback) or no
+tons are saved (cost per ton) are masked and reported as infinity, matching the
+original scalar calculations.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Working days per year for capacity-based interventions
+WORKING_DAYS = 250
+# Hectares per farmer for training programmes (no capacity)
+HECTARES_PER_FARMER = 2
+
+INTERVENTION_DTYPE = np.dtype([
+    ('name', 'U64'),
+    ('implementation_cost', 'i8'),
+    ('annual_operating_cost', 'i8'),
+    ('lifespan_years', 'i8'),
+    ('expected_loss_reduction', 'f8'),
+    ('capacity_tons', 'f8'),           # NaN when not capacity-based
+    ('beneficiaries_per_unit', 'i8')
+])
+
+CROP_DTYPE = np.dtype([
+    ('name', 'U64'),
+    ('value', 'f8'),                   # Naira per ton
+    ('baseline_loss', 'f8')            # tons lost per hectare
+])
+
+# Output columns of roi_analysis.csv, in order
+ROI_COLUMNS = [
+    'Intervention',
+    'Crop',
+    'Implementation Cost (₦)',
+    'Annual Operating Cost (₦)',
+    'Lifespan (years)',
+    'Expected Loss Reduction (%)',
+    'Potential Annual Reduction (tons)',
+    'Annual Value of Reduction (₦)',
+    'Total Cost over Lifespan (₦)',
+    'Total Benefit over Lifespan (₦)',
+    'ROI (%)',
+    'Payback Period (years)',
+    'Cost per Beneficiary (₦)',
+    'Cost per Ton Saved (₦)'
+]
+
+
+def interventions_to_array(interventions):
+    """Structured array from an interventions_economic style dict"""
+    records = np.zeros(len(interventions), dtype=INTERVENTION_DTYPE)
+    for i, (name, details) in enumerate(interventions.items()):
+        capacity = details['capacity_tons']
+        records[i] = (
+            name,
+            details['implementation_cost'],
+            details['annual_operating_cost'],
+            details['lifespan_years'],
+            details['expected_loss_reduction'],
+            np.nan if capacity is None else capacity,
+            details['beneficiaries_per_unit']
+        )
+    return records
+
+
+def crops_to_array(crop_values, baseline_losses):
+    """Structured array from the crop value and baseline loss dicts"""
+    records = np.zeros(len(crop_values), dtype=CROP_DTYPE)
+    for i, (name, value) in enumerate(crop_values.items()):
+        records[i] = (name, value, baseline_losses[name])
+    return records
+
+
+def applicability_mask(interventions, crops, intervention_crops=None):
+    """Boolean [intervention, crop] mask; `intervention_crops` restricts some interventions to listed crops"""
+    intervention_crops = intervention_crops or {}
+    mask = np.ones((len(interventions), len(crops)), dtype=bool)
+    for i, name in enumerate(interventions['name']):
+        if name in intervention_crops:
+            mask[i] = np.isin(crops['name'], intervention_crops[name])
+    return mask
+
+
+def evaluate_roi(interventions, crops, baseline_loss=None, crop_value=None):
+    """
+    ROI metrics for every intervention x crop x location x year.
+
+    `baseline_loss` and `crop_value` default to the crop records and may be
+    given per location and year with shape (crops, locations, years). Returns a
+    dict of arrays shaped [intervention, crop, location, year].
+    """
+    def crop_axis(values):
+        values = np.asarray(values, dtype=float)
+        return values.reshape(values.shape + (1,) * (3 - values.ndim))[np.newaxis]
+
+    def intervention_axis(field):
+        return interventions[field][:, np.newaxis, np.newaxis, np.newaxis]
+
+    results = roi_metrics(
+        implementation_cost=intervention_axis('implementation_cost'),
+        operating_cost=intervention_axis('annual_operating_cost'),
+        lifespan=intervention_axis('lifespan_years'),
+        loss_reduction=intervention_axis('expected_loss_reduction'),
+        capacity=intervention_axis('capacity_tons'),
+        beneficiaries=intervention_axis('beneficiaries_per_unit'),
+        loss=crop_axis(crops['baseline_loss'] if baseline_loss is None else baseline_loss),
+        value=crop_axis(crops['value'] if crop_value is None else crop_value)
+    )
+    shape = np.broadcast_shapes(*(array.shape for array in results.values()))
+    return {name: np.broadcast_to(array, shape) for name, array in results.items()}
+
+
+def roi_metrics(implementation_cost, operating_cost, lifespan, loss_reduction, capacity,
+                beneficiaries, loss, value):
+    """
+    The ROI formulas on plain arrays that broadcast together.
+
+    Used by evaluate_roi for the intervention x crop grid and directly by
+    sampling-based analyses that vary every parameter per draw.
+    """
+    # Capacity-based interventions save tons per working day; training saves per farmer hectare
+    potential_reduction = np.where(
+        np.isnan(capacity),
+        loss * loss_reduction * beneficiaries * HECTARES_PER_FARMER,
+        loss * loss_reduction * capacity * WORKING_DAYS
+    )
+    annual_value = potential_reduction * value
+    total_cost = implementation_cost + operating_cost * lifespan
+    total_benefit = annual_value * lifespan
+    roi = (total_benefit - total_cost) / total_cost * 100
+
+    net_annual = annual_value - operating_cost
+    pays_back = net_annual > 0
+    saves_tons = potential_reduction > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = np.where(pays_back, implementation_cost / net_annual, np.inf)
+        cost_per_ton = np.where(saves_tons, implementation_cost / potential_reduction, np.inf)
+
+    return {
+        'potential_reduction': potential_reduction,
+        'annual_value': annual_value,
+        'total_cost': total_cost,
+        'total_benefit': total_benefit,
+        'roi': roi,
+        'payback': payback,
+        'cost_per_beneficiary': implementation_cost / beneficiaries,
+        'cost_per_ton': cost_per_ton,
+        'pays_back': pays_back
+    }
+
+
+def roi_table(interventions, crops, results, mask=None, location=0, year=0):
+    """roi_analysis.csv rows for one location and year, skipping masked combinations"""
+    if mask is None:
+        mask = np.ones((len(interventions), len(crops)), dtype=bool)
+    i, c = np.nonzero(mask)
+    pick = (i, c, location, year)
+    selected = interventions[i]
+    return pd.DataFrame({
+        'Intervention': selected['name'],
+        'Crop': crops['name'][c],
+        'Implementation Cost (₦)': selected['implementation_cost'],
+        'Annual Operating Cost (₦)': selected['annual_operating_cost'],
+        'Lifespan (years)': selected['lifespan_years'],
+        'Expected Loss Reduction (%)': selected['expected_loss_reduction'] * 100,
+        'Potential Annual Reduction (tons)': results['potential_reduction'][pick],
+        'Annual Value of Reduction (₦)': results['annual_value'][pick],
+        'Total Cost over Lifespan (₦)': results['total_cost'][pick],
+        'Total Benefit over Lifespan (₦)': results['total_benefit'][pick],
+        'ROI (%)': results['roi'][pick],
+        'Payback Period (years)': results['payback'][pick],
+        'Cost per Beneficiary (₦)': results['cost_per_beneficiary'][pick],
+        'Cost per Ton Saved (₦)': results['cost_per_ton'][pick]
+    }, columns=ROI_COLUMNS)
+
+
+def scale_up_roi(interventions, beneficiary_pool, coverage, efficiency, cost_overrun,
+                 crop_value, baseline_loss, years=5):
+    """
+    Multi-year ROI (%) of scaling interventions up, as in the scale-up scenarios.
+
+    All arguments after `interventions` broadcast against an intervention axis
+    appended last, e.g. shape (draws, 1) for scenario parameters shared by all
+    interventions or (draws, interventions) for per-intervention crop values.
+    """
+    implementation_cost = interventions['implementation_cost']
+    operating_cost = interventions['annual_operating_cost']
+    loss_reduction = interventions['expected_loss_reduction']
+    capacity = interventions['capacity_tons']
+
+    beneficiaries = beneficiary_pool * coverage
+    units_needed = beneficiaries / interventions['beneficiaries_per_unit']
+    total_implementation_cost = units_needed * implementation_cost * cost_overrun
+    annual_operating_cost = units_needed * operating_cost * cost_overrun
+
+    achieved = baseline_loss * loss_reduction * efficiency
+    annual_reduction = np.where(
+        np.isnan(capacity),
+        achieved * beneficiaries * HECTARES_PER_FARMER,
+        achieved * np.nan_to_num(capacity) * WORKING_DAYS * units_needed
+    )
+    annual_value = annual_reduction * crop_value
+
+    total_cost = total_implementation_cost + annual_operating_cost * years
+    total_benefit = annual_value * years
+    return (total_benefit - total_cost) / total_cost * 100
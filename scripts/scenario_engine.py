@@ -0,0 +1,245 @@
+"""
+YouthHarvest Dashboard: what-if scenario engine
+
+Answers questions such as "if Kano moves 30% of storage from 'Bags in house'
+to 'Improved structure', what is the naira impact?" against the dashboard base
+table (one row per state x crop x value chain stage).
+
+The base table has no method breakdown, so every row starts from a uniform mix
+over the methods of its stage. A scenario is a list of edits that shift volume
+between methods; only the rows an edit touches are re-scored. A row's new loss
+is its dashboard loss scaled by the ratio of the mix-weighted loss rates after
+and before the edit, so an empty scenario reproduces the dashboard exactly.
+
+Loss rates come from the trained PHL model (phl_prediction_model.joblib) when
+it is available, averaged over the wet and dry seasons, and otherwise from the
+analytic influence factors the model was trained on. Rates are memoized per
+(state, crop, stage, method), and missing ones are predicted in one batch, so
+repeated scenarios only pay for the arithmetic. Naira changes are valued at
+each state's crop price from the price store.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from phl_model_config import (ENCODERS_PATH, MODEL_FEATURES, MODEL_PATH, base_loss_rates,
+                              influence_factors, params, stage_method_params)
+
+# Typical storage duration and transport distance used when scoring a method
+TYPICAL_STORAGE_DAYS = 90
+TYPICAL_DISTANCE_KM = 100
+
+
+class ScenarioError(ValueError):
+    """Raised for scenario edits that do not match the base table"""
+
+
+def stage_methods(stage):
+    """Methods available at a value chain stage"""
+    return params[stage_method_params[stage]]
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class ScenarioEngine:
+    """Applies method-mix edits to the dashboard base table and re-scores the affected rows"""
+
+    def __init__(self, df, prices, model_path=MODEL_PATH, encoders_path=ENCODERS_PATH):
+        self.prices = prices
+        self.model_path = model_path
+        self.encoders_path = encoders_path
+        self._lock = threading.Lock()
+        self._rates = {}
+        self.counters = {'rate_hits': 0, 'rate_misses': 0, 'scenarios': 0}
+        self._model_signature = None
+        self.model = None
+        self.encoders = None
+        self.load(df)
+        self.load_model()
+
+    def load(self, df):
+        """Use a new version of the dashboard base table"""
+        base = df[['state', 'geopolitical_zone', 'crop', 'value_chain_stage', 'loss_tons']].copy()
+        unknown = {crop for crop in base['crop'].unique() if crop not in self.prices}
+        if unknown:
+            raise ScenarioError(f"No price for crops: {sorted(unknown)}")
+        with self._lock:
+            self.base = base
+            self.zones = dict(zip(base['state'], base['geopolitical_zone']))
+
+    def load_model(self):
+        """(Re)load the PHL model if its file changed; falls back to the analytic factors"""
+        signature = (_file_signature(self.model_path), _file_signature(self.encoders_path))
+        if signature == self._model_signature:
+            return False
+        model = encoders = None
+        if all(signature):
+            import joblib
+            model = joblib.load(self.model_path)
+            encoders = joblib.load(self.encoders_path)
+        with self._lock:
+            self.model, self.encoders = model, encoders
+            self._model_signature = signature
+            self._rates.clear()
+        return True
+
+    @property
+    def rate_source(self):
+        return 'phl_prediction_model' if self.model is not None else 'influence_factors'
+
+    def _analytic_rate(self, zone, crop, stage, method):
+        """Stage loss percentage from the influence factors, averaged over seasons"""
+        stage_factors = influence_factors['value_chain_stages'][stage]
+        adjustment = stage_factors['methods'][method]
+        adjustment += TYPICAL_STORAGE_DAYS * stage_factors.get('duration_factor', 0)
+        adjustment += TYPICAL_DISTANCE_KM * stage_factors.get('distance_factor', 0)
+        seasonal = np.mean([
+            1 + influence_factors['geopolitical_zones'][zone] + season_factor
+            for season_factor in influence_factors['seasons'].values()
+        ])
+        return base_loss_rates[crop] * stage_factors['influence'] * (1 + adjustment) * seasonal
+
+    def _predict_rates(self, keys):
+        """Stage loss percentages for (state, crop, stage, method) keys, in one model call"""
+        if self.model is None:
+            return [self._analytic_rate(self.zones[state], crop, stage, method)
+                    for state, crop, stage, method in keys]
+
+        seasons = params['seasons']
+        rows = []
+        for state, crop, stage, method in keys:
+            for season in seasons:
+                rows.append({
+                    'crop': crop,
+                    'geopolitical_zone': self.zones[state],
+                    'season': season,
+                    'value_chain_stage': stage,
+                    'method': method,
+                    'transportation_distance_km': TYPICAL_DISTANCE_KM if stage == 'Transportation' else 0,
+                    'storage_duration_days': TYPICAL_STORAGE_DAYS if stage == 'Storage' else 0,
+                    'base_loss_rate': base_loss_rates[crop]
+                })
+        features = pd.DataFrame(rows)
+        for col, encoder in self.encoders.items():
+            features[col + '_encoded'] = encoder.transform(features[col])
+        predictions = self.model.predict(features[MODEL_FEATURES])
+        return predictions.reshape(len(keys), len(seasons)).mean(axis=1).tolist()
+
+    def loss_rates(self, keys):
+        """Memoized loss rates for a list of (state, crop, stage, method) keys"""
+        with self._lock:
+            missing = [key for key in dict.fromkeys(keys) if key not in self._rates]
+            self.counters['rate_hits'] += len(keys) - len(missing)
+            self.counters['rate_misses'] += len(missing)
+        if missing:
+            rates = self._predict_rates(missing)
+            with self._lock:
+                self._rates.update(zip(missing, rates))
+        with self._lock:
+            return [self._rates[key] for key in keys]
+
+    def _validate(self, edit):
+        if not isinstance(edit, dict):
+            raise ScenarioError(f"Each edit must be an object, got {edit!r:.80}")
+        for field in ('state', 'stage', 'crop', 'from_method', 'to_method'):
+            if field in edit and not (isinstance(edit[field], str) or (field == 'crop' and edit[field] is None)):
+                raise ScenarioError(f"'{field}' must be a string")
+        state, stage = edit.get('state'), edit.get('stage')
+        if state not in self.zones:
+            raise ScenarioError(f"Unknown state '{state}'")
+        if stage not in stage_method_params:
+            raise ScenarioError(f"Unknown value chain stage '{stage}'")
+        crop = edit.get('crop')
+        if crop is not None and crop not in self.prices:
+            raise ScenarioError(f"Unknown crop '{crop}'")
+        methods = stage_methods(stage)
+        for field in ('from_method', 'to_method'):
+            if edit.get(field) not in methods:
+                raise ScenarioError(f"Unknown {stage} method '{edit.get(field)}' (expected one of {methods})")
+        share = edit.get('share')
+        if isinstance(share, bool) or not isinstance(share, (int, float)) or not 0 <= share <= 1:
+            raise ScenarioError("'share' must be a fraction between 0 and 1")
+        return state, crop, stage, edit['from_method'], edit['to_method'], float(share)
+
+    def run(self, edits):
+        """
+        Apply method-mix edits and return the change in losses.
+
+        Each edit is {"state", "stage", "from_method", "to_method", "share"}
+        with an optional "crop" (all crops when omitted); `share` is the
+        fraction of the source method's current volume that moves to the
+        target method. Edits are applied in order.
+        """
+        parsed = [self._validate(edit) for edit in edits]
+
+        with self._lock:
+            base = self.base
+        mixes = {}
+        for state, crop, stage, from_method, to_method, share in parsed:
+            rows = base[(base['state'] == state) & (base['value_chain_stage'] == stage)]
+            if crop is not None:
+                rows = rows[rows['crop'] == crop]
+            methods = stage_methods(stage)
+            for index in rows.index:
+                mix = mixes.setdefault(index, dict.fromkeys(methods, 1 / len(methods)))
+                moved = share * mix[from_method]
+                mix[from_method] -= moved
+                mix[to_method] += moved
+
+        affected = base.loc[list(mixes)]
+        keys = []
+        for index, row in affected.iterrows():
+            keys.extend((row['state'], row['crop'], row['value_chain_stage'], method) for method in mixes[index])
+        rates = iter(self.loss_rates(keys))
+
+        records = []
+        for index, row in affected.iterrows():
+            mix = mixes[index]
+            method_rates = np.array([next(rates) for _ in mix])
+            shares = np.array(list(mix.values()))
+            baseline_rate = method_rates.mean()
+            scenario_rate = float(shares @ method_rates)
+            scale = scenario_rate / baseline_rate if baseline_rate > 0 else 1.0
+            scenario_loss = row['loss_tons'] * scale
+            price = self.prices.price(row['crop'], row['state'])
+            records.append({
+                'state': row['state'],
+                'crop': row['crop'],
+                'value_chain_stage': row['value_chain_stage'],
+                'baseline_loss_tons': row['loss_tons'],
+                'scenario_loss_tons': scenario_loss,
+                'loss_change_tons': scenario_loss - row['loss_tons'],
+                'financial_change': (scenario_loss - row['loss_tons']) * price,
+                'method_mix': {method: round(value, 4) for method, value in mix.items()}
+            })
+
+        with self._lock:
+            self.counters['scenarios'] += 1
+
+        baseline_tons = sum(record['baseline_loss_tons'] for record in records)
+        change_tons = sum(record['loss_change_tons'] for record in records)
+        return {
+            'rows_rescored': len(records),
+            'rate_source': self.rate_source,
+            'baseline_loss_tons': round(baseline_tons, 1),
+            'scenario_loss_tons': round(baseline_tons + change_tons, 1),
+            'loss_change_tons': round(change_tons, 1),
+            'financial_change': round(sum(record['financial_change'] for record in records), 0),
+            'rows': [
+                {key: round(value, 1) if isinstance(value, float) else value for key, value in record.items()}
+                for record in records
+            ]
+        }
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'memoized_rates': len(self._rates), 'rate_source': self.rate_source}
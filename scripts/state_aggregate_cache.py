@@ -0,0 +1,272 @@
+"""
+YouthHarvest Dashboard: cached state-level aggregates for map views
+
+Map views colour every Nigerian state by loss_tons or financial_impact for a
+filter combination (crop x value chain stage x season). Instead of running a
+groupby per request, the dashboard dataset is folded once into a dense cube
+indexed by [crop, stage, season, state, metric]. A filter combination is then a
+slice (or a sum over the 'all' axes) of that cube, and the resulting state
+vectors are kept in two cache tiers:
+
+  - an in-memory LRU of the most recently used combinations
+  - an on-disk cache of .npy files keyed by the dataset fingerprint, so a
+    restarted server does not recompute anything
+
+The most significant combinations (by total loss) are warmed at startup, and
+hit/miss counters for both tiers are exposed through stats(). When the dataset
+is refreshed, update() folds only the changed rows into the cube and reports
+which per-state values moved, so open dashboards can be sent just the deltas.
+"""
+
+import hashlib
+import itertools
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+ALL = 'all'
+MAP_METRICS = ['loss_tons', 'financial_impact']
+FILTER_DIMENSIONS = ['crop', 'value_chain_stage', 'season']
+
+
+def dataset_fingerprint(df):
+    """Content hash of the dataset, used to key the on-disk cache"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(','.join(df.columns).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class StateAggregateCache:
+    """LRU + on-disk cache of per-filter state vectors built from the dashboard dataset"""
+
+    def __init__(self, df, states=None, metrics=None, cache_dir=None, max_entries=256):
+        self.metrics = list(metrics or MAP_METRICS)
+        self.states = list(states) if states is not None else sorted(df['state'].unique())
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.load(df)
+
+    def load(self, df):
+        """(Re)build the aggregate cube for a new version of the dataset"""
+        # Dimensions missing from the dataset (e.g. season) only support 'all'
+        self.dimension_values = {
+            dim: sorted(df[dim].astype(str).unique()) if dim in df.columns else []
+            for dim in FILTER_DIMENSIONS
+        }
+        unknown = set(df['state']) - set(self.states)
+        if unknown:
+            raise ValueError(f"Dataset has states that are not on the map: {sorted(unknown)}")
+
+        shape = [max(len(self.dimension_values[dim]), 1) for dim in FILTER_DIMENSIONS]
+        rows = self._row_table(df)
+        cube = np.zeros(shape + [len(self.states), len(self.metrics)])
+        np.add.at(cube, self._cell_codes(rows), rows[self.metrics].to_numpy(dtype=float))
+
+        with self._lock:
+            self.cube = cube
+            self.fingerprint = dataset_fingerprint(df)
+            self.version = getattr(self, 'version', 0) + 1
+            self._rows = rows
+            self._memory.clear()
+        self._prune_disk_cache()
+
+    def _row_table(self, df):
+        """Metrics per cube cell, one row per (crop, stage, season, state)"""
+        keyed = pd.DataFrame({
+            dim: df[dim].astype(str) if dim in df.columns else ''
+            for dim in FILTER_DIMENSIONS + ['state']
+        })
+        for metric in self.metrics:
+            keyed[metric] = df[metric].to_numpy(dtype=float)
+        return keyed.groupby(FILTER_DIMENSIONS + ['state'], sort=False)[self.metrics].sum()
+
+    def _cell_codes(self, rows):
+        """Cube indices for a table produced by _row_table"""
+        codes = []
+        for dim in FILTER_DIMENSIONS:
+            values = self.dimension_values[dim]
+            level = rows.index.get_level_values(dim)
+            if values:
+                lookup = {value: i for i, value in enumerate(values)}
+                codes.append(level.map(lookup).to_numpy())
+            else:
+                codes.append(np.zeros(len(rows), dtype=np.int64))
+        state_index = {state: i for i, state in enumerate(self.states)}
+        codes.append(rows.index.get_level_values('state').map(state_index).to_numpy())
+        return tuple(codes)
+
+    def update(self, df):
+        """
+        Apply a new version of the dataset incrementally.
+
+        Only rows whose metrics changed are folded into the cube, and only the
+        cached combinations those rows feed are invalidated. Returns the changed
+        aggregates as {(crop, stage, season): {metric: {state: new value}}};
+        a filter value appearing or disappearing falls back to a full reload,
+        reported as None.
+        """
+        dimension_values = {
+            dim: sorted(df[dim].astype(str).unique()) if dim in df.columns else []
+            for dim in FILTER_DIMENSIONS
+        }
+        if dimension_values != self.dimension_values or set(df['state']) - set(self.states):
+            self.load(df)
+            return None
+
+        new_rows = self._row_table(df)
+        old_rows = self._rows
+        index = old_rows.index.union(new_rows.index, sort=False)
+        delta = (new_rows.reindex(index, fill_value=0.0) - old_rows.reindex(index, fill_value=0.0))
+        delta = delta[(delta.abs() > 1e-9).any(axis=1)]
+        if delta.empty:
+            return {}
+
+        codes = self._cell_codes(delta)
+        affected = set()
+        for crop, stage, season, state in delta.index:
+            for key in itertools.product([crop, ALL], [stage, ALL], [season or ALL, ALL]):
+                affected.add((self._key(*key), state))
+
+        with self._lock:
+            before = {key: self._compute(key).copy() for key in {key for key, _ in affected}}
+            np.add.at(self.cube, codes, delta.to_numpy())
+            self._rows = new_rows
+            self.fingerprint = dataset_fingerprint(df)
+            self.version += 1
+            for key in before:
+                self._memory.pop(key, None)
+
+        state_index = {state: i for i, state in enumerate(self.states)}
+        changes = {}
+        for key, state in affected:
+            after = self._compute(key)[state_index[state]]
+            for metric_index, metric in enumerate(self.metrics):
+                old_value = before[key][state_index[state], metric_index]
+                if abs(after[metric_index] - old_value) > 1e-9:
+                    changes.setdefault(key, {}).setdefault(metric, {})[state] = float(after[metric_index])
+        self._prune_disk_cache()
+        return changes
+
+    def _prune_disk_cache(self):
+        """Remove on-disk entries written for older versions of the dataset"""
+        if not self.cache_dir:
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npy') and not name.startswith(self.fingerprint):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _key(self, crop, stage, season):
+        return (str(crop or ALL), str(stage or ALL), str(season or ALL))
+
+    def _disk_path(self, key):
+        name = hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f'{self.fingerprint}_{name}.npy')
+
+    def _compute(self, key):
+        """Slice the cube for one filter combination: a state x metric matrix"""
+        index = []
+        for dim, value in zip(FILTER_DIMENSIONS, key):
+            values = self.dimension_values[dim]
+            if value == ALL:
+                index.append(slice(None))
+            elif value in values:
+                index.append(values.index(value))
+            else:
+                raise KeyError(f"Unknown {dim} '{value}'")
+        block = self.cube[tuple(index)]
+        # Sum over every dimension that was left as 'all'
+        while block.ndim > 2:
+            block = block.sum(axis=0)
+        return block
+
+    def _save(self, path, matrix):
+        """Write a cached matrix through a temporary file of its own, so concurrent misses do not collide"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, crop=ALL, stage=ALL, season=ALL):
+        """State vectors for a filter combination as {metric: array over self.states}"""
+        key = self._key(crop, stage, season)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.counters['memory_hits'] += 1
+                matrix = self._memory[key]
+                return {metric: matrix[:, i] for i, metric in enumerate(self.metrics)}
+            # The dataset version this lookup started from; an update() after it makes the result stale
+            version = self.version
+            path = self._disk_path(key) if self.cache_dir else None
+
+        if path and os.path.exists(path):
+            matrix = np.load(path)
+            counter = 'disk_hits'
+        else:
+            # Sliced under the lock, so an update() folding rows into the cube is never seen half-applied
+            with self._lock:
+                matrix = self._compute(key)
+                current = version == self.version
+            counter = 'misses'
+            if path and current:
+                self._save(path, matrix)
+
+        with self._lock:
+            self.counters[counter] += 1
+            if version != self.version:
+                # The dataset changed while this matrix was computed; serve it to this caller only
+                return {metric: matrix[:, i] for i, metric in enumerate(self.metrics)}
+            self._memory[key] = matrix
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.counters['evictions'] += 1
+        return {metric: matrix[:, i] for i, metric in enumerate(self.metrics)}
+
+    def combinations(self):
+        """Every filter combination, including the 'all' options"""
+        options = [[ALL] + self.dimension_values[dim] for dim in FILTER_DIMENSIONS]
+        return list(itertools.product(*options))
+
+    def warm(self, top_n=50, metric='loss_tons'):
+        """Precompute the top-N combinations ranked by their total of `metric`"""
+        metric_index = self.metrics.index(metric)
+        ranked = sorted(
+            self.combinations(),
+            key=lambda key: self._compute(key)[:, metric_index].sum(),
+            reverse=True
+        )
+        for key in ranked[:top_n]:
+            self.get(*key)
+        return ranked[:top_n]
+
+    def stats(self):
+        with self._lock:
+            lookups = sum(self.counters[name] for name in ['memory_hits', 'disk_hits', 'misses'])
+            hits = self.counters['memory_hits'] + self.counters['disk_hits']
+            return {
+                **self.counters,
+                'hit_rate': round(hits / lookups, 4) if lookups else None,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'dataset_fingerprint': self.fingerprint,
+                'version': self.version
+            }
@@ -0,0 +1,141 @@
+"""
+YouthHarvest Project: vector figures for the PDF reports
+
+The report generators used to save every figure as a 300-dpi PNG, which
+reportlab then decoded, compressed and embedded as an image: large PDFs,
+slow builds and blurry text when zoomed. With svglib installed, figures are
+saved as SVG instead and converted into reportlab drawings, so they are
+embedded as native PDF vector graphics.
+
+Dense artists (scatter plots, hexbins and lines with more than
+DENSE_ARTIST_POINTS points) are rasterized within the SVG at RASTER_DPI,
+since thousands of vector markers are larger and slower than an image of
+them. Text is written as SVG text rather than glyph outlines and drawn with
+matplotlib's own DejaVu Sans, registered with svglib, so it stays
+searchable and the drawings stay small. Without svglib, figures fall back
+to PNG.
+"""
+
+import copy
+import os
+
+import matplotlib
+from matplotlib import font_manager
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase import pdfdoc
+from reportlab.platypus import Image
+
+try:
+    from svglib.fonts import register_font
+    from svglib.svglib import svg2rlg
+except ImportError:  # without svglib figures are saved and embedded as PNG
+    svg2rlg = None
+
+FIGURE_FORMAT = 'svg' if svg2rlg is not None else 'png'
+RASTER_DPI = 300
+DENSE_ARTIST_POINTS = 2000
+FIGURE_FONT = 'DejaVu Sans'  # matplotlib's default font, bundled with matplotlib
+
+# Figures prepared for reportlab by path, built once per process and shared by every report drawing the figure:
+# drawings converted from SVG, and encoded PDF image objects for PNG
+_drawings = {}
+_pdf_images = {}
+
+
+def _artist_points(artist):
+    if hasattr(artist, 'get_offsets'):
+        return max(len(artist.get_offsets()), len(artist.get_paths()))
+    return len(artist.get_xydata())
+
+
+def rasterize_dense(fig, max_points=DENSE_ARTIST_POINTS):
+    """Mark collections and lines with more than max_points points to be rasterized in vector output"""
+    rasterized = 0
+    for ax in fig.axes:
+        for artist in list(ax.collections) + list(ax.lines):
+            if _artist_points(artist) > max_points:
+                artist.set_rasterized(True)
+                rasterized += 1
+    return rasterized
+
+
+def save_figure(fig, save_path, dpi=RASTER_DPI, bbox_inches='tight'):
+    """
+    Save a figure for a report: vector when save_path ends in .svg or .pdf
+    (dense artists rasterized at dpi), an image at dpi otherwise. Figures
+    laid out to their exact size can pass bbox_inches=None to skip the
+    extra draw that trimming takes.
+    """
+    if os.path.splitext(save_path)[1].lower() in ('.svg', '.pdf'):
+        rasterize_dense(fig)
+    with matplotlib.rc_context({'svg.fonttype': 'none'}):
+        fig.savefig(save_path, dpi=dpi, bbox_inches=bbox_inches)
+    return save_path
+
+
+def figure_path(stem, fmt=FIGURE_FORMAT):
+    """Path of a figure saved in the report figure format"""
+    return f'{stem}.{fmt}'
+
+
+class FigureImage(Image):
+    """
+    Image flowable for PNG report figures.
+
+    reportlab decodes, compresses and encodes a PNG every time a document
+    draws it, which dominates the time to build a report. A FigureImage is
+    encoded once per process; later documents drawing the same file get a
+    copy of that image object instead. Figures are opaque, so they are
+    embedded without an alpha channel.
+    """
+
+    def draw(self):
+        canvas = self.canv
+        # The name drawImage gives an image drawn from a file, so it finds and reuses the copy registered here
+        name = _digester(f'{self.filename}{self._mask}'.encode('utf-8'))
+        registered_name = canvas._doc.getXObjectName(name)
+        if registered_name not in canvas._doc.idToObject:
+            if self.filename not in _pdf_images:
+                with PILImage.open(self.filename) as image:
+                    _pdf_images[self.filename] = pdfdoc.PDFImageXObject(name, ImageReader(image.convert('RGB')))
+            image_object = copy.copy(_pdf_images[self.filename])
+            image_object.name = name
+            canvas._setXObjects(image_object)
+            canvas._doc.Reference(image_object, registered_name)
+            canvas._doc.addForm(name, image_object)
+        canvas.drawImage(self.filename, getattr(self, '_offs_x', 0), getattr(self, '_offs_y', 0),
+                         self.drawWidth, self.drawHeight, mask=self._mask)
+
+
+def _register_figure_font():
+    for weight in ('normal', 'bold'):
+        font_path = font_manager.findfont(font_manager.FontProperties(family=FIGURE_FONT, weight=weight))
+        register_font(FIGURE_FONT, font_path, weight=weight,
+                      rlgFontName=FIGURE_FONT.replace(' ', '') + ('-Bold' if weight == 'bold' else ''))
+
+
+def figure_flowable(path, width, height=None):
+    """
+    Flowable drawing a saved figure into a width x height box: a vector
+    drawing for SVG figures (converted once per process), FigureImage for PNG.
+    Without a height the figure keeps its aspect ratio.
+    """
+    if os.path.splitext(path)[1].lower() != '.svg':
+        if height is None:
+            with PILImage.open(path) as image:
+                height = width * image.height / image.width
+        return FigureImage(path, width=width, height=height)
+    if svg2rlg is None:
+        raise ValueError(f"svglib is required to embed the vector figure '{path}'")
+    if path not in _drawings:
+        if not _drawings:
+            _register_figure_font()
+        drawing = svg2rlg(path)
+        if drawing is None:
+            raise ValueError(f"Could not convert the vector figure '{path}'")
+        _drawings[path] = drawing
+    drawing = _drawings[path]
+    if height is None:
+        height = width * drawing.height / drawing.width
+    return Image(drawing, width=width, height=height)